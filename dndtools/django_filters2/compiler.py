@@ -0,0 +1,193 @@
+"""
+Plans how conditions of a FilterSet are applied to the queryset.
+
+Conditions on the model and its foreign keys go to a single filter() call,
+so each relation is joined once. Conditions through many to many or
+reverse relations would multiply rows and need distinct(); each becomes a
+pk__in subquery instead. Grouped filters on the same relation share one
+subquery, so they have to match the same related row, as if given to one
+filter() call.
+
+A subquery whose conditions all go through one relation of the model is
+made on the table of the relation (the related model or the many to many
+table) and selects the foreign key to the model, so the table of the model
+is not joined again and the subquery does not depend on the outer query.
+"""
+from django.db.models import Q
+from django.db.models.fields import FieldDoesNotExist
+from django.db.models.constants import LOOKUP_SEP
+from django.utils.datastructures import SortedDict
+
+
+def lookup_paths(q):
+    for child in q.children:
+        if isinstance(child, Q):
+            for path in lookup_paths(child):
+                yield path
+        else:
+            yield child[0]
+
+
+def multi_valued_prefix(model, path):
+    """
+    Part of the lookup path up to the first many to many or reverse relation,
+    None if the path does not cross any.
+    """
+    names = path.split(LOOKUP_SEP)
+    for i, name in enumerate(names):
+        if name == 'pk':
+            return None
+        try:
+            field, field_model, direct, m2m = model._meta.get_field_by_name(name)
+        except FieldDoesNotExist:
+            # lookup type
+            return None
+        if m2m or not direct:
+            return LOOKUP_SEP.join(names[:i + 1])
+        if field.rel is None:
+            return None
+        model = field.rel.to
+    return None
+
+
+def conditions_can_move(conditions):
+    """
+    Negated conditions and those on missing related rows keep their meaning
+    only when evaluated on the model.
+    """
+    for q in conditions:
+        if q.negated:
+            return False
+        for child in q.children:
+            if isinstance(child, Q):
+                if not conditions_can_move([child]):
+                    return False
+            elif child[1] is None or child[0].split(LOOKUP_SEP)[-1] == 'isnull':
+                return False
+    return True
+
+
+def moved_q(q, move_path):
+    moved = Q()
+    moved.connector = q.connector
+    moved.negated = q.negated
+    moved.children = [moved_q(child, move_path) if isinstance(child, Q) else (move_path(child[0]), child[1])
+                      for child in q.children]
+    return moved
+
+
+class RelationSubquery(object):
+    """
+    Subquery selecting values of the model field a many to many or reverse
+    relation points to, from the table of the relation.
+    """
+
+    def __init__(self, model, name):
+        field, field_model, direct, m2m = model._meta.get_field_by_name(name)
+        if m2m and direct:
+            # many to many field of the model
+            self.model = field.rel.through
+            self.source = field.m2m_field_name()
+            self.target = field.m2m_reverse_field_name()
+            self.model_field = 'pk'
+        elif m2m:
+            # many to many field of other model pointing to the model
+            self.model = field.field.rel.through
+            self.source = field.field.m2m_reverse_field_name()
+            self.target = field.field.m2m_field_name()
+            self.model_field = 'pk'
+        else:
+            # foreign key of other model pointing to the model
+            self.model = field.model
+            self.source = field.field.name
+            self.target = None
+            self.model_field = field.field.rel.get_related_field().name
+
+    def move_path(self, path):
+        """
+        The lookup path relative to the related table.
+        """
+        rest = path.split(LOOKUP_SEP)[1:]
+        if self.target is not None:
+            return LOOKUP_SEP.join([self.target] + rest)
+        if rest and (rest[0] == 'pk' or rest[0] in self.model._meta.get_all_field_names()):
+            return LOOKUP_SEP.join(rest)
+        # lookups on the related object itself
+        return LOOKUP_SEP.join(['pk'] + rest)
+
+    def apply(self, qs, conditions):
+        subquery = self.model._default_manager.filter(
+            *[moved_q(q, self.move_path) for q in conditions]).values(self.source)
+        return qs.filter(**{'%s__in' % self.model_field: subquery})
+
+
+class FilterPlan(object):
+    def __init__(self, model):
+        self.model = model
+        # conditions of the main filter() call and their filters
+        self.conditions = []
+        self.condition_names = []
+        # subquery key -> (conditions, filter names)
+        self.subqueries = SortedDict()
+        # subquery key -> RelationSubquery, for those through one relation
+        self.relations = {}
+        # filters without a condition, (name, filter, value)
+        self.applied = []
+
+    def add(self, name, filter_, value):
+        q = filter_.as_q(value)
+        if q is NotImplemented:
+            self.applied.append((name, filter_, value))
+            return
+        if q is None:
+            return
+
+        prefixes = set(multi_valued_prefix(self.model, path) for path in lookup_paths(q))
+        prefixes.discard(None)
+        if not prefixes:
+            self.conditions.append(q)
+            self.condition_names.append(name)
+            return
+        prefix = prefixes.pop() if len(prefixes) == 1 else None
+        if filter_.grouped and prefix is not None:
+            key = 'through %s' % prefix
+        else:
+            key = 'for %s' % name
+        conditions, names = self.subqueries.setdefault(key, ([], []))
+        conditions.append(q)
+        names.append(name)
+
+        # a relation of the model itself, not of a model it points to
+        if prefix is not None and LOOKUP_SEP not in prefix and conditions_can_move(conditions):
+            self.relations[key] = RelationSubquery(self.model, prefix)
+        else:
+            self.relations.pop(key, None)
+
+    def apply(self, qs):
+        if self.conditions:
+            qs = qs.filter(*self.conditions)
+        for key, (conditions, names) in self.subqueries.iteritems():
+            if key in self.relations:
+                qs = self.relations[key].apply(qs, conditions)
+            else:
+                qs = qs.filter(pk__in=self.model._default_manager.filter(*conditions).values('pk'))
+        for name, filter_, value in self.applied:
+            qs = filter_.filter(qs, value)
+        if self.applied:
+            # they may join multi valued relations
+            qs = qs.distinct()
+        return qs
+
+    def explain(self):
+        lines = []
+        if self.conditions:
+            lines.append('filter() on %s: %s' % (self.model._meta.object_name, ', '.join(self.condition_names)))
+        for key, (conditions, names) in self.subqueries.iteritems():
+            if key in self.relations:
+                lines.append('subquery on %s %s: %s' % (
+                    self.relations[key].model._meta.db_table, key, ', '.join(names)))
+            else:
+                lines.append('pk__in subquery %s: %s' % (key, ', '.join(names)))
+        if self.applied:
+            lines.append('applied by filter() with distinct(): %s' % ', '.join(name for name, f, v in self.applied))
+        return '\n'.join(lines) or 'no filtering'
@@ -76,6 +76,19 @@ class Filter(object):
             return {'%s__%s' % (self.name, lookup): value}
         return {}
 
+    def as_q(self, value):
+        """
+        Condition of the filter as a Q object for the filter compiler, None if
+        the value does not filter. Filters which can't tell return
+        NotImplemented and are applied by filter().
+        """
+        if getattr(self.filter, '__func__', None) is not Filter.filter.__func__:
+            return NotImplemented
+        lookups = Filter.filter_grouped(self, None, value)
+        if lookups:
+            return Q(**lookups)
+        return None
+
 class CharFilter(Filter):
     field_class = forms.CharField
 
@@ -87,6 +100,11 @@ class BooleanFilter(Filter):
             return qs.filter(**{self.name: value})
         return qs
 
+    def as_q(self, value):
+        if value is not None:
+            return Q(**{self.name: value})
+        return None
+
 class ChoiceFilter(Filter):
     field_class = forms.ChoiceField
 
@@ -119,6 +137,9 @@ class MultipleChoiceFilter(Filter):
             q |= Q(**{self.name: v})
         return q
 
+    def as_q(self, value):
+        return self.filter_grouped(None, value) or None
+
 class DateFilter(Filter):
     field_class = forms.DateField
 
@@ -149,6 +170,15 @@ class RangeFilter(Filter):
             return qs.filter(**{'%s__range' % self.name: (value.start, value.stop)})
         return qs
 
+    def as_q(self, value):
+        if value:
+            if value.start is None and value.stop is not None:
+                return Q(**{'%s__lte' % self.name: value.stop})
+            if value.start is not None and value.stop is None:
+                return Q(**{'%s__gte' % self.name: value.start})
+            return Q(**{'%s__range' % self.name: (value.start, value.stop)})
+        return None
+
 class DateRangeFilter(ChoiceFilter):
     options = {
         '': (_('Any Date'), lambda qs, name: qs.all()),
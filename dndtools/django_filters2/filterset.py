@@ -1,19 +1,25 @@
-from copy import deepcopy
+import logging
+from copy import copy, deepcopy
+from hashlib import md5
 
 from django import forms
 from django.db import models
-from django.db.models import Q
 from django.db.models.fields import FieldDoesNotExist
 from django.db.models.related import RelatedObject
+from django.db.models.sql.datastructures import EmptyResultSet
 from django.utils.datastructures import SortedDict
 from django.utils.text import capfirst
 
+from django_filters2.compiler import FilterPlan
+from django_filters2.results import ResultCache, ResultList
 from django_filters2.filters import Filter, CharFilter, BooleanFilter, \
     ChoiceFilter, DateFilter, DateTimeFilter, TimeFilter, ModelChoiceFilter, \
     ModelMultipleChoiceFilter, NumberFilter
 
 ORDER_BY_FIELD = 'o'
 
+logger = logging.getLogger('django_filters2')
+
 def get_declared_filters(bases, attrs, with_base_filters=True):
     filters = []
     for filter_name, obj in attrs.items():
@@ -192,8 +198,22 @@ FILTER_FOR_DBFIELD_DEFAULTS = {
     },
 }
 
+class SharedFields(SortedDict):
+    """
+    Fields of a compiled form. Forms deep copy their fields on creation, these
+    are copied shallowly: fields and widgets are not changed by binding data
+    to the form, so only the field objects themselves need to be new.
+    """
+    def __deepcopy__(self, memo):
+        return SortedDict([(name, copy(field)) for name, field in self.iteritems()])
+
+
 class BaseFilterSet(object):
     filter_overrides = {}
+    # FilterSet class -> (compile key, filters, form class, ordering field)
+    _compiled = {}
+    # ordered ids of results, shared by all FilterSets which give result_version()
+    result_cache = ResultCache(max_ids=200000)
 
     def __init__(self, data=None, queryset=None, prefix=None):
         self.is_bound = data is not None
@@ -203,63 +223,166 @@ class BaseFilterSet(object):
         self.queryset = queryset
         self.form_prefix = prefix
 
-        self.filters = deepcopy(self.base_filters)
-        # propagate the model being used through the filters
-        for filter_ in self.filters.values():
-            filter_.model = self._meta.model
+        # filters, form class and fields are shared by all instances, only the form is new
+        self.filters, self._form_class, self._ordering_field = self.compile()
+
+    @classmethod
+    def compile_key(cls):
+        """
+        Filters and form class of the FilterSet are built again when this
+        changes. Choices of filters may tell their current version by a
+        version() method (e.g. choices loaded from the database).
+        """
+        key = []
+        for name, filter_ in cls.base_filters.iteritems():
+            version = getattr(filter_.extra.get('choices'), 'version', None)
+            if version is not None:
+                key.append(version())
+        return tuple(key)
+
+    @classmethod
+    def compile(cls):
+        """
+        Returns filters, form class and ordering field of the FilterSet,
+        built once for every compile key.
+        """
+        key = cls.compile_key()
+        compiled = cls._compiled.get(cls)
+        if compiled is None or compiled[0] != key:
+            filters = deepcopy(cls.base_filters)
+            # propagate the model being used through the filters
+            for filter_ in filters.values():
+                filter_.model = cls._meta.model
+
+            instance = cls.__new__(cls)
+            instance.filters = filters
+            ordering_field = instance.get_ordering_field()
+
+            fields = SortedDict([(name, filter_.field) for name, filter_ in filters.iteritems()])
+            fields[ORDER_BY_FIELD] = ordering_field
+            Form = type('%sForm' % cls.__name__, (cls._meta.form,), fields)
+            Form.base_fields = SharedFields(Form.base_fields)
+
+            compiled = cls._compiled[cls] = (key, filters, Form, ordering_field)
+        return compiled[1:]
+
+    def query_filters(self):
+        """
+        Filters applied to the queryset, as (name, filter) pairs.
+        """
+        return self.filters.iteritems()
 
     def __iter__(self):
         for obj in self.qs:
             yield obj
 
+    def result_version(self):
+        """
+        Version of the data results come from. Ids of results are cached
+        under it (see result_cache), None turns the cache off.
+        """
+        return None
+
+    def normalized_query(self):
+        """
+        Cleaned values of filters in use, the same for all query strings
+        giving the same results (order of parameters, empty fields ...).
+        """
+        query = []
+        for name in sorted(self.filters):
+            try:
+                value = self.filter_value(name)
+            except forms.ValidationError:
+                continue
+            if value is None or value == '' or value == []:
+                continue
+            if isinstance(value, list):
+                value = sorted(value)
+            query.append((name, value))
+        return query
+
+    def result_key(self):
+        """
+        Key of the results in result_cache, None if they are not cached.
+        Unfiltered results are not, they are cheap to get anyway.
+        """
+        version = self.result_version()
+        if version is None:
+            return None
+        query = self.normalized_query()
+        if not query:
+            return None
+        try:
+            # views may give differently restricted querysets
+            base_query = unicode(self.queryset.query)
+        except EmptyResultSet:
+            return None
+        ordering = self.form[ORDER_BY_FIELD].data if self._meta.order_by else None
+        return md5(repr((self.__class__.__name__, version, query, ordering, base_query))).hexdigest()
+
+    def filter_queryset(self, qs):
+        plan = FilterPlan(qs.model)
+        for name, filter_ in self.query_filters():
+            try:
+                plan.add(name, filter_, self.filter_value(name))
+            except forms.ValidationError:
+                pass
+        self.plan = plan
+        logger.debug('Filter plan of %s:\n%s', self.__class__.__name__, plan.explain())
+        return plan.apply(qs)
+
+    def order_queryset(self, qs):
+        if self._meta.order_by:
+            try:
+                value = self.form.fields[ORDER_BY_FIELD].clean(self.form[ORDER_BY_FIELD].data)
+                if value:
+                    qs = qs.order_by(value)
+            except forms.ValidationError:
+                pass
+        return qs
+
     @property
     def qs(self):
         if not hasattr(self, '_qs'):
-            qs = self.queryset.all()
-            grouped_dict = {}
-            grouped_list = []
-            for name, filter_ in self.filters.iteritems():
-                try:
-                    if self.is_bound:
-                        data = self.form[name].data
-                    else:
-                        data = self.form.initial.get(name, self.form[name].field.initial)
-                    val = self.form.fields[name].clean(data)
-                    if filter_.grouped:
-                        grouped_filter = filter_.filter_grouped(qs, val)
-                        # Q objects are added as non-named parameters.
-                        if isinstance(grouped_filter, Q):
-                            grouped_list.append(grouped_filter)
-                        else:
-                            grouped_dict.update(grouped_filter)
-                    else:
-                        qs = filter_.filter(qs, val)
-                except forms.ValidationError:
-                    pass
-
-            if grouped_dict or grouped_list:
-                qs = qs.filter(*grouped_list, **grouped_dict)
-
-            if self._meta.order_by:
-                try:
-                    value = self.form.fields[ORDER_BY_FIELD].clean(self.form[ORDER_BY_FIELD].data)
-                    if value:
-                        qs = qs.order_by(value)
-                except forms.ValidationError:
-                    pass
-            self._qs = qs
+            key = self.result_key()
+            self._ids = None if key is None else self.result_cache.get(key)
+            if self._ids is None:
+                self._qs = self.order_queryset(self.filter_queryset(self.queryset.all()))
+                if key is not None:
+                    self._ids = list(self._qs.values_list('pk', flat=True))
+                    self.result_cache.set(key, self._ids)
+            if self._ids is not None:
+                self._qs = self.order_queryset(self.queryset.filter(pk__in=self._ids))
+                # paginators slice the ids and fetch only the page instead
+                self._qs.result_list = ResultList(self.queryset.all(), self._ids)
         return self._qs
 
+    def ids(self):
+        """
+        Ordered ids of the results.
+        """
+        qs = self.qs
+        if self._ids is None:
+            self._ids = list(qs.values_list('pk', flat=True))
+        return self._ids
+
+    def filter_value(self, name):
+        """
+        Cleaned value of the filter, raises ValidationError for invalid data.
+        """
+        if self.is_bound:
+            data = self.form[name].data
+        else:
+            data = self.form.initial.get(name, self.form[name].field.initial)
+        return self.form.fields[name].clean(data)
+
     @property
     def form(self):
         if not hasattr(self, '_form'):
-            fields = SortedDict([(name, filter_.field) for name, filter_ in self.filters.iteritems()])
-            fields[ORDER_BY_FIELD] = self.ordering_field
-            Form =  type('%sForm' % self.__class__.__name__, (self._meta.form,), fields)
             if self.is_bound:
-                self._form = Form(self.data, prefix=self.form_prefix)
+                self._form = self._form_class(self.data, prefix=self.form_prefix)
             else:
-                self._form = Form(prefix=self.form_prefix)
+                self._form = self._form_class(prefix=self.form_prefix)
         return self._form
 
     def get_ordering_field(self):
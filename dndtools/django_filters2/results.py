@@ -0,0 +1,81 @@
+import threading
+from collections import OrderedDict
+
+
+class ResultCache(object):
+    """
+    Ordered ids of FilterSet results in the memory of the process. Least
+    recently used lists are dropped once all lists together hold more than
+    max_ids ids (an empty list counts as one).
+    """
+    def __init__(self, max_ids):
+        self.max_ids = max_ids
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            ids = self._entries.pop(key, None)
+            if ids is not None:
+                self._entries[key] = ids
+            return ids
+
+    def set(self, key, ids):
+        ids = tuple(ids)
+        if len(ids) + 1 > self.max_ids:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old) + 1
+            self._entries[key] = ids
+            self.size += len(ids) + 1
+            while self.size > self.max_ids:
+                key, dropped = self._entries.popitem(last=False)
+                self.size -= len(dropped) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+class ResultList(object):
+    """
+    Results given by their ordered ids, for paginators. The length is the
+    number of ids and a slice fetches only objects of the slice (by
+    in_bulk), so no query gets the whole list of ids.
+    """
+    # ids fetched by one query
+    chunk_size = 500
+
+    def __init__(self, queryset, ids):
+        self.queryset = queryset
+        self.ids = ids
+
+    def __len__(self):
+        return len(self.ids)
+
+    def count(self):
+        return len(self.ids)
+
+    def fetch(self, ids):
+        objects = {}
+        for start in xrange(0, len(ids), self.chunk_size):
+            objects.update(self.queryset.in_bulk(ids[start:start + self.chunk_size]))
+        # objects could be deleted in the meantime
+        return [objects[pk] for pk in ids if pk in objects]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.fetch(self.ids[index])
+        objects = self.fetch([self.ids[index]])
+        if not objects:
+            raise IndexError(index)
+        return objects[0]
+
+    def __iter__(self):
+        for start in xrange(0, len(self.ids), self.chunk_size):
+            for obj in self.fetch(self.ids[start:start + self.chunk_size]):
+                yield obj
@@ -0,0 +1,424 @@
+# -*- coding: utf-8 -*-
+"""
+Models published by the JSON API and how their objects are serialized.
+
+Every resource has named fields. A field is a value of the object (dotted
+paths follow foreign keys), a single related object (One, loaded by
+select_related) or a list of related objects (Many, loaded by
+prefetch_related for all objects of the response at once). Only fields
+requested by the client are loaded.
+"""
+from django.db.models.constants import LOOKUP_SEP
+from django.utils.datastructures import SortedDict
+
+from dnd.models import Spell, Feat, CharacterClassVariant, Race, Monster, Item, Skill, Deity, Rule
+
+
+def _lookup(path):
+    return path.replace('.', LOOKUP_SEP)
+
+
+def _get(obj, path):
+    for name in path.split('.'):
+        if obj is None:
+            return None
+        obj = getattr(obj, name)
+    if callable(obj):
+        obj = obj()
+    return obj
+
+
+def _relations(path):
+    """
+    Foreign keys followed by the dotted path, as select_related paths.
+    """
+    names = path.split('.')[:-1]
+    return [LOOKUP_SEP.join(names[:i + 1]) for i in range(len(names))]
+
+
+def _nested(obj, fields):
+    """
+    Dictionary of nested fields, each field is a name or (name, dotted path).
+    """
+    if obj is None:
+        return None
+    result = {}
+    for field in fields:
+        name, path = field if isinstance(field, tuple) else (field, field)
+        result[name] = _get(obj, path)
+    return result
+
+
+def _related_model(model, name, models):
+    """
+    Model on the other side of the relation accessed by the attribute, adds
+    it (and the table of a many to many relation) to models.
+    """
+    for related in model._meta.get_all_related_objects():
+        if related.get_accessor_name() == name:
+            models.add(related.model)
+            return related.model
+    field = model._meta.get_field(name)
+    if getattr(field.rel, 'through', None):
+        models.add(field.rel.through)
+    models.add(field.rel.to)
+    return field.rel.to
+
+
+class Value(object):
+    def __init__(self, path):
+        self.path = path
+
+    def select_related(self):
+        return _relations(self.path)
+
+    def prefetch_related(self):
+        return []
+
+    def relations(self):
+        return _relations(self.path)
+
+    def serialize(self, obj, request):
+        return _get(obj, self.path)
+
+
+class Url(object):
+    """
+    Absolute url of the detail page, select are the relations it is built
+    from.
+    """
+
+    def __init__(self, *select):
+        self.select = select
+
+    def select_related(self):
+        return list(self.select)
+
+    def prefetch_related(self):
+        return []
+
+    def relations(self):
+        return list(self.select)
+
+    def serialize(self, obj, request):
+        return request.build_absolute_uri(obj.get_absolute_url())
+
+
+class One(object):
+    """
+    Related object through the foreign key, select are its relations used
+    by the nested fields.
+    """
+
+    def __init__(self, path, fields, select=()):
+        self.path = path
+        self.fields = fields
+        self.select = select
+
+    def select_related(self):
+        path = _lookup(self.path)
+        return [path] + ['%s%s%s' % (path, LOOKUP_SEP, related) for related in self.select]
+
+    def prefetch_related(self):
+        return []
+
+    def relations(self):
+        return self.select_related()
+
+    def serialize(self, obj, request):
+        return _nested(_get(obj, self.path), self.fields)
+
+
+class Many(object):
+    """
+    Objects of the many to many or reverse relation, prefetch are their
+    relations used by the nested fields.
+    """
+
+    def __init__(self, path, fields, prefetch=()):
+        self.path = path
+        self.fields = fields
+        self.prefetch = prefetch
+
+    def select_related(self):
+        return []
+
+    def prefetch_related(self):
+        # the relation is prefetched on its own even when deeper paths are given
+        return [self.path] + ['%s%s%s' % (self.path, LOOKUP_SEP, related) for related in self.prefetch]
+
+    def relations(self):
+        return self.prefetch_related()
+
+    def serialize(self, obj, request):
+        return [_nested(related, self.fields) for related in getattr(obj, self.path).all()]
+
+
+class Resource(object):
+    def __init__(self, model, fields):
+        self.model = model
+        self.fields = SortedDict()
+        self.fields['id'] = Value('id')
+        for name, field in fields:
+            self.fields[name] = Value(name) if field is None else field
+
+    def queryset(self, names):
+        select_related, prefetch_related = set(), []
+        for name in names:
+            select_related.update(self.fields[name].select_related())
+            for path in self.fields[name].prefetch_related():
+                if path not in prefetch_related:
+                    prefetch_related.append(path)
+
+        qs = self.model._default_manager.all()
+        if select_related:
+            qs = qs.select_related(*sorted(select_related))
+        if prefetch_related:
+            qs = qs.prefetch_related(*prefetch_related)
+        return qs
+
+    def models(self, names):
+        """
+        Models whose rows are read to serialize the fields.
+        """
+        models = set([self.model])
+        for name in names:
+            for path in self.fields[name].relations():
+                model = self.model
+                for name in path.split(LOOKUP_SEP):
+                    model = _related_model(model, name, models)
+        return models
+
+    def serialize(self, obj, names, request):
+        return dict((name, self.fields[name].serialize(obj, request)) for name in names)
+
+
+NAMED = ('id', 'name', 'slug')
+RULEBOOK = One('rulebook', ('id', 'name', 'abbr', 'slug', ('edition', 'dnd_edition.name')), select=('dnd_edition', ))
+
+
+def _through(path, related, fields, *extra):
+    """
+    Rows of a relation with extra columns: fields of the related object
+    followed by the extra columns of the row.
+    """
+    return Many(path, tuple((name, '%s.%s' % (related, name)) for name in fields) + extra, prefetch=(related, ))
+
+
+RESOURCES = {
+    'spells': Resource(Spell, (
+        ('name', None),
+        ('slug', None),
+        ('url', Url('rulebook')),
+        ('rulebook', RULEBOOK),
+        ('page', None),
+        ('school', One('school', NAMED)),
+        ('sub_school', One('sub_school', NAMED)),
+        ('descriptors', Many('descriptors', NAMED)),
+        ('class_levels', _through('spellclasslevel_set', 'character_class', NAMED, 'level', 'extra')),
+        ('domain_levels', _through('spelldomainlevel_set', 'domain', NAMED, 'level', 'extra')),
+        ('verbal_component', None),
+        ('somatic_component', None),
+        ('material_component', None),
+        ('arcane_focus_component', None),
+        ('divine_focus_component', None),
+        ('xp_component', None),
+        ('meta_breath_component', None),
+        ('true_name_component', None),
+        ('corrupt_component', None),
+        ('corrupt_level', None),
+        ('extra_components', None),
+        ('casting_time', None),
+        ('range', None),
+        ('target', None),
+        ('effect', None),
+        ('area', None),
+        ('duration', None),
+        ('saving_throw', None),
+        ('spell_resistance', None),
+        ('description', None),
+        ('description_html', None),
+        ('verified', None),
+    )),
+    'feats': Resource(Feat, (
+        ('name', None),
+        ('slug', None),
+        ('url', Url('rulebook')),
+        ('rulebook', RULEBOOK),
+        ('page', None),
+        ('categories', Many('feat_categories', NAMED)),
+        ('required_feats', _through('required_feats', 'required_feat', NAMED, 'additional_text')),
+        ('required_skills', _through('required_skills', 'skill', NAMED, 'min_rank', 'extra')),
+        ('special_prerequisites', Many('featspecialfeatprerequisite_set', (('text', 'format_value'), ),
+                                       prefetch=('special_feat_prerequisite', ))),
+        ('text_prerequisites', Many('textfeatprerequisite_set', ('text', ))),
+        ('description', None),
+        ('description_html', None),
+        ('benefit', None),
+        ('benefit_html', None),
+        ('special', None),
+        ('special_html', None),
+        ('normal', None),
+        ('normal_html', None),
+    )),
+    'classes': Resource(CharacterClassVariant, (
+        ('name', Value('character_class.name')),
+        ('slug', Value('character_class.slug')),
+        ('prestige', Value('character_class.prestige')),
+        ('url', Url('rulebook', 'character_class')),
+        ('rulebook', RULEBOOK),
+        ('page', None),
+        ('hit_die', None),
+        ('skill_points', None),
+        ('class_skills', Many('class_skills', NAMED)),
+        ('required_bab', None),
+        ('required_races', _through('required_races', 'race', NAMED, 'extra')),
+        ('required_feats', _through('required_feats', 'feat', NAMED, 'extra')),
+        ('required_skills', _through('required_skills', 'skill', NAMED, 'ranks', 'extra')),
+        ('alignment', None),
+        ('starting_gold', None),
+        ('requirements', None),
+        ('requirements_html', None),
+        ('class_features', None),
+        ('class_features_html', None),
+        ('advancement', None),
+        ('advancement_html', None),
+    )),
+    'races': Resource(Race, (
+        ('name', None),
+        ('slug', None),
+        ('url', Url('rulebook')),
+        ('rulebook', RULEBOOK),
+        ('page', None),
+        ('size', One('size', ('id', 'name'))),
+        ('race_type', One('race_type', NAMED)),
+        ('str', None),
+        ('dex', None),
+        ('con', None),
+        ('int', None),
+        ('wis', None),
+        ('cha', None),
+        ('level_adjustment', None),
+        ('space', None),
+        ('reach', None),
+        ('natural_armor', None),
+        ('racial_hit_dice_count', None),
+        ('speeds', _through('racespeed_set', 'type', ('name', 'extra'), 'speed')),
+        ('favored_classes', _through('favored_classes', 'character_class', NAMED, 'extra')),
+        ('automatic_languages', Many('automatic_languages', NAMED)),
+        ('bonus_languages', Many('bonus_languages', NAMED)),
+        ('description', None),
+        ('description_html', None),
+        ('combat', None),
+        ('combat_html', None),
+        ('racial_traits', None),
+        ('racial_traits_html', None),
+    )),
+    'monsters': Resource(Monster, (
+        ('name', None),
+        ('slug', None),
+        ('url', Url('rulebook')),
+        ('rulebook', RULEBOOK),
+        ('page', None),
+        ('size', One('size', ('id', 'name'))),
+        ('type', One('type', NAMED)),
+        ('subtypes', Many('subtypes', NAMED)),
+        ('hit_dice', None),
+        ('initiative', None),
+        ('speeds', _through('monsterspeed_set', 'type', ('name', 'extra'), 'speed')),
+        ('armor_class', None),
+        ('touch_armor_class', None),
+        ('flat_footed_armor_class', None),
+        ('base_attack', None),
+        ('grapple', None),
+        ('attack', None),
+        ('full_attack', None),
+        ('space', None),
+        ('reach', None),
+        ('special_attacks', None),
+        ('special_qualities', None),
+        ('fort_save', None),
+        ('fort_save_extra', None),
+        ('reflex_save', None),
+        ('reflex_save_extra', None),
+        ('will_save', None),
+        ('will_save_extra', None),
+        ('str', None),
+        ('dex', None),
+        ('con', None),
+        ('int', None),
+        ('wis', None),
+        ('cha', None),
+        ('skills', _through('skills', 'skill', NAMED, 'ranks', 'extra')),
+        ('feats', _through('feats', 'feat', NAMED, 'extra')),
+        ('environment', None),
+        ('organization', None),
+        ('challenge_rating', None),
+        ('treasure', None),
+        ('alignment', None),
+        ('advancement', None),
+        ('level_adjustment', None),
+        ('description', None),
+        ('description_html', None),
+        ('combat', None),
+        ('combat_html', None),
+    )),
+    'items': Resource(Item, (
+        ('name', None),
+        ('slug', None),
+        ('url', Url('rulebook')),
+        ('type', None),
+        ('rulebook', RULEBOOK),
+        ('page', None),
+        ('price_gp', None),
+        ('price_bonus', None),
+        ('item_level', None),
+        ('body_slot', One('body_slot', NAMED)),
+        ('property', One('property', NAMED)),
+        ('caster_level', None),
+        ('aura', One('aura', NAMED)),
+        ('aura_dc', None),
+        ('aura_schools', Many('aura_schools', NAMED)),
+        ('activation', One('activation', NAMED)),
+        ('weight', None),
+        ('required_feats', Many('required_feats', NAMED)),
+        ('required_spells', Many('required_spells', NAMED)),
+        ('required_extra', None),
+        ('synergy_prerequisite', One('synergy_prerequisite', NAMED)),
+        ('cost_to_create', None),
+        ('visual_description', None),
+        ('description', None),
+        ('description_html', None),
+    )),
+    'skills': Resource(Skill, (
+        ('name', None),
+        ('slug', None),
+        ('url', Url()),
+        ('base_skill', None),
+        ('trained_only', None),
+        ('armor_check_penalty', None),
+        ('variants', Many('skillvariant_set', (
+            ('rulebook', 'rulebook.name'), ('rulebook_id', 'rulebook.id'), 'page', 'description_html', 'check_html',
+            'action_html', 'try_again_html', 'special_html', 'synergy_html', 'restriction_html', 'untrained_html'),
+            prefetch=('rulebook', ))),
+    )),
+    'deities': Resource(Deity, (
+        ('name', None),
+        ('slug', None),
+        ('url', Url()),
+        ('alignment', None),
+        ('favored_weapon', One('favored_weapon', NAMED)),
+        ('description', None),
+        ('description_html', None),
+    )),
+    'rules': Resource(Rule, (
+        ('name', None),
+        ('slug', None),
+        ('url', Url('rulebook')),
+        ('rulebook', RULEBOOK),
+        ('page_from', None),
+        ('page_to', None),
+        ('body', None),
+        ('body_html', None),
+    )),
+}
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+
+from django.conf.urls import patterns, url
+
+
+urlpatterns = patterns(
+    'dnd.api.views',
+
+    # index
+    url(
+        r'^v1/$',
+        'api_index',
+        name='api_index',
+    ),
+
+    # resource > list
+    url(
+        r'^v1/(?P<resource_name>[a-z]+)/$',
+        'api_resource_list',
+        name='api_resource_list',
+    ),
+
+    # resource > detail
+    url(
+        r'^v1/(?P<resource_name>[a-z]+)/(?P<object_id>\d+)/$',
+        'api_resource_detail',
+        name='api_resource_detail',
+    ),
+
+)
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+import json
+from django.core.urlresolvers import reverse
+from django.http import Http404, HttpResponse, HttpResponseBadRequest
+from dnd.api.resources import RESOURCES
+from dnd.page_cache import conditional_list_page, record_tags
+from dnd.versions import models_tags
+
+API_VERSION = 1
+# objects in one response (a page or ?ids=)
+MAX_OBJECTS = 100
+DEFAULT_LIMIT = 20
+
+
+def _json(data):
+    return HttpResponse(json.dumps(data), content_type='application/json')
+
+
+def _bad_request(message):
+    return HttpResponseBadRequest(json.dumps({'error': message}), content_type='application/json')
+
+
+def _int_list(value):
+    return [int(item) for item in value.split(',') if item.strip()]
+
+
+def _resource(name):
+    try:
+        return RESOURCES[name]
+    except KeyError:
+        raise Http404
+
+
+def _field_names(request, resource):
+    """
+    Fields requested by ?fields=, all fields if none. The id is always
+    included.
+    """
+    names = [name.strip() for name in request.GET.get('fields', '').split(',') if name.strip()]
+    if not names:
+        return resource.fields.keys()
+    unknown = [name for name in names if name not in resource.fields]
+    if unknown:
+        raise ValueError('Unknown fields: %s' % ', '.join(unknown))
+    return ['id'] + [name for name in names if name != 'id']
+
+
+def _record_models(resource, names):
+    # relations empty so far are not loaded, their changes have to show anyway
+    record_tags(models_tags(*resource.models(names)))
+
+
+@conditional_list_page()
+def api_index(request):
+    """
+    Resources of the API with their fields.
+    """
+    return _json({
+        'version': API_VERSION,
+        'resources': dict(
+            (name, {
+                'url': request.build_absolute_uri(reverse('api_resource_list', kwargs={'resource_name': name})),
+                'fields': resource.fields.keys(),
+            })
+            for name, resource in RESOURCES.iteritems()
+        ),
+    })
+
+
+@conditional_list_page()
+def api_resource_list(request, resource_name):
+    """
+    Objects of the resource in its default order, ?limit= of them from
+    ?offset=. With ?ids=1,2,3 only the objects with given ids in the given
+    order, ids not found are listed in "missing". ?fields= selects fields
+    of the objects, only relations of the selected fields are loaded.
+    """
+    resource = _resource(resource_name)
+    try:
+        names = _field_names(request, resource)
+        ids = _int_list(request.GET.get('ids', ''))
+        offset = max(0, int(request.GET.get('offset', 0)))
+        limit = max(0, min(MAX_OBJECTS, int(request.GET.get('limit', DEFAULT_LIMIT))))
+    except ValueError as e:
+        return _bad_request(unicode(e))
+    if len(ids) > MAX_OBJECTS:
+        return _bad_request('At most %d ids can be fetched at once' % MAX_OBJECTS)
+    _record_models(resource, names)
+
+    qs = resource.queryset(names)
+    if ids:
+        objects = qs.in_bulk(ids)
+        return _json({
+            'results': [resource.serialize(objects[pk], names, request) for pk in ids if pk in objects],
+            'missing': [pk for pk in ids if pk not in objects],
+        })
+
+    count = qs.count()
+    result = {
+        'count': count,
+        'results': [resource.serialize(obj, names, request) for obj in qs[offset:offset + limit]],
+        'next': None,
+        'previous': None,
+    }
+    query = request.GET.copy()
+    if offset + limit < count:
+        query['offset'] = offset + limit
+        result['next'] = request.build_absolute_uri('?' + query.urlencode())
+    if offset > 0:
+        query['offset'] = max(0, offset - limit)
+        result['previous'] = request.build_absolute_uri('?' + query.urlencode())
+    return _json(result)
+
+
+@conditional_list_page()
+def api_resource_detail(request, resource_name, object_id):
+    resource = _resource(resource_name)
+    try:
+        names = _field_names(request, resource)
+    except ValueError as e:
+        return _bad_request(unicode(e))
+    _record_models(resource, names)
+
+    try:
+        obj = resource.queryset(names).get(pk=object_id)
+    except resource.model.DoesNotExist:
+        raise Http404
+    return _json(resource.serialize(obj, names, request))
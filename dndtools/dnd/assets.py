@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Content hashes of static and media files.
+
+The build_asset_manifest command stores hashes of all files in a JSON
+manifest (settings.ASSET_MANIFEST), which is read once per process. URLs
+get the hash as their query string, so they change only with the content
+and the files can be served with far future expiry headers.
+"""
+import hashlib
+import json
+import os
+import threading
+from django.conf import settings
+
+ASSET_MANIFEST = getattr(settings, 'ASSET_MANIFEST', os.path.join(settings.BASE_DIR, 'asset-manifest.json'))
+HASH_LENGTH = 12
+
+_manifest = None
+_lock = threading.Lock()
+
+
+def asset_roots():
+    return {
+        'static': settings.STATICFILES_DIRS[0],
+        'media': settings.MEDIA_ROOT,
+    }
+
+
+def file_hash(path):
+    md5 = hashlib.md5()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(64 * 1024), ''):
+            md5.update(chunk)
+    return md5.hexdigest()[:HASH_LENGTH]
+
+
+def build_manifest():
+    """
+    Returns {root name: {path relative to the root: hash}} of all files.
+    """
+    manifest = {}
+    for name, root in asset_roots().items():
+        files = manifest[name] = {}
+        for directory, dirnames, filenames in os.walk(root):
+            for filename in filenames:
+                path = os.path.join(directory, filename)
+                files[os.path.relpath(path, root).replace(os.sep, '/')] = file_hash(path)
+    return manifest
+
+
+def get_manifest():
+    global _manifest
+    if _manifest is None:
+        with _lock:
+            if _manifest is None:
+                try:
+                    with open(ASSET_MANIFEST) as f:
+                        manifest = json.load(f)
+                except IOError:
+                    manifest = {}
+                for name in asset_roots():
+                    manifest.setdefault(name, {})
+                _manifest = manifest
+    return _manifest
+
+
+def asset_version(root, filename):
+    """
+    Hash of the file in the root ('static' or 'media'), empty if the file
+    does not exist.
+    """
+    versions = get_manifest()[root]
+    version = versions.get(filename)
+    if version is None:
+        # uploaded after the manifest was built (or there is none), hashed once per process
+        path = os.path.join(asset_roots()[root], filename)
+        version = versions[filename] = file_hash(path) if os.path.isfile(path) else ''
+    return version
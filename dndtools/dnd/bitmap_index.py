@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+In-memory bitmap index of low cardinality fields.
+
+For every indexed field (a path like "school__slug", many-to-many paths
+included) and every value the index keeps a bitmap of objects having it:
+a Python long whose bit i stands for the i-th object by id. Combining
+filters is then a few AND/OR operations on longs, and only the resulting
+ids go to the database.
+
+Indexes live in the memory of the process and are rebuilt after any model
+on the indexed paths changes (see dnd.versions).
+"""
+import threading
+from array import array
+from bisect import bisect_left
+
+from django.db import models
+
+from dnd.models import Spell, Feat, Item, Monster
+from dnd.page_cache import record_tags
+from dnd.versions import model_tag, source_tags, versions_key
+
+# model -> indexed field paths
+INDEXED_FIELDS = {
+    Spell: (
+        'verbal_component', 'somatic_component', 'material_component', 'arcane_focus_component',
+        'divine_focus_component', 'xp_component', 'meta_breath_component', 'true_name_component',
+        'corrupt_component', 'verified',
+        'school__slug', 'sub_school__slug', 'descriptors__slug', 'rulebook__slug', 'rulebook__dnd_edition__slug',
+        'class_spell_list_entries__list_slug', 'class_spell_list_entries__level',
+        'domain_spell_list_entries__list_slug', 'domain_spell_list_entries__level',
+    ),
+    Feat: (
+        'feat_categories__slug', 'rulebook__slug', 'rulebook__dnd_edition__slug',
+    ),
+    Item: (
+        'type', 'body_slot__slug', 'property__slug', 'rulebook__slug', 'rulebook__dnd_edition__slug',
+    ),
+    Monster: (
+        'rulebook__slug', 'rulebook__dnd_edition__slug',
+    ),
+}
+
+def _path_fields(model, path):
+    """
+    Models whose tables are read to get value of the path and the last field.
+    """
+    path_models = [model]
+    names = path.split('__')
+    for name in names[:-1]:
+        field, field_model, direct, m2m = model._meta.get_field_by_name(name)
+        model = field.rel.to if direct else field.model
+        path_models.append(model)
+    return path_models, model._meta.get_field_by_name(names[-1])[0]
+
+
+def index_tags(model):
+    tags = set()
+    for path in INDEXED_FIELDS[model]:
+        for path_model in _path_fields(model, path)[0]:
+            tags.update(source_tags(model_tag(path_model)))
+    return sorted(tags)
+
+
+def value_key(value):
+    """
+    Values are kept as booleans or unicode strings, the same as forms clean
+    them to (levels are integers in the database but strings in forms).
+    """
+    if value is None or isinstance(value, bool):
+        return value
+    return unicode(value)
+
+
+def _bitmap(positions, size):
+    digits = bytearray('0' * size)
+    for position in positions:
+        digits[size - 1 - position] = '1'
+    return long(str(digits) or '0', 2)
+
+
+class BitmapIndex(object):
+    def __init__(self, model, version):
+        self.model = model
+        self.version = version
+        self.ids = array('I', sorted(model._default_manager.values_list('pk', flat=True)))
+        self.all = (1L << len(self.ids)) - 1
+
+        # path -> value -> bitmap
+        self.values = {}
+        for path in INDEXED_FIELDS[model]:
+            key = bool if isinstance(_path_fields(model, path)[1], models.BooleanField) else value_key
+            positions = {}
+            for pk, value in model._default_manager.values_list('pk', path).iterator():
+                positions.setdefault(key(value), []).append(bisect_left(self.ids, pk))
+            self.values[path] = dict(
+                (value, _bitmap(value_positions, len(self.ids))) for value, value_positions in positions.iteritems())
+
+    def covers(self, path):
+        return path in self.values
+
+    def bitmap(self, path, *values):
+        """
+        Objects having any of the values in the field.
+        """
+        bitmaps = self.values[path]
+        result = 0L
+        for value in values:
+            result |= bitmaps.get(value_key(value), 0L)
+        return result
+
+    def ids_bitmap(self, ids):
+        """
+        Bitmap of objects with given ids, unknown ids are left out.
+        """
+        positions = []
+        for pk in ids:
+            position = bisect_left(self.ids, pk)
+            if position < len(self.ids) and self.ids[position] == pk:
+                positions.append(position)
+        return _bitmap(positions, len(self.ids))
+
+    def get_ids(self, bitmap):
+        digits = bin(bitmap)[:1:-1]
+        ids = self.ids
+        result = []
+        position = digits.find('1')
+        while position != -1:
+            result.append(ids[position])
+            position = digits.find('1', position + 1)
+        return result
+
+    def count(self, bitmap):
+        return bin(bitmap).count('1')
+
+    def value_counts(self, path, bitmap):
+        """
+        Number of objects of the bitmap having each value of the field.
+        """
+        return dict((value, self.count(bitmap & value_bitmap))
+                    for value, value_bitmap in self.values[path].iteritems())
+
+
+_indexes = {}
+_lock = threading.Lock()
+
+
+def get_bitmap_index(model):
+    """
+    Current bitmap index of the model, None if the model is not indexed.
+    """
+    if model not in INDEXED_FIELDS:
+        return None
+    tags = index_tags(model)
+    record_tags(tags)
+    version = versions_key(tags)
+    index = _indexes.get(model)
+    if index is None or index.version != version:
+        with _lock:
+            index = _indexes.get(model)
+            if index is None or index.version != version:
+                index = _indexes[model] = BitmapIndex(model, version)
+    return index
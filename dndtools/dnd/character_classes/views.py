@@ -4,12 +4,14 @@ from django.shortcuts import get_object_or_404, render_to_response
 from django.template.context import RequestContext
 from dnd.menu import MenuItem
 from dnd.menu import menu_item, submenu_item
+from dnd.page_cache import anonymous_page_cache, conditional_list_page
 from dnd.dnd_paginator import DndPaginator
 from dnd.filters import CharacterClassFilter
-from dnd.models import Rulebook, Spell, CharacterClass, CharacterClassVariant
+from dnd.models import Rulebook, Spell, CharacterClass, CharacterClassVariant, SpellClassLevel
 from dnd.views import is_3e_edition, permanent_redirect_view, permanent_redirect_object
 
 
+@conditional_list_page(CharacterClassVariant)
 @menu_item(MenuItem.CHARACTER_OPTIONS)
 @submenu_item(MenuItem.CharacterOptions.CLASSES)
 def character_class_list(request):
@@ -33,6 +35,7 @@ def character_class_list(request):
                               }, context_instance=RequestContext(request), )
 
 
+@anonymous_page_cache
 @menu_item(MenuItem.CHARACTER_OPTIONS)
 @submenu_item(MenuItem.CharacterOptions.CLASSES)
 def character_class_detail(request, character_class_slug, rulebook_slug=None,
@@ -114,6 +117,7 @@ def character_class_detail(request, character_class_slug, rulebook_slug=None,
                               }, context_instance=RequestContext(request), )
 
 
+@conditional_list_page(Spell, SpellClassLevel)
 @menu_item(MenuItem.CHARACTER_OPTIONS)
 @submenu_item(MenuItem.CharacterOptions.CLASSES)
 def character_class_spells(request, character_class_slug, level):
@@ -121,13 +125,13 @@ def character_class_spells(request, character_class_slug, level):
                                         slug=character_class_slug)
 
     spell_list = Spell.objects.filter(
-        spellclasslevel__character_class=character_class.id,
-        spellclasslevel__level=level).select_related(
+        class_spell_list_entries__list_slug=character_class.slug,
+        class_spell_list_entries__level=level).select_related(
         'rulebook',
         'rulebook__dnd_edition',
         'school')
 
-    paginator = DndPaginator(spell_list, request)
+    paginator = DndPaginator(spell_list, request, keyset=True)
 
     return render_to_response('dnd/character_classes/character_class_spells.html',
                               {
@@ -139,6 +143,7 @@ def character_class_spells(request, character_class_slug, level):
     )
 
 
+@conditional_list_page(CharacterClassVariant)
 @menu_item(MenuItem.CHARACTER_OPTIONS)
 @submenu_item(MenuItem.CharacterOptions.CLASSES)
 def character_classes_in_rulebook(request, rulebook_slug, rulebook_id):
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Lazily built choices for filter forms.
+
+Functions decorated with lazy_choices return a LazyChoices placeholder
+instead of a list, so defining a FilterSet does not run any query. The list
+is built when a form field iterates the choices, kept in the cache and in
+the process, and built again once any of the listed models changes.
+"""
+import hashlib
+from django.core.cache import cache
+from dnd.page_cache import record_tags
+from dnd.versions import models_tags, versions_key
+
+CHOICES_CACHE_TIMEOUT = 24 * 60 * 60
+
+
+class LazyChoices(object):
+    def __init__(self, builder, args, kwargs, models):
+        self.builder = builder
+        self.args = args
+        self.kwargs = kwargs
+        self.tags = models_tags(*models)
+        self.key = 'dnd:choices:%s:%s' % (
+            builder.__name__, hashlib.md5(repr((args, sorted(kwargs.items())))).hexdigest())
+        self._version = None
+        self._choices = None
+
+    def version(self):
+        # pages showing the choices have to change with them
+        record_tags(self.tags)
+        return versions_key(self.tags)
+
+    def get(self):
+        version = self.version()
+        if version != self._version:
+            key = '%s:%s' % (self.key, version)
+            choices = cache.get(key)
+            if choices is None:
+                choices = self.builder(*self.args, **self.kwargs)
+                cache.set(key, choices, CHOICES_CACHE_TIMEOUT)
+            self._choices, self._version = choices, version
+        return self._choices
+
+    def __iter__(self):
+        return iter(self.get())
+
+    def __len__(self):
+        return len(self.get())
+
+    def __deepcopy__(self, memo):
+        # filters are deep copied when a FilterSet is compiled, the placeholder is shared
+        return self
+
+
+def lazy_choices(*models):
+    """
+    Decorator, the choices are rebuilt after any of the models changes.
+    """
+
+    def decorator(builder):
+        def wrapper(*args, **kwargs):
+            return LazyChoices(builder, args, kwargs, models)
+
+        wrapper.__name__ = builder.__name__
+        wrapper.__doc__ = builder.__doc__
+        return wrapper
+
+    return decorator
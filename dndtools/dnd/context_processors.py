@@ -1,13 +1,43 @@
 # -*- coding: utf-8 -*-
+import bisect
+from django.core.cache import cache
 from dnd.menu import MenuItem
 from dnd.models import NewsEntry
+from dnd.versions import get_version, model_tag
+
+
+NEWS_CACHE_TIMEOUT = 24 * 60 * 60
+
+# (version, ids), replaced as a whole so threads never see a mixed pair
+_news = (None, [])
+
+
+def enabled_news_ids():
+    """
+    Sorted ids of enabled news entries, kept in the process and in the cache
+    until a news entry changes.
+    """
+    global _news
+    version = get_version(model_tag(NewsEntry))
+    news = _news
+    if news[0] != version:
+        key = 'dnd:news:%s' % version
+        ids = cache.get(key)
+        if ids is None:
+            ids = list(NewsEntry.objects.filter(enabled=True).order_by('pk').values_list('pk', flat=True))
+            cache.set(key, ids, NEWS_CACHE_TIMEOUT)
+        news = _news = (version, ids)
+    return news[1]
 
 
 def unread_news(request):
-    if 'top_news' in request.COOKIES:
-        count = len(NewsEntry.objects.filter(enabled=True, pk__gt=request.COOKIES['top_news']))
-    else:
-        count = len(NewsEntry.objects.filter(enabled=True))
+    ids = enabled_news_ids()
+    try:
+        top_news = int(request.COOKIES.get('top_news', 0))
+    except ValueError:
+        top_news = 0
+
+    count = len(ids) - bisect.bisect_right(ids, top_news)
 
     count = min(15, count)
 
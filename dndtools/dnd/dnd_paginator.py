@@ -1,16 +1,107 @@
 # -*- coding: utf-8 -*-
-from django.core.paginator import Paginator, EmptyPage, InvalidPage
+import base64
+import hashlib
+import json
+from django.core.cache import cache
+from django.core.paginator import Paginator, Page, EmptyPage, InvalidPage
+from django.db import connections
+from django.db.models import Q
+from django.db.models.query import QuerySet
+from django.db.models.sql.datastructures import EmptyResultSet
 import exceptions
 from django.template.context import Context
 from django.template.loader import get_template
+from dnd.versions import queryset_tags, versions_key
+
+COUNT_CACHE_TIMEOUT = 60 * 60
+ESTIMATE_CACHE_TIMEOUT = 10 * 60
+
+
+def estimated_row_count(model, using='default'):
+    """
+    Row count estimate from database statistics, None if the database has none.
+    """
+    key = 'dnd:row_estimate:%s:%s' % (using, model._meta.db_table)
+    estimate = cache.get(key)
+    if estimate is not None:
+        return estimate
+
+    connection = connections[using]
+    if connection.vendor == 'mysql':
+        sql = ('SELECT table_rows FROM information_schema.tables '
+               'WHERE table_schema = DATABASE() AND table_name = %s')
+    elif connection.vendor == 'postgresql':
+        sql = 'SELECT reltuples FROM pg_class WHERE relname = %s'
+    else:
+        return None
+
+    cursor = connection.cursor()
+    cursor.execute(sql, [model._meta.db_table])
+    row = cursor.fetchone()
+    if row is None or row[0] is None:
+        return None
+
+    estimate = int(row[0])
+    cache.set(key, estimate, ESTIMATE_CACHE_TIMEOUT)
+    return estimate
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Paginator which asks count_func for the number of items instead of running
+    COUNT on the object list.
+    """
+
+    def __init__(self, object_list, per_page, count_func):
+        super(CachedCountPaginator, self).__init__(object_list, per_page)
+        self.count_func = count_func
+
+    def _get_count(self):
+        if self._count is None:
+            self._count = self.count_func()
+        return self._count
+
+    count = property(_get_count)
+
+
+class KeysetPage():
+    """
+    One page of a keyset (seek) pagination. Mimics the parts of Django's Page
+    the templates need, but knows its neighbours by cursor instead of number.
+    """
+
+    def __init__(self, object_list, has_previous, has_next, previous_cursor, next_cursor):
+        self.object_list = object_list
+        self._has_previous = has_previous
+        self._has_next = has_next
+        self.previous_cursor = previous_cursor
+        self.next_cursor = next_cursor
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_next(self):
+        return self._has_next
 
 
 class DndPaginator():
     available_page_sizes = (20, 50, 100, 1000)
+    # ordering used for seeking, it has to be unique, hence the id
+    keyset_fields = ('name', 'id')
+
+    navigation_template = 'dnd/dndpaginator_navigation.html'
+    rel_prev_next_template = 'dnd/dndpaginator_rel_prev_next.html'
+    keyset_navigation_template = 'dnd/dndpaginator_keyset_navigation.html'
+    keyset_rel_prev_next_template = 'dnd/dndpaginator_keyset_rel_prev_next.html'
 
-    def __init__(self, qs, request):
+    def __init__(self, qs, request, keyset=False, approximate_count=False):
         self.qs = qs
         self.request = request
+        # ordered ids of FilterSet results (django_filters2.results.ResultList),
+        # pages are sliced from them and only the page is fetched
+        self.results = getattr(qs, 'result_list', None)
+        # estimates are good enough only for whole tables
+        self.count_is_approximate = approximate_count and self._is_unfiltered(qs)
 
         self.page_size = request.session.get('page_size',
             self.available_page_sizes[0])
@@ -25,17 +116,46 @@ class DndPaginator():
             except exceptions.ValueError:
                 pass
 
+        # keyset mode is used unless numbered page is explicitly requested
+        self.keyset = keyset and 'page' not in request.GET and self._supports_keyset(qs)
+
+        if self.keyset:
+            # Paginator is lazy, it counts only when count() is called
+            self.paginator = CachedCountPaginator(self.qs, self.page_size, self._count)
+            self.pages = []
+            self.page = self._keyset_page(request.GET.get('cursor'))
+        else:
+            self._numbered_page(request)
+
+        # create get_vars
+        get_vars = request.GET.copy()
+        for key in ('page', 'cursor'):
+            if key in get_vars:
+                del get_vars[key]
+        if len(get_vars.keys()) > 0:
+            self.get_vars = "&%s" % get_vars.urlencode()
+        else:
+            self.get_vars = ''
+        if 'page_size' in get_vars:
+            del get_vars['page_size']
+        self.hidden_inputs = get_vars.items()
+
+    def _numbered_page(self, request):
         try:
             self.page_number = int(request.GET.get('page', '1'))
         except ValueError:
             self.page_number = 1
 
-        self.paginator = Paginator(self.qs, self.page_size)
+        object_list = self.qs if self.results is None else self.results
+        self.paginator = CachedCountPaginator(object_list, self.page_size, self._count)
 
-        try:
-            self.page = self.paginator.page(self.page_number)
-        except (EmptyPage, InvalidPage):
-            self.page = self.paginator.page(self.paginator.num_pages)
+        if self.count_is_approximate:
+            self.page = self._approximate_page()
+        else:
+            try:
+                self.page = self.paginator.page(self.page_number)
+            except (EmptyPage, InvalidPage):
+                self.page = self.paginator.page(self.paginator.num_pages)
 
         # calculate pages
         self.pages = []
@@ -51,34 +171,178 @@ class DndPaginator():
                 self.pages.append(None)
                 add_none = False
 
-        # create get_vars
-        get_vars = request.GET.copy()
-        if 'page' in get_vars:
-            del get_vars['page']
-        if len(get_vars.keys()) > 0:
-            self.get_vars = "&%s" % get_vars.urlencode()
+    def _approximate_page(self):
+        """
+        Page of a list counted by an estimate. The estimate is only shown,
+        pages are checked against the rows really found: a page which is not
+        full is the last one (the count is exact then), a page behind the end
+        is replaced by the last page (counted exactly) and a full page always
+        has a next one, even if the estimate is lower.
+        """
+        number = max(1, self.page_number)
+        bottom = (number - 1) * self.page_size
+        # one extra row tells us whether there is anything behind this page
+        object_list = list(self.qs[bottom:bottom + self.page_size + 1])
+
+        if not object_list and number > 1:
+            self.paginator._count = self._exact_count()
+            self.count_is_approximate = False
+            return self.paginator.page(self.paginator.num_pages)
+
+        if len(object_list) <= self.page_size:
+            self.paginator._count = bottom + len(object_list)
+            self.count_is_approximate = False
         else:
-            self.get_vars = ''
-        if 'page_size' in get_vars:
-            del get_vars['page_size']
-        self.hidden_inputs = get_vars.items()
+            object_list = object_list[:self.page_size]
+            self.paginator._count = max(self.paginator.count, bottom + self.page_size + 1)
+        return Page(object_list, number, self.paginator)
+
+    @staticmethod
+    def _is_unfiltered(qs):
+        def has_conditions(node):
+            for child in node.children:
+                if not hasattr(child, 'children') or has_conditions(child):
+                    return True
+            return False
+
+        return isinstance(qs, QuerySet) and not has_conditions(qs.query.where) and not qs.query.extra
+
+    def _count(self):
+        if self.results is not None:
+            return len(self.results)
+        if not isinstance(self.qs, QuerySet):
+            return len(self.qs)
+
+        if self.count_is_approximate:
+            estimate = estimated_row_count(self.qs.model, self.qs.db)
+            if estimate is not None:
+                return estimate
+            self.count_is_approximate = False
+        return self._exact_count()
+
+    def _exact_count(self):
+        # compiled query is the filter data in its most normalized form
+        try:
+            sql = unicode(self.qs.query)
+        except EmptyResultSet:
+            return 0
+        key = 'dnd:count:%s' % hashlib.md5(
+            (u'%s|%s' % (sql, versions_key(queryset_tags(self.qs)))).encode('utf-8')).hexdigest()
+
+        count = cache.get(key)
+        if count is None:
+            count = self.qs.count()
+            cache.set(key, count, COUNT_CACHE_TIMEOUT)
+        return count
+
+    def _supports_keyset(self, qs):
+        if not isinstance(qs, QuerySet):
+            return False
+        ordering = list(qs.query.order_by or qs.model._meta.ordering)
+        return ordering == list(self.keyset_fields[:-1])
+
+    def _keyset_page(self, cursor):
+        name_field, id_field = self.keyset_fields
+        direction, key = self.decode_cursor(cursor)
+
+        page = self._result_ids_page(direction, key)
+        if page is not None:
+            return page
+
+        qs = self.qs
+        if direction == 'p':
+            qs = qs.filter(Q(**{'%s__lt' % name_field: key[0]}) |
+                           Q(**{name_field: key[0], '%s__lt' % id_field: key[1]}))
+            qs = qs.order_by('-%s' % name_field, '-%s' % id_field)
+        else:
+            if direction == 'n':
+                qs = qs.filter(Q(**{'%s__gt' % name_field: key[0]}) |
+                               Q(**{name_field: key[0], '%s__gt' % id_field: key[1]}))
+            qs = qs.order_by(name_field, id_field)
+
+        # one extra row tells us whether there is anything behind this page
+        object_list = list(qs[:self.page_size + 1])
+        has_more = len(object_list) > self.page_size
+        object_list = object_list[:self.page_size]
+
+        if direction == 'p':
+            object_list.reverse()
+            has_previous, has_next = has_more, True
+        else:
+            has_previous, has_next = direction == 'n', has_more
+        return self._cursor_page(object_list, has_previous, has_next, direction)
+
+    def _result_ids_page(self, direction, key):
+        """
+        Keyset page found by position of the cursor in ids of the results,
+        None if there are no ids or the cursor is not among them.
+        """
+        if self.results is None:
+            return None
+        ids = self.results.ids
+        if direction is None:
+            start = 0
+        else:
+            try:
+                position = ids.index(key[1])
+            except ValueError:
+                return None
+            start = max(0, position - self.page_size) if direction == 'p' else position + 1
+        end = position if direction == 'p' else start + self.page_size
+        return self._cursor_page(self.results[start:end], start > 0, end < len(ids), direction)
+
+    def _cursor_page(self, object_list, has_previous, has_next, direction):
+        previous_cursor = next_cursor = None
+        if object_list:
+            previous_cursor = self.encode_cursor('p', object_list[0])
+            next_cursor = self.encode_cursor('n', object_list[-1])
+        elif direction is not None:
+            # stale cursor pointing behind the end, offer the way back to start
+            has_previous, has_next = True, False
+
+        return KeysetPage(object_list, has_previous, has_next, previous_cursor, next_cursor)
+
+    def encode_cursor(self, direction, obj):
+        key = [getattr(obj, field) for field in self.keyset_fields]
+        return base64.urlsafe_b64encode(json.dumps([direction] + key)).rstrip('=')
+
+    def decode_cursor(self, cursor):
+        if not cursor:
+            return None, None
+        try:
+            cursor = str(cursor)
+            data = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+            direction, key = data[0], data[1:]
+            if direction not in ('n', 'p') or len(key) != len(self.keyset_fields):
+                return None, None
+            return direction, (key[0], int(key[1]))
+        except (TypeError, ValueError, UnicodeError, IndexError):
+            return None, None
 
     def print_navigation(self):
-        template = get_template('dnd/dndpaginator_navigation.html')
+        if self.keyset:
+            template = get_template(self.keyset_navigation_template)
+        else:
+            template = get_template(self.navigation_template)
         context = Context({
             'page_obj': self.page,
             'pages': self.pages,
             'available_page_sizes': self.available_page_sizes,
             'selected_page_size': self.page_size,
-            'count': self.count(),
             'get_vars': self.get_vars,
             'get_vars_solo': self.get_vars_solo(),
             'hidden_inputs': self.hidden_inputs,
             })
+        if not self.keyset:
+            context['count'] = self.count()
+            context['count_is_approximate'] = self.count_is_approximate
         return template.render(context)
 
     def print_rel_prev_next(self):
-        template = get_template('dnd/dndpaginator_rel_prev_next.html')
+        if self.keyset:
+            template = get_template(self.keyset_rel_prev_next_template)
+        else:
+            template = get_template(self.rel_prev_next_template)
         context = Context({
             'page_obj': self.page,
             'get_vars': self.get_vars,
@@ -99,4 +363,4 @@ class DndPaginator():
         if self.get_vars == '':
             return '.'
 
-        return '?' + self.get_vars[1:]
\ No newline at end of file
+        return '?' + self.get_vars[1:]
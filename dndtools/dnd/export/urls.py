@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+
+from django.conf.urls import patterns, url
+
+
+urlpatterns = patterns(
+    'dnd.export.views',
+
+    # export of a filtered index, e.g. /export/spells.csv?school__slug=evocation
+    url(
+        r'^(?P<index>[a-z]+)\.(?P<format>csv|ndjson)$',
+        'export',
+        name='export',
+    ),
+
+)
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+import csv
+import json
+from django.http import Http404, StreamingHttpResponse
+from dnd.filters import (SpellFilter, FeatFilter, ItemFilter, MonsterFilter, RaceFilter, CharacterClassFilter,
+                         SkillFilter)
+from dnd.models import Spell, Feat, Item, Monster, Race, CharacterClassVariant, Skill
+
+# objects fetched from the database at once
+CHUNK_SIZE = 500
+
+# index -> FilterSet, queryset, exported attributes (dotted paths)
+EXPORTS = {
+    'spells': (
+        SpellFilter,
+        lambda: Spell.objects.select_related('rulebook', 'rulebook__dnd_edition', 'school', 'sub_school'),
+        ('id', 'name', 'rulebook.name', 'rulebook.dnd_edition.name', 'page', 'school.name', 'sub_school.name',
+         'verbal_component', 'somatic_component', 'material_component', 'arcane_focus_component',
+         'divine_focus_component', 'xp_component', 'extra_components', 'casting_time', 'range', 'target',
+         'effect', 'area', 'duration', 'saving_throw', 'spell_resistance', 'get_absolute_url'),
+    ),
+    'feats': (
+        FeatFilter,
+        lambda: Feat.objects.select_related('rulebook', 'rulebook__dnd_edition'),
+        ('id', 'name', 'rulebook.name', 'rulebook.dnd_edition.name', 'page', 'description', 'benefit', 'special',
+         'normal', 'get_absolute_url'),
+    ),
+    'items': (
+        ItemFilter,
+        lambda: Item.objects.select_related('rulebook', 'rulebook__dnd_edition', 'body_slot', 'property'),
+        ('id', 'name', 'rulebook.name', 'rulebook.dnd_edition.name', 'page', 'type', 'price_gp', 'price_bonus',
+         'item_level', 'body_slot.name', 'property.name', 'caster_level', 'weight', 'get_absolute_url'),
+    ),
+    'monsters': (
+        MonsterFilter,
+        lambda: Monster.objects.select_related('rulebook', 'rulebook__dnd_edition', 'size', 'type'),
+        ('id', 'name', 'rulebook.name', 'rulebook.dnd_edition.name', 'page', 'size.name', 'type.name', 'hit_dice',
+         'initiative', 'armor_class', 'base_attack', 'grapple', 'challenge_rating', 'alignment',
+         'level_adjustment', 'get_absolute_url'),
+    ),
+    'races': (
+        RaceFilter,
+        lambda: Race.objects.select_related('rulebook', 'rulebook__dnd_edition', 'size', 'race_type'),
+        ('id', 'name', 'rulebook.name', 'rulebook.dnd_edition.name', 'page', 'size.name', 'race_type.name',
+         'str', 'dex', 'con', 'int', 'wis', 'cha', 'level_adjustment', 'natural_armor', 'get_absolute_url'),
+    ),
+    'classes': (
+        CharacterClassFilter,
+        lambda: CharacterClassVariant.objects.select_related('rulebook', 'rulebook__dnd_edition', 'character_class'),
+        ('id', 'character_class.name', 'rulebook.name', 'rulebook.dnd_edition.name', 'page',
+         'character_class.prestige', 'hit_die', 'skill_points', 'required_bab', 'alignment', 'get_absolute_url'),
+    ),
+    'skills': (
+        SkillFilter,
+        lambda: Skill.objects.all(),
+        ('id', 'name', 'base_skill', 'trained_only', 'armor_check_penalty', 'get_absolute_url'),
+    ),
+}
+
+
+def column_name(path):
+    if path == 'get_absolute_url':
+        return 'url'
+    return path.replace('.', '_')
+
+
+def export_rows(request, queryset, ids, paths):
+    """
+    Values of objects with given ids in their order, fetched in chunks so
+    the memory used does not grow with the number of objects.
+    """
+    for start in xrange(0, len(ids), CHUNK_SIZE):
+        chunk = ids[start:start + CHUNK_SIZE]
+        objects = queryset.in_bulk(chunk)
+        for pk in chunk:
+            # object could be deleted in the meantime
+            if pk not in objects:
+                continue
+            row = []
+            for path in paths:
+                value = objects[pk]
+                for name in path.split('.'):
+                    value = getattr(value, name, None)
+                    if value is None:
+                        break
+                if path == 'get_absolute_url':
+                    value = request.build_absolute_uri(value())
+                row.append(value)
+            yield row
+
+
+class _Line(object):
+    """
+    File-like target of csv.writer, returns the written line.
+    """
+
+    def write(self, line):
+        return line
+
+
+def _encode(value):
+    if value is None:
+        return ''
+    return unicode(value).encode('utf-8')
+
+
+def csv_lines(columns, rows):
+    writer = csv.writer(_Line())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([_encode(value) for value in row])
+
+
+def ndjson_lines(columns, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(columns, row))) + '\n'
+
+
+def export(request, index, format):
+    """
+    All results of the filtered index (same query parameters as the index
+    page) as CSV or newline delimited JSON, streamed.
+    """
+    if index not in EXPORTS:
+        raise Http404
+    filter_class, queryset, paths = EXPORTS[index]
+
+    f = filter_class(request.GET, queryset=queryset())
+    rows = export_rows(request, queryset(), f.ids(), paths)
+    columns = [column_name(path) for path in paths]
+
+    if format == 'csv':
+        response = StreamingHttpResponse(csv_lines(columns, rows), content_type='text/csv; charset=utf-8')
+    else:
+        response = StreamingHttpResponse(ndjson_lines(columns, rows), content_type='application/x-ndjson')
+    response['Content-Disposition'] = 'attachment; filename="%s.%s"' % (index, format)
+    return response
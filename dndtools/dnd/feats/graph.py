@@ -0,0 +1,312 @@
+# -*- coding: utf-8 -*-
+"""
+In-memory graph of feat prerequisites.
+
+Feats point to feats they require (FeatRequiresFeat), skill ranks and
+special prerequisites are kept with every feat. For each feat the graph
+holds all its ancestors (the full prerequisite chain) and descendants
+(everything it eventually unlocks), so answering either is a dictionary
+lookup.
+
+The graph lives in the process and in the cache under versions of the
+models it is built from (see dnd.versions). Adding or removing a feat
+requirement updates the graph of the process in place of a rebuild. After
+other changes the graph is rebuilt in a background thread and the previous
+one is used meanwhile, only the first graph of a process which is not in
+the cache yet is built in the request.
+
+Pages showing chains of a feat depend only on the feats in them and their
+rulebooks (see record_chain_tags), a changed requirement bumps both its
+feats.
+"""
+import hashlib
+import threading
+from django.core.cache import cache
+from django.db import connection
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from dnd.models import (Feat, Rulebook, FeatRequiresFeat, FeatRequiresSkill, Skill, FeatSpecialFeatPrerequisite,
+                        SpecialFeatPrerequisite)
+from dnd.page_cache import record_tags, skip_page_cache
+from dnd.permalinks import build_url
+from dnd.versions import get_versions, model_tag, models_tags, object_tag
+
+GRAPH_TAGS = models_tags(Feat, Rulebook, FeatRequiresFeat, FeatRequiresSkill, Skill, FeatSpecialFeatPrerequisite,
+                         SpecialFeatPrerequisite)
+EDGE_TAG = model_tag(FeatRequiresFeat)
+GRAPH_CACHE_TIMEOUT = 24 * 60 * 60
+# at most this many feats are listed in one chain
+MAX_CHAIN = 200
+
+_EMPTY = frozenset()
+
+
+def _reachable(start, edges):
+    """
+    All nodes reachable from start (start itself excluded).
+    """
+    seen = set()
+    stack = list(edges.get(start, _EMPTY))
+    while stack:
+        node = stack.pop()
+        if node not in seen:
+            seen.add(node)
+            stack.extend(edges.get(node, _EMPTY))
+    seen.discard(start)
+    return frozenset(seen)
+
+
+def _add(mapping, key, value):
+    mapping[key] = mapping.get(key, _EMPTY) | frozenset([value])
+
+
+def _remove(mapping, key, value):
+    values = mapping.get(key, _EMPTY) - frozenset([value])
+    if values:
+        mapping[key] = values
+    else:
+        mapping.pop(key, None)
+
+
+class FeatGraph(object):
+    def __init__(self, versions):
+        self.versions = versions
+        # id -> (name, slug, rulebook name, rulebook abbreviation, rulebook slug, rulebook id)
+        self.feats = dict(
+            (row[0], row[1:]) for row in Feat.objects.values_list(
+                'id', 'name', 'slug', 'rulebook__name', 'rulebook__abbr', 'rulebook__slug', 'rulebook_id'))
+        # (source, required) -> number of rows, the same pair can be stored more times
+        self.edges = {}
+        self.parents = {}
+        self.children = {}
+        for source, required in FeatRequiresFeat.objects.values_list('source_feat_id', 'required_feat_id'):
+            self.edges[source, required] = self.edges.get((source, required), 0) + 1
+            _add(self.parents, source, required)
+            _add(self.children, required, source)
+
+        self.skills = {}
+        for feat_id, name, slug, extra, min_rank in FeatRequiresSkill.objects.values_list(
+                'feat_id', 'skill__name', 'skill__slug', 'extra', 'min_rank'):
+            self.skills.setdefault(feat_id, []).append((name, slug, extra, min_rank))
+        self.specials = {}
+        for special in FeatSpecialFeatPrerequisite.objects.select_related('special_feat_prerequisite'):
+            self.specials.setdefault(special.feat_id, []).append(special.format_value())
+
+        self.ancestors = dict((feat, _reachable(feat, self.parents)) for feat in self.parents)
+        self.descendants = dict((feat, _reachable(feat, self.children)) for feat in self.children)
+
+    def _copy(self):
+        graph = FeatGraph.__new__(FeatGraph)
+        graph.__dict__.update(self.__dict__)
+        for name in ('edges', 'parents', 'children', 'ancestors', 'descendants'):
+            setattr(graph, name, dict(getattr(self, name)))
+        return graph
+
+    def with_edge(self, source, required, versions):
+        """
+        New graph with one more requirement, closures of the other feats are
+        shared with this graph.
+        """
+        graph = self._copy()
+        graph.versions = versions
+        graph.edges[source, required] = graph.edges.get((source, required), 0) + 1
+        if graph.edges[source, required] == 1:
+            _add(graph.parents, source, required)
+            _add(graph.children, required, source)
+            up = graph.ancestors.get(required, _EMPTY) | frozenset([required])
+            down = graph.descendants.get(source, _EMPTY) | frozenset([source])
+            # a feat is not its own prerequisite, even if the edge closes a cycle
+            for feat in down:
+                graph.ancestors[feat] = (graph.ancestors.get(feat, _EMPTY) | up) - frozenset([feat])
+            for feat in up:
+                graph.descendants[feat] = (graph.descendants.get(feat, _EMPTY) | down) - frozenset([feat])
+        return graph
+
+    def without_edge(self, source, required, versions):
+        """
+        New graph with one requirement less, only closures of feats around
+        the edge are computed again.
+        """
+        graph = self._copy()
+        graph.versions = versions
+        count = graph.edges.pop((source, required), 0) - 1
+        if count > 0:
+            graph.edges[source, required] = count
+        elif count == 0:
+            _remove(graph.parents, source, required)
+            _remove(graph.children, required, source)
+            for feat in self.descendants.get(source, _EMPTY) | frozenset([source]):
+                graph.ancestors[feat] = _reachable(feat, graph.parents)
+            for feat in self.ancestors.get(required, _EMPTY) | frozenset([required]):
+                graph.descendants[feat] = _reachable(feat, graph.children)
+        return graph
+
+    def _chain(self, feat_id, edges, closure, limit):
+        """
+        Feats of the closure ordered by distance from the feat, then by name.
+        """
+        depths = {}
+        layer = [feat_id]
+        depth = 0
+        while layer:
+            depth += 1
+            next_layer = []
+            for node in layer:
+                for other in edges.get(node, _EMPTY):
+                    if other not in depths and other != feat_id:
+                        depths[other] = depth
+                        next_layer.append(other)
+            layer = next_layer
+        ordered = sorted(closure, key=lambda other: (depths.get(other, depth), self.feats[other][0]))
+        return [self.node(other, depths.get(other, depth)) for other in ordered[:limit]]
+
+    def node(self, feat_id, depth=0):
+        name, slug, rulebook_name, rulebook_abbr, rulebook_slug, rulebook_id = self.feats[feat_id]
+        return {
+            'id': feat_id,
+            'name': name,
+            'url': build_url('feat_detail', kwargs={
+                'rulebook_slug': rulebook_slug, 'rulebook_id': rulebook_id, 'feat_slug': slug, 'feat_id': feat_id}),
+            'rulebook': rulebook_name,
+            'rulebook_abbr': rulebook_abbr,
+            'depth': depth,
+        }
+
+    def ancestor_chain(self, feat_id, limit=MAX_CHAIN):
+        return self._chain(feat_id, self.parents, self.ancestors.get(feat_id, _EMPTY), limit)
+
+    def descendant_chain(self, feat_id, limit=MAX_CHAIN):
+        return self._chain(feat_id, self.children, self.descendants.get(feat_id, _EMPTY), limit)
+
+    def all_skills(self, feat_id):
+        """
+        Skill ranks needed by the feat and all its prerequisites, the highest
+        rank of every skill.
+        """
+        ranks = {}
+        for feat in self.ancestors.get(feat_id, _EMPTY) | frozenset([feat_id]):
+            for name, slug, extra, min_rank in self.skills.get(feat, ()):
+                if ranks.get((name, slug, extra), -1) < min_rank:
+                    ranks[name, slug, extra] = min_rank
+        return [
+            {'name': name, 'slug': slug, 'extra': extra, 'min_rank': min_rank}
+            for (name, slug, extra), min_rank in sorted(ranks.items())
+        ]
+
+    def all_specials(self, feat_id):
+        specials = set()
+        for feat in self.ancestors.get(feat_id, _EMPTY) | frozenset([feat_id]):
+            specials.update(self.specials.get(feat, ()))
+        return sorted(specials)
+
+
+_graph = None
+# versions of the graph being built in background
+_building = None
+_lock = threading.Lock()
+
+
+def _cache_key(versions):
+    # memcached keys are limited to 250 characters
+    return 'dnd:featgraph:%s' % hashlib.md5('.'.join('%d' % versions[tag] for tag in sorted(versions))).hexdigest()
+
+
+def _build(versions):
+    graph = FeatGraph(versions)
+    cache.set(_cache_key(versions), graph, GRAPH_CACHE_TIMEOUT)
+    return graph
+
+
+def _build_in_background(versions):
+    global _graph, _building
+
+    try:
+        graph = _build(versions)
+        with _lock:
+            # an edge change could have updated the graph meanwhile
+            if _graph.versions != get_versions(GRAPH_TAGS):
+                _graph = graph
+    finally:
+        _building = None
+        # the thread has its own connection
+        connection.close()
+
+
+def get_graph():
+    """
+    Current graph. If its data changed since it was built, the previous
+    graph is returned and a new one is built in background.
+    """
+    global _graph, _building
+
+    versions = get_versions(GRAPH_TAGS)
+    graph = _graph
+    if graph is not None and graph.versions == versions:
+        return graph
+
+    with _lock:
+        graph = _graph
+        if graph is None or graph.versions != versions:
+            cached = cache.get(_cache_key(versions))
+            if cached is not None:
+                graph = _graph = cached
+            elif graph is None:
+                graph = _graph = _build(versions)
+            elif _building is None:
+                _building = versions
+                thread = threading.Thread(target=_build_in_background, args=(versions, ))
+                thread.daemon = True
+                thread.start()
+    return graph
+
+
+def record_chain_tags(graph, feat_id):
+    """
+    Makes the page being recorded depend on the feats in chains of the feat
+    and on their rulebooks. A page showing chains of an outdated graph is
+    not cached.
+    """
+    if graph.versions != get_versions(GRAPH_TAGS):
+        skip_page_cache()
+        return
+    feats = graph.ancestors.get(feat_id, _EMPTY) | graph.descendants.get(feat_id, _EMPTY) | frozenset([feat_id])
+    rulebooks = set(graph.feats[feat][5] for feat in feats if feat in graph.feats)
+    record_tags([object_tag(Feat, feat) for feat in feats] + [object_tag(Rulebook, rulebook) for rulebook in rulebooks])
+
+
+def _apply_edge_change(change):
+    """
+    Applies a new or deleted requirement to the graph of this process, if it
+    is the only change since the graph was built (the version was already
+    bumped by dnd.models.bump_model_version). Otherwise the graph is rebuilt
+    when it is needed.
+    """
+    global _graph
+    graph = _graph
+    if graph is None:
+        return
+    versions = get_versions(GRAPH_TAGS)
+    expected = dict(graph.versions)
+    expected[EDGE_TAG] += 1
+    if versions != expected:
+        return
+
+    with _lock:
+        if _graph is graph:
+            _graph = change(graph, versions)
+            cache.set(_cache_key(versions), _graph, GRAPH_CACHE_TIMEOUT)
+
+
+@receiver(post_save, sender=FeatRequiresFeat)
+def add_graph_edge(sender, instance, created, **kwargs):
+    # feats of a changed row were not known before, the graph is rebuilt
+    if created:
+        _apply_edge_change(lambda graph, versions: graph.with_edge(
+            instance.source_feat_id, instance.required_feat_id, versions))
+
+
+@receiver(post_delete, sender=FeatRequiresFeat)
+def remove_graph_edge(sender, instance, **kwargs):
+    _apply_edge_change(lambda graph, versions: graph.without_edge(
+        instance.source_feat_id, instance.required_feat_id, versions))
@@ -25,6 +25,12 @@ urlpatterns = patterns(
         'feat_category_detail',
         name='feat_category_detail',
     ),
+    # feats > prerequisite graph > json
+    url(
+        r'^graph/(?P<feat_id>\d+)/$',
+        'feat_graph_json',
+        name='feat_graph_json',
+    ),
     # feats > rulebook
     url(
         r'^(?P<rulebook_slug>[^/]+)--(?P<rulebook_id>\d+)/$',
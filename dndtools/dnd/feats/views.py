@@ -1,23 +1,29 @@
 # -*- coding: utf-8 -*-
 
+import json
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404, render_to_response
 from django.template.context import RequestContext
 from dnd.menu import menu_item, submenu_item, MenuItem
+from dnd.page_cache import anonymous_page_cache, conditional_list_page
 from dnd.dnd_paginator import DndPaginator
+from dnd.feats.graph import MAX_CHAIN, get_graph, record_chain_tags
 from dnd.filters import FeatFilter
 from dnd.models import Rulebook, FeatCategory, Feat
 from dnd.views import is_3e_edition, permanent_redirect_view, permanent_redirect_object
 
 
+@conditional_list_page(Feat)
 @menu_item(MenuItem.CHARACTER_OPTIONS)
 @submenu_item(MenuItem.CharacterOptions.FEATS)
 def feat_index(request):
     f = FeatFilter(request.GET, queryset=Feat.objects.select_related(
-        'rulebook', 'rulebook__dnd_edition').distinct())
+        'rulebook', 'rulebook__dnd_edition'))
+    f.show_facet_counts()
 
     form_submitted = 1 if '_filter' in request.GET else 0
 
-    paginator = DndPaginator(f.qs, request)
+    paginator = DndPaginator(f.qs, request, keyset=True, approximate_count=True)
 
     return render_to_response('dnd/feats/feat_index.html',
                               {
@@ -29,6 +35,7 @@ def feat_index(request):
                               }, context_instance=RequestContext(request), )
 
 
+@conditional_list_page(FeatCategory)
 @menu_item(MenuItem.CHARACTER_OPTIONS)
 @submenu_item(MenuItem.CharacterOptions.FEAT_CATEGORIES)
 def feat_category_list(request):
@@ -43,6 +50,7 @@ def feat_category_list(request):
                                   'request': request, }, context_instance=RequestContext(request), )
 
 
+@conditional_list_page(Feat)
 @menu_item(MenuItem.CHARACTER_OPTIONS)
 @submenu_item(MenuItem.CharacterOptions.FEAT_CATEGORIES)
 def feat_category_detail(request, category_slug):
@@ -57,7 +65,7 @@ def feat_category_detail(request, category_slug):
     elif feat_category.slug == 'skill-trick':
         request.submenu_item = MenuItem.CharacterOptions.SKILL_TRICKS
 
-    paginator = DndPaginator(feat_list, request)
+    paginator = DndPaginator(feat_list, request, keyset=True)
 
     return render_to_response('dnd/feats/feat_category_detail.html',
                               {
@@ -70,6 +78,7 @@ def feat_category_detail(request, category_slug):
                               context_instance=RequestContext(request), )
 
 
+@conditional_list_page(Feat)
 @menu_item(MenuItem.CHARACTER_OPTIONS)
 @submenu_item(MenuItem.CharacterOptions.FEATS)
 def feats_in_rulebook(request, rulebook_slug, rulebook_id):
@@ -84,7 +93,7 @@ def feats_in_rulebook(request, rulebook_slug, rulebook_id):
     feat_list = rulebook.feat_set.select_related('rulebook',
                                                  'rulebook__dnd_edition').all()
 
-    paginator = DndPaginator(feat_list, request)
+    paginator = DndPaginator(feat_list, request, keyset=True)
 
     return render_to_response('dnd/feats/feats_in_rulebook.html',
                               {
@@ -96,6 +105,7 @@ def feats_in_rulebook(request, rulebook_slug, rulebook_id):
                               }, context_instance=RequestContext(request), )
 
 
+@anonymous_page_cache
 @menu_item(MenuItem.CHARACTER_OPTIONS)
 @submenu_item(MenuItem.CharacterOptions.FEATS)
 def feat_detail(request, rulebook_slug, rulebook_id, feat_slug, feat_id):
@@ -118,6 +128,17 @@ def feat_detail(request, rulebook_slug, rulebook_id, feat_slug, feat_id):
     # related feats
     related_feats = Feat.objects.filter(slug=feat.slug).exclude(rulebook__id=feat.rulebook.id).select_related(
         'rulebook', 'rulebook__dnd_edition').all()
+    # whole chains, shown only if they go further than the direct requirements above
+    graph = get_graph()
+    record_chain_tags(graph, feat.id)
+    prerequisite_chain = graph.ancestor_chain(feat.id)
+    unlocks_chain = graph.descendant_chain(feat.id)
+    if not any(node['depth'] > 1 for node in prerequisite_chain):
+        prerequisite_chain = []
+    if not any(node['depth'] > 1 for node in unlocks_chain):
+        unlocks_chain = []
+    prerequisite_chain_more = len(graph.ancestors.get(feat.id, ())) - len(prerequisite_chain)
+    unlocks_chain_more = len(graph.descendants.get(feat.id, ())) - len(unlocks_chain)
 
     return render_to_response('dnd/feats/feat_detail.html',
                               {
@@ -133,6 +154,36 @@ def feat_detail(request, rulebook_slug, rulebook_id, feat_slug, feat_id):
                                   'inaccurate_url': request.build_absolute_uri(),
                                   'display_3e_warning': is_3e_edition(feat.rulebook.dnd_edition),
                                   'related_feats': related_feats,
+                                  'prerequisite_chain': prerequisite_chain,
+                                  'unlocks_chain': unlocks_chain,
+                                  'prerequisite_chain_more': prerequisite_chain_more if prerequisite_chain else 0,
+                                  'unlocks_chain_more': unlocks_chain_more if unlocks_chain else 0,
                               }, context_instance=RequestContext(request), )
 
 
+def feat_graph_json(request, feat_id):
+    """
+    Full prerequisite chain of the feat (with skill ranks and special
+    prerequisites of all feats in it) and all feats it eventually unlocks.
+    Chains are cut after ?limit= feats.
+    """
+    graph = get_graph()
+    feat_id = int(feat_id)
+    if feat_id not in graph.feats:
+        raise Http404
+    try:
+        limit = max(0, min(MAX_CHAIN, int(request.GET.get('limit', MAX_CHAIN))))
+    except ValueError:
+        limit = MAX_CHAIN
+
+    result = graph.node(feat_id)
+    del result['depth']
+    result.update({
+        'prerequisites': graph.ancestor_chain(feat_id, limit),
+        'prerequisites_count': len(graph.ancestors.get(feat_id, ())),
+        'skills': graph.all_skills(feat_id),
+        'special': graph.all_specials(feat_id),
+        'unlocks': graph.descendant_chain(feat_id, limit),
+        'unlocks_count': len(graph.descendants.get(feat_id, ())),
+    })
+    return HttpResponse(json.dumps(result), content_type='application/json')
@@ -1,11 +1,21 @@
+from copy import copy
+from hashlib import md5
+from django import forms
+from django.core.cache import cache
 import django_filters2
+from dnd.bitmap_index import get_bitmap_index, index_tags, value_key
 from dnd.models import (
     Spell, DndEdition, SpellSchool, SpellSubSchool, SpellDescriptor, FeatCategory,
     CharacterClass, Rulebook, Domain, Feat, Skill, Item, Language, RaceType, ItemSlot,
-    ItemProperty, Deity, Rule)
-from dnd.filters_fields import FeatMultiPrerequisiteFieldFilter
+    ItemProperty, Deity, Rule, SpellClassLevel, Monster, Race, FeatRequiresFeat, FeatRequiresSkill,
+    FeatSpecialFeatPrerequisite, SpecialFeatPrerequisite, TextFeatPrerequisite)
+from dnd.choices import lazy_choices
+from dnd.filters_fields import FeatMultiPrerequisiteFieldFilter, TextIndexFilter
+from dnd.page_cache import record_tags
+from dnd.versions import models_tags, queryset_tags, versions_key
 
 
+@lazy_choices(DndEdition, Rulebook)
 def rulebook_choices(unknown_entry=True):
     rulebook_choices = [
         (edition.name,
@@ -18,6 +28,7 @@ def rulebook_choices(unknown_entry=True):
     return rulebook_choices
 
 
+@lazy_choices(DndEdition)
 def edition_choices(unknown_entry=True):
     edition_choices = [(edition.slug, edition.name) for edition in
                        DndEdition.objects.all()]
@@ -33,6 +44,7 @@ def spell_level_choices():
     return spell_level_choices
 
 
+@lazy_choices(CharacterClass)
 def character_class_choices():
     character_class_choices = [
         (clazz.slug, clazz.name) for clazz in CharacterClass.objects.all()
@@ -42,6 +54,7 @@ def character_class_choices():
     return character_class_choices
 
 
+@lazy_choices(CharacterClass, SpellClassLevel)
 def character_class_casting_choices():
     character_class_choices = [
         (clazz.slug, clazz.name) for clazz in
@@ -52,6 +65,7 @@ def character_class_casting_choices():
     return character_class_choices
 
 
+@lazy_choices(Domain)
 def domain_choices():
     domain_choices = [
         (domain.slug, domain.name) for domain in Domain.objects.all()
@@ -61,19 +75,179 @@ def domain_choices():
     return domain_choices
 
 
-class SpellFilter(django_filters2.FilterSet):
+@lazy_choices(SpellSchool)
+def school_choices():
     school_choices = [(school.slug, school.name)
                       for school in SpellSchool.objects.all()]
     school_choices.insert(0, ('', 'Unknown'))
 
+    return school_choices
+
+
+@lazy_choices(SpellSubSchool)
+def sub_school_choices():
     sub_school_choices = [(sub_school.slug, sub_school.name)
                           for sub_school in SpellSubSchool.objects.all()]
     sub_school_choices.insert(0, ('', 'Unknown'))
 
+    return sub_school_choices
+
+
+@lazy_choices(SpellDescriptor)
+def descriptor_choices():
     descriptor_choices = [(descriptor.slug, descriptor.name)
                           for descriptor in SpellDescriptor.objects.all()]
     descriptor_choices.insert(0, ('', 'Unknown'))
 
+    return descriptor_choices
+
+
+@lazy_choices(ItemSlot)
+def item_slot_choices():
+    item_slot_choices = [
+        (itemSlot.slug, itemSlot.name) for itemSlot in
+        ItemSlot.objects.all()
+    ]
+    item_slot_choices.insert(0, ('', 'Unknown'))
+
+    return item_slot_choices
+
+
+@lazy_choices(ItemProperty)
+def item_property_choices():
+    return [
+        (property.slug, property.name) for property in ItemProperty.objects.all()
+    ]
+
+
+@lazy_choices(FeatCategory)
+def feat_category_choices():
+    return [(feat_category.slug, feat_category.name)
+            for feat_category in FeatCategory.objects.all()]
+
+
+FACET_COUNTS_TIMEOUT = 60 * 60
+
+
+def _counted_choices(choices, counts):
+    counted = []
+    for value, label in choices:
+        if isinstance(label, (list, tuple)):
+            counted.append((value, _counted_choices(label, counts)))
+        elif value == '' or value is None:
+            counted.append((value, label))
+        else:
+            counted.append((value, u'%s (%d)' % (label, counts.get(value_key(value), 0))))
+    return counted
+
+
+class BitmapIndexFilterSet(django_filters2.FilterSet):
+    """
+    Boolean, choice and multiple choice filters on fields of the bitmap index
+    of the model (see dnd.bitmap_index) are combined in memory and applied to
+    the query as a single condition on ids.
+    """
+    # models other than those of the index whose changes change results
+    result_models = ()
+
+    def indexed_bitmap(self):
+        """
+        Returns the index and bitmap of objects passing all indexed filters
+        (None if none of them filters). Indexed filters are left out of the
+        query then.
+        """
+        index = get_bitmap_index(self._meta.model)
+        bitmap = None
+        self._indexed = set()
+        if index is None:
+            return index, bitmap
+
+        for name, filter_ in self.filters.iteritems():
+            if filter_.grouped or not index.covers(filter_.name):
+                continue
+            try:
+                value = self.filter_value(name)
+            except forms.ValidationError:
+                continue
+            if isinstance(filter_, django_filters2.BooleanFilter):
+                values = () if value is None else (value, )
+            elif isinstance(filter_, django_filters2.MultipleChoiceFilter):
+                values = value or ()
+                # all choices selected mean no filtering, same as in MultipleChoiceFilter
+                if len(values) == len(list(filter_.field.choices)):
+                    values = ()
+            elif isinstance(filter_, django_filters2.ChoiceFilter) and filter_.lookup_type == 'exact':
+                values = (value, ) if value else ()
+            else:
+                continue
+
+            self._indexed.add(name)
+            if values:
+                filter_bitmap = index.bitmap(filter_.name, *values)
+                bitmap = filter_bitmap if bitmap is None else bitmap & filter_bitmap
+        return index, bitmap
+
+    def query_filters(self):
+        return [(name, filter_) for name, filter_ in self.filters.iteritems() if name not in self._indexed]
+
+    def filter_queryset(self, qs):
+        index, bitmap = self.indexed_bitmap()
+        qs = super(BitmapIndexFilterSet, self).filter_queryset(qs)
+        if bitmap is not None:
+            # the shorter list of ids goes to the query
+            if index.count(bitmap) * 2 > len(index.ids):
+                qs = qs.exclude(pk__in=index.get_ids(index.all & ~bitmap))
+            else:
+                qs = qs.filter(pk__in=index.get_ids(bitmap))
+        return qs
+
+    def result_version(self):
+        tags = sorted(set(index_tags(self._meta.model) + models_tags(*self.result_models) +
+                          queryset_tags(self.queryset)))
+        # pages showing the results have to change with them
+        record_tags(tags)
+        return versions_key(tags)
+
+    def facet_counts(self):
+        """
+        Number of results for every choice of choice filters on indexed
+        fields, as filter name -> choice -> count. Counted in one pass over
+        ids of the results and cached by the normalized query and the version
+        of the results (the results depend on more than the index).
+        """
+        index = get_bitmap_index(self._meta.model)
+        if index is None:
+            return {}
+
+        query = self.normalized_query()
+        key = 'dnd:facets:%s:%s:%s' % (
+            self.__class__.__name__, md5(self.result_version()).hexdigest(), md5(repr(query)).hexdigest())
+        counts = cache.get(key)
+        if counts is None:
+            if query:
+                bitmap = index.ids_bitmap(self.ids())
+            else:
+                bitmap = index.all
+            counts = {}
+            for name, filter_ in self.filters.iteritems():
+                if isinstance(filter_, (django_filters2.ChoiceFilter, django_filters2.MultipleChoiceFilter)) and \
+                        index.covers(filter_.name):
+                    counts[name] = index.value_counts(filter_.name, bitmap)
+            cache.set(key, counts, FACET_COUNTS_TIMEOUT)
+        return counts
+
+    def show_facet_counts(self):
+        """
+        Adds number of results to labels of choices in the form.
+        """
+        for name, value_counts in self.facet_counts().iteritems():
+            field = self.form.fields[name]
+            # the widget is shared with other forms of the compiled FilterSet
+            field.widget = copy(field.widget)
+            field.choices = _counted_choices(field.choices, value_counts)
+
+
+class SpellFilter(BitmapIndexFilterSet):
     name = django_filters2.CharFilter(
         lookup_type='icontains', label='Spell name'
     )
@@ -98,13 +272,13 @@ class SpellFilter(django_filters2.FilterSet):
     )
 
     school__slug = django_filters2.ChoiceFilter(
-        choices=school_choices, label='School'
+        choices=school_choices(), label='School'
     )
     sub_school__slug = django_filters2.ChoiceFilter(
-        choices=sub_school_choices, label='Sub-school'
+        choices=sub_school_choices(), label='Sub-school'
     )
     descriptors__slug = django_filters2.ChoiceFilter(
-        choices=descriptor_choices, label='Descriptor'
+        choices=descriptor_choices(), label='Descriptor'
     )
     verbal_component = django_filters2.BooleanFilter()
     somatic_component = django_filters2.BooleanFilter()
@@ -112,6 +286,9 @@ class SpellFilter(django_filters2.FilterSet):
     arcane_focus_component = django_filters2.BooleanFilter()
     divine_focus_component = django_filters2.BooleanFilter()
     xp_component = django_filters2.BooleanFilter()
+    meta_breath_component = django_filters2.BooleanFilter()
+    true_name_component = django_filters2.BooleanFilter()
+    corrupt_component = django_filters2.BooleanFilter()
 
     rulebook__dnd_edition__slug = django_filters2.MultipleChoiceFilter(
         choices=edition_choices(unknown_entry=False),
@@ -120,27 +297,30 @@ class SpellFilter(django_filters2.FilterSet):
     rulebook__slug = django_filters2.ChoiceFilter(
         label='Rulebook', choices=rulebook_choices()
     )
-    description = django_filters2.CharFilter(
-        lookup_type='icontains',
-    )
+    description = TextIndexFilter()
+    # class and level filters look at the same row of the denormalized spell list
     class_levels__slug = django_filters2.ChoiceFilter(
+        name='class_spell_list_entries__list_slug',
         choices=character_class_casting_choices(),
         help_text='Shows only classes with own spell lists',
         label='Class',
         grouped=True,
     )
     spellclasslevel__level = django_filters2.MultipleChoiceFilter(
+        name='class_spell_list_entries__level',
         choices=spell_level_choices(),
         label='Level for class',
         help_text='Use ctrl to select more levels!',
         grouped=True,
     )
     domain_levels__slug = django_filters2.ChoiceFilter(
+        name='domain_spell_list_entries__list_slug',
         choices=domain_choices(),
         label='Domain',
         grouped=True,
     )
     spelldomainlevel__level = django_filters2.MultipleChoiceFilter(
+        name='domain_spell_list_entries__level',
         choices=spell_level_choices(),
         label='Level for domain',
         help_text='Use ctrl to select more levels!',
@@ -154,7 +334,8 @@ class SpellFilter(django_filters2.FilterSet):
             'school__slug', 'sub_school__slug', 'descriptors__slug',
             'verbal_component', 'somatic_component', 'material_component',
             'arcane_focus_component', 'divine_focus_component',
-            'xp_component', 'rulebook__slug', 'rulebook__dnd_edition__slug', 'description',
+            'xp_component', 'meta_breath_component', 'true_name_component', 'corrupt_component',
+            'rulebook__slug', 'rulebook__dnd_edition__slug', 'description',
             'class_levels__slug', 'spellclasslevel__level',
             'domain_levels__slug', 'spelldomainlevel__level', ]
 
@@ -168,20 +349,10 @@ class SpellFilterAdmin(SpellFilter):
         fields = ['verified', ] + SpellFilter.Meta.fields
 
 
-class ItemFilter(django_filters2.FilterSet):
+class ItemFilter(BitmapIndexFilterSet):
     type_choices = [itemType for itemType in Item.ITEM_TYPE]
     type_choices.insert(0, ('', 'Unknown'))
 
-    item_slot_choices = [
-        (itemSlot.slug, itemSlot.name) for itemSlot in
-        ItemSlot.objects.all()
-    ]
-    item_slot_choices.insert(0, ('', 'Unknown'))
-
-    property_choices = [
-        (property.slug, property.name) for property in ItemProperty.objects.all()
-    ]
-
     name = django_filters2.CharFilter(
         lookup_type='icontains', label='Item name'
     )
@@ -196,7 +367,7 @@ class ItemFilter(django_filters2.FilterSet):
         label='Item Type', choices=type_choices
     )
     body_slot__slug = django_filters2.ChoiceFilter(
-        label='Body Slot', choices=item_slot_choices
+        label='Body Slot', choices=item_slot_choices()
     )
     price_bonus = django_filters2.NumberFilter(
         label='Price bonus'
@@ -205,7 +376,7 @@ class ItemFilter(django_filters2.FilterSet):
         label='Price in GP (range)',
     )
     property__slug = django_filters2.MultipleChoiceFilter(
-        label='Property', choices=property_choices
+        label='Property', choices=item_property_choices()
     )
 
     class Meta:
@@ -273,15 +444,15 @@ class RulebookFilter(django_filters2.FilterSet):
         fields = ['name', 'dnd_edition__slug', ]
 
 
-class FeatFilter(django_filters2.FilterSet):
-    feat_category_choices = [(feat_category.slug, feat_category.name)
-                             for feat_category in FeatCategory.objects.all()]
+class FeatFilter(BitmapIndexFilterSet):
+    result_models = (FeatRequiresFeat, FeatRequiresSkill, Skill, FeatSpecialFeatPrerequisite,
+                     SpecialFeatPrerequisite, TextFeatPrerequisite)
 
     name = django_filters2.CharFilter(
         lookup_type='icontains', label='Feat name'
     )
     feat_categories__slug = django_filters2.MultipleChoiceFilter(
-        choices=feat_category_choices,
+        choices=feat_category_choices(),
         label='Feat category'
     )
     rulebook__slug = django_filters2.MultipleChoiceFilter(
@@ -292,18 +463,10 @@ class FeatFilter(django_filters2.FilterSet):
         choices=edition_choices(unknown_entry=False),
         label='Edition',
     )
-    description = django_filters2.CharFilter(
-        lookup_type='icontains',
-    )
-    benefit = django_filters2.CharFilter(
-        lookup_type='icontains',
-    )
-    special = django_filters2.CharFilter(
-        lookup_type='icontains',
-    )
-    normal = django_filters2.CharFilter(
-        lookup_type='icontains',
-    )
+    description = TextIndexFilter()
+    benefit = TextIndexFilter()
+    special = TextIndexFilter()
+    normal = TextIndexFilter()
     prerequisite = FeatMultiPrerequisiteFieldFilter(
         label='Prerequisites',
     )
@@ -379,7 +542,7 @@ class DeityFilter(django_filters2.FilterSet):
         fields = ['name']
 
 
-class MonsterFilter(django_filters2.FilterSet):
+class MonsterFilter(BitmapIndexFilterSet):
     name = django_filters2.CharFilter(
         lookup_type='icontains', label='Monster name'
     )
@@ -392,7 +555,7 @@ class MonsterFilter(django_filters2.FilterSet):
     )
 
     class Meta:
-        model = Spell
+        model = Monster
         fields = [
             'name', 'rulebook__slug', 'rulebook__dnd_edition__slug', ]
 
@@ -410,7 +573,7 @@ class RaceFilter(django_filters2.FilterSet):
     )
 
     class Meta:
-        model = Spell
+        model = Race
         fields = [
             'name', 'rulebook__slug', 'rulebook__dnd_edition__slug', ]
 
@@ -1,14 +1,39 @@
 from django.db.models import Q
 import django_filters2
+from dnd.text_index import matching_ids, tokenize
 
 
 class FeatMultiPrerequisiteFieldFilter(django_filters2.CharFilter):
     def filter(self, qs, value):
+        q = self.as_q(value)
+        return qs if q is None else qs.filter(q).distinct()
+
+    def as_q(self, value):
         if value:
-            return qs.filter(
+            return (
                 Q(special_feat_prerequisites__print_format__icontains=value) |
                 Q(textfeatprerequisite__text__icontains=value) |
                 Q(required_skills__skill__name__icontains=value) |
                 Q(required_feats__required_feat__name__icontains=value)
             )
-        return qs
\ No newline at end of file
+        return None
+
+
+class TextIndexFilter(django_filters2.CharFilter):
+    """
+    Full text filter backed by dnd.text_index. Matches objects containing all
+    words of the value (as word prefixes, not anywhere inside words).
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('help_text', 'Words or beginnings of words, "fire" finds "fireball" but not "wildfire".')
+        super(TextIndexFilter, self).__init__(*args, **kwargs)
+
+    def filter(self, qs, value):
+        q = self.as_q(value)
+        return qs if q is None else qs.filter(q)
+
+    def as_q(self, value):
+        if value and tokenize(value):
+            return Q(pk__in=matching_ids(self.model, self.name, value))
+        return None
@@ -3,6 +3,7 @@ from math import ceil
 from django.shortcuts import get_object_or_404, render_to_response
 from django.template.context import RequestContext
 from dnd.menu import menu_item, submenu_item, MenuItem
+from dnd.page_cache import anonymous_page_cache, conditional_list_page
 from dnd.dnd_paginator import DndPaginator
 from dnd.filters import ItemFilter
 from dnd.models import Rulebook, Item
@@ -10,13 +11,15 @@ from dnd.utilities import int_with_commas
 from dnd.views import is_3e_edition, permanent_redirect_view, permanent_redirect_object
 
 
+@conditional_list_page(Item)
 @menu_item(MenuItem.ITEMS)
 @submenu_item(MenuItem.Items.MAGICAL)
 def item_index(request):
     f = ItemFilter(request.GET, queryset=Item.objects.select_related(
-        'rulebook', 'rulebook__dnd_edition', 'body_slot', 'property').distinct())
+        'rulebook', 'rulebook__dnd_edition', 'body_slot', 'property'))
+    f.show_facet_counts()
 
-    paginator = DndPaginator(f.qs, request)
+    paginator = DndPaginator(f.qs, request, keyset=True, approximate_count=True)
 
     form_submitted = 1 if '_filter' in request.GET else 0
 
@@ -30,6 +33,7 @@ def item_index(request):
                               }, context_instance=RequestContext(request), )
 
 
+@conditional_list_page(Rulebook)
 @menu_item(MenuItem.ITEMS)
 @submenu_item(MenuItem.Items.MAGICAL)
 def item_list_by_rulebook(request):
@@ -45,6 +49,7 @@ def item_list_by_rulebook(request):
                               }, context_instance=RequestContext(request), )
 
 
+@conditional_list_page(Item)
 @menu_item(MenuItem.ITEMS)
 @submenu_item(MenuItem.Items.MAGICAL)
 def items_in_rulebook(request, rulebook_slug, rulebook_id):
@@ -58,7 +63,7 @@ def items_in_rulebook(request, rulebook_slug, rulebook_id):
     item_list = rulebook.item_set.select_related(
         'rulebook', 'rulebook__dnd_edition', 'school').all()
 
-    paginator = DndPaginator(item_list, request)
+    paginator = DndPaginator(item_list, request, keyset=True)
 
     return render_to_response('dnd/items/items_in_rulebook.html',
                               {
@@ -70,6 +75,7 @@ def items_in_rulebook(request, rulebook_slug, rulebook_id):
                               }, context_instance=RequestContext(request), )
 
 
+@anonymous_page_cache
 @menu_item(MenuItem.ITEMS)
 @submenu_item(MenuItem.Items.MAGICAL)
 def item_detail(request, rulebook_slug, rulebook_id, item_slug, item_id):
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+import json
+import math
+import re
+import time
+from datetime import datetime
+from optparse import make_option
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.urlresolvers import RegexURLResolver, NoReverseMatch, reverse, resolve, Resolver404
+from django.db import connection
+from django.db.models import get_app, get_models
+from django.test.client import Client
+
+import dnd.urls
+
+# views changing data or needing special setup
+EXCLUDED_URL_NAMES = ('very_secret_url', 'spell_verify', )
+# values of url parameters which can not be taken from any object
+EXTRA_KWARGS = {
+    'level': '1',
+}
+
+
+def percentile(sorted_values, fraction):
+    """
+    Nearest-rank percentile of already sorted values.
+    """
+    # rounded first, 0.7 * 10 is a little more than 7 in floating point
+    index = max(0, int(math.ceil(round(fraction * len(sorted_values), 9))) - 1)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def url_patterns(patterns, prefix=''):
+    """
+    Yields (name, regex) of all patterns, the regex is the full one from the root of dnd.urls.
+    """
+    for pattern in patterns:
+        regex = prefix + pattern.regex.pattern.lstrip('^')
+        if isinstance(pattern, RegexURLResolver):
+            for name, nested_regex in url_patterns(pattern.url_patterns, regex.rstrip('$')):
+                yield name, nested_regex
+        else:
+            yield pattern.name, regex
+
+
+def sample_kwargs():
+    """
+    Url parameters of one object of every model with a detail page, each set
+    describes one consistent object (e.g. spell together with its rulebook).
+    """
+    samples = []
+    for model in get_models(get_app('dnd')):
+        if not hasattr(model, 'get_absolute_url'):
+            continue
+        obj = model._default_manager.order_by('pk')[:1]
+        if not obj:
+            continue
+        try:
+            samples.append(resolve(obj[0].get_absolute_url()).kwargs)
+        except (NoReverseMatch, Resolver404):
+            continue
+    return samples
+
+
+def benchmark_urls():
+    """
+    Returns list of (name, url), names of patterns which could not be
+    filled with parameters have url None.
+    """
+    samples = sample_kwargs()
+    pool = dict(EXTRA_KWARGS)
+    for kwargs in samples:
+        for key, value in kwargs.items():
+            pool.setdefault(key, value)
+
+    result = []
+    for name, regex in url_patterns(dnd.urls.urlpatterns):
+        if name in EXCLUDED_URL_NAMES:
+            continue
+        arguments = set(re.compile(regex).groupindex)
+        if name is None:
+            # unnamed patterns are benchmarked only if they have no parameters
+            path = regex.rstrip('$').replace('\\', '')
+            if not arguments and not re.search(r'[][()?*+|^$]', path):
+                result.append((path, '/' + path))
+            continue
+
+        # parameters from one object are preferred, mixed ones could lead to redirects
+        kwargs = None
+        for sample in samples:
+            if arguments.issubset(sample):
+                kwargs = dict((key, sample[key]) for key in arguments)
+                break
+        if kwargs is None and arguments.issubset(pool):
+            kwargs = dict((key, pool[key]) for key in arguments)
+
+        url = None
+        if kwargs is not None:
+            try:
+                url = reverse(name, kwargs=kwargs)
+            except NoReverseMatch:
+                pass
+        result.append((name, url))
+    return result
+
+
+class Command(BaseCommand):
+    help = ('Requests every url of dnd.urls with the test client and stores p50/p95 latency and query counts '
+            'as JSON. Use generate_benchmark_data first to get realistic volumes.')
+    option_list = BaseCommand.option_list + (
+        make_option('--repeat', type='int', dest='repeat', default=10,
+            help='Measured requests per url.'),
+        make_option('--warmup', type='int', dest='warmup', default=1,
+            help='Requests per url before measuring (not counted).'),
+        make_option('--filter', dest='filter', default=None,
+            help='Only urls with name matching this regular expression.'),
+        make_option('--output', dest='output', default=None,
+            help='File for the JSON results, benchmark-<date>.json by default.'),
+        make_option('--compare', dest='compare', default=None,
+            help='JSON results of an earlier run to compare with.'),
+    )
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError('Repeat has to be at least 1.')
+        name_filter = re.compile(options['filter']) if options['filter'] else None
+
+        # requests have to pass the ALLOWED_HOSTS check
+        hosts = [host.lstrip('.') for host in settings.ALLOWED_HOSTS if host != '*']
+        client = Client(HTTP_HOST=hosts[0] if hosts else 'localhost')
+        results = []
+        use_debug_cursor = connection.use_debug_cursor
+        connection.use_debug_cursor = True
+        try:
+            for name, url in benchmark_urls():
+                if name_filter and not name_filter.search(name):
+                    continue
+                if url is None:
+                    self.stdout.write('%-40s skipped, no parameters available\n' % name)
+                    continue
+                try:
+                    results.append(self.measure(client, name, url, options['warmup'], options['repeat']))
+                except Exception, e:
+                    # missing data (e.g. static pages) must not stop the whole run
+                    self.stdout.write('%-40s failed: %r\n' % (name, e))
+                    results.append({'name': name, 'url': url, 'error': repr(e)})
+        finally:
+            connection.use_debug_cursor = use_debug_cursor
+
+        report = {
+            'date': datetime.now().isoformat(),
+            'database': connection.vendor,
+            'repeat': options['repeat'],
+            'urls': results,
+        }
+        output = options['output'] or 'benchmark-%s.json' % datetime.now().strftime('%Y%m%d-%H%M%S')
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        self.stdout.write('Results written to %s\n' % output)
+
+        if options['compare']:
+            self.compare(options['compare'], results)
+
+    def measure(self, client, name, url, warmup, repeat):
+        for i in xrange(warmup):
+            client.get(url)
+
+        timings = []
+        queries = []
+        status = None
+        for i in xrange(repeat):
+            start = time.time()
+            response = client.get(url)
+            timings.append((time.time() - start) * 1000)
+            # queries are reset when every request starts
+            queries.append(len(connection.queries))
+            status = response.status_code
+
+        timings.sort()
+        result = {
+            'name': name,
+            'url': url,
+            'status': status,
+            'p50_ms': round(percentile(timings, 0.5), 2),
+            'p95_ms': round(percentile(timings, 0.95), 2),
+            'queries': max(queries),
+        }
+        self.stdout.write('%(name)-40s %(status)d p50 %(p50_ms)8.2f ms  p95 %(p95_ms)8.2f ms  %(queries)4d queries\n'
+                          % result)
+        return result
+
+    def compare(self, path, results):
+        with open(path) as f:
+            previous = dict((result['name'], result) for result in json.load(f)['urls'])
+
+        self.stdout.write('\nCompared with %s:\n' % path)
+        for result in results:
+            old = previous.get(result['name'])
+            if old is None or 'error' in old or 'error' in result:
+                continue
+            change = (result['p50_ms'] - old['p50_ms']) / old['p50_ms'] * 100 if old['p50_ms'] else 0
+            self.stdout.write('%-40s p50 %+7.1f %%  queries %+d\n' % (
+                result['name'], change, result['queries'] - old['queries']))
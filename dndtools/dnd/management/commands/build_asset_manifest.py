@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+import json
+from django.core.management.base import BaseCommand
+
+from dnd.assets import ASSET_MANIFEST, build_manifest
+
+
+class Command(BaseCommand):
+    help = ('Writes content hashes of static and media files to settings.ASSET_MANIFEST. '
+            'Run it on every deploy, the hashes are read once per process.')
+
+    def handle(self, *args, **options):
+        manifest = build_manifest()
+        with open(ASSET_MANIFEST, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True, separators=(',', ': '))
+        for name in sorted(manifest):
+            self.stdout.write('%s: %d files\n' % (name, len(manifest[name])))
+        self.stdout.write('Manifest written to %s\n' % ASSET_MANIFEST)
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+import time
+from optparse import make_option
+from django.core.management.base import BaseCommand, CommandError
+from django.template import Context, Template
+
+from dnd import row_renderers
+from dnd.models import Spell, Feat, Monster
+
+# renderer, row template, name of the list and of the row variable, objects
+TABLES = (
+    (row_renderers.spell_rows, 'dnd/spells/spell_table_row.html', 'spell_list', 'spell',
+     lambda: Spell.objects.select_related('rulebook', 'rulebook__dnd_edition', 'school', 'verified_author')),
+    (row_renderers.feat_rows, 'dnd/feats/feat_table_row.html', 'feat_list', 'feat',
+     lambda: Feat.objects.select_related('rulebook', 'rulebook__dnd_edition')),
+    (row_renderers.monster_rows, 'dnd/monsters/monster_table_row.html', 'monster_list', 'monster',
+     lambda: Monster.objects.select_related('rulebook', 'rulebook__dnd_edition')),
+)
+
+
+class Command(BaseCommand):
+    help = ('Checks that the fast row renderers of spell, feat and monster tables give exactly the same HTML '
+            'as their row templates, on objects from the database.')
+    option_list = BaseCommand.option_list + (
+        make_option('--limit', type='int', dest='limit', default=1000,
+            help='Objects of every table to render.'),
+    )
+
+    def handle(self, *args, **options):
+        failed = 0
+        for renderer, row_template, list_name, row_name, objects in TABLES:
+            rows = list(objects().order_by('pk')[:options['limit']])
+            template = Template('{%% for %s in %s %%}{%% include "%s" %%}{%% endfor %%}' % (
+                row_name, list_name, row_template))
+            # the admin column of the spell table depends on is_admin
+            for is_admin in (False, True):
+                start = time.time()
+                expected = template.render(Context({list_name: rows, 'is_admin': is_admin}))
+                template_time = time.time() - start
+                start = time.time()
+                rendered = renderer(rows, Context({list_name: rows, 'is_admin': is_admin}))
+                renderer_time = time.time() - start
+
+                if rendered == expected:
+                    self.stdout.write('%s (is_admin=%s): %d rows match, template %.1f ms, renderer %.1f ms\n' % (
+                        row_template, is_admin, len(rows), template_time * 1000, renderer_time * 1000))
+                    continue
+                failed += 1
+                position = next((i for i, (a, b) in enumerate(zip(rendered, expected)) if a != b),
+                                min(len(rendered), len(expected)))
+                self.stdout.write('%s (is_admin=%s): output differs at character %d\n  template: %r\n  renderer: %r\n' % (
+                    row_template, is_admin, position, expected[max(0, position - 60):position + 60],
+                    rendered[max(0, position - 60):position + 60]))
+
+        if failed:
+            raise CommandError('%d renderings differ from their templates.' % failed)
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+import random
+from optparse import make_option
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from dnd.models import (
+    DndEdition, Rulebook, SpellSchool, SpellSubSchool, SpellDescriptor, CharacterClass, CharacterClassVariant,
+    Spell, SpellClassLevel, FeatCategory, Feat, FeatRequiresFeat, MonsterType, Monster, ItemSlot, ItemProperty,
+    Item)
+from dnd.utilities import update_html_cache_attributes
+
+# every generated object has slug starting with this, so it can be found and removed again
+SLUG_PREFIX = 'bench-'
+
+# number of objects at scale 1, roughly the size of the real site
+VOLUMES = {
+    'rulebook': 60,
+    'character_class': 40,
+    'spell': 4000,
+    'feat': 3000,
+    'monster': 1500,
+    'item': 2000,
+}
+
+WORDS = (
+    'fire cold acid sonic electricity creature target spell level caster ally enemy round minute hour '
+    'damage bonus penalty attack save will reflex fortitude check skill feat weapon armor shield touch '
+    'range area effect duration dragon undead outsider elemental aberration magic divine arcane power '
+    'strength dexterity constitution intelligence wisdom charisma the a of to and in on with for by each'
+).split()
+
+
+class Command(BaseCommand):
+    help = ('Fills the database with synthetic rulebooks, spells, feats, monsters and items for benchmarks. '
+            'Never run it against production data.')
+    option_list = BaseCommand.option_list + (
+        make_option('--scale', type='float', dest='scale', default=1.0,
+            help='Multiplies the number of generated objects (1 is about the size of the real site).'),
+        make_option('--seed', type='int', dest='seed', default=0,
+            help='Random seed, the same seed and scale give the same data.'),
+        make_option('--clear', action='store_true', dest='clear', default=False,
+            help='Only remove previously generated objects.'),
+    )
+
+    def handle(self, *args, **options):
+        if options['scale'] <= 0:
+            raise CommandError('Scale has to be positive.')
+
+        with transaction.commit_on_success():
+            self.clear()
+            if options['clear']:
+                self.stdout.write('Generated objects removed.\n')
+                return
+
+            self.random = random.Random(options['seed'])
+            volumes = dict((name, max(1, int(count * options['scale']))) for name, count in VOLUMES.items())
+            self.generate(volumes)
+
+        # bulk_create skips save(), index the text and fill spell lists now
+        call_command('rebuild_text_index', stdout=self.stdout)
+        call_command('rebuild_spell_lists', stdout=self.stdout)
+
+    def clear(self):
+        # class variants go away together with their classes
+        for model in (Item, Monster, Feat, Spell, Rulebook, DndEdition, CharacterClass, SpellSchool,
+                      SpellSubSchool, SpellDescriptor, FeatCategory, MonsterType, ItemSlot, ItemProperty):
+            model.objects.filter(slug__startswith=SLUG_PREFIX).delete()
+
+    def text(self, min_words, max_words):
+        words = [self.random.choice(WORDS) for _ in xrange(self.random.randint(min_words, max_words))]
+        paragraphs = [' '.join(words[i:i + 40]).capitalize() + '.' for i in xrange(0, len(words), 40)]
+        if self.random.random() < 0.2:
+            paragraphs.append('*Special:* %s.' % ' '.join(words[:12]))
+        return '\n\n'.join(paragraphs)
+
+    def named(self, model, count, name_format, **defaults):
+        """
+        Creates simple lookup objects (name and slug), returns them with ids.
+        """
+        model.objects.bulk_create([
+            model(name=name_format % i, slug='%s%s-%d' % (SLUG_PREFIX, model._meta.object_name.lower(), i),
+                  **defaults)
+            for i in xrange(count)
+        ])
+        return list(model.objects.filter(slug__startswith=SLUG_PREFIX).order_by('id'))
+
+    def bulk(self, model, objects, *html_fields):
+        if html_fields:
+            for obj in objects:
+                update_html_cache_attributes(obj, *html_fields)
+        model.objects.bulk_create(objects, batch_size=200)
+        return list(model.objects.filter(slug__startswith=SLUG_PREFIX).values_list('id', flat=True).order_by('id'))
+
+    def generate(self, volumes):
+        rnd = self.random
+
+        editions = self.named(DndEdition, 3, 'Bench Edition %d', system='DnD 3.5')
+        rulebooks = []
+        for i in xrange(volumes['rulebook']):
+            rulebooks.append(Rulebook(
+                dnd_edition=rnd.choice(editions), name='Bench Rulebook %d' % i, abbr='BR%d' % i,
+                slug='%srulebook-%d' % (SLUG_PREFIX, i), description=self.text(20, 60)))
+        rulebook_ids = self.bulk(Rulebook, rulebooks)
+
+        schools = self.named(SpellSchool, 8, 'Bench School %d')
+        sub_schools = self.named(SpellSubSchool, 10, 'Bench Sub-school %d')
+        descriptors = self.named(SpellDescriptor, 20, 'Bench Descriptor %d')
+        classes = self.named(CharacterClass, volumes['character_class'], 'Bench Class %d')
+
+        variants = []
+        for character_class in classes:
+            variant = CharacterClassVariant(
+                character_class=character_class, rulebook_id=rnd.choice(rulebook_ids),
+                hit_die=rnd.choice((4, 6, 8, 10, 12)), skill_points=rnd.choice((2, 4, 6, 8)),
+                class_features=self.text(50, 200))
+            update_html_cache_attributes(variant, 'requirements', 'advancement', 'class_features')
+            variants.append(variant)
+        CharacterClassVariant.objects.bulk_create(variants)
+
+        spells = []
+        for i in xrange(volumes['spell']):
+            spells.append(Spell(
+                rulebook_id=rnd.choice(rulebook_ids), name='Bench Spell %d' % i, slug='%sspell-%d' % (SLUG_PREFIX, i),
+                school=rnd.choice(schools), sub_school=rnd.choice(sub_schools) if rnd.random() < 0.3 else None,
+                verbal_component=rnd.random() < 0.8, somatic_component=rnd.random() < 0.7,
+                material_component=rnd.random() < 0.3, casting_time='1 standard action',
+                range=rnd.choice(('Touch', 'Close (25 ft. + 5 ft./2 levels)', 'Medium (100 ft. + 10 ft./level)')),
+                duration='%d rounds/level' % rnd.randint(1, 10), saving_throw=rnd.choice(('None', 'Will negates')),
+                spell_resistance=rnd.choice(('Yes', 'No')), description=self.text(40, 400)))
+        spell_ids = self.bulk(Spell, spells, 'description')
+
+        SpellClassLevel.objects.bulk_create([
+            SpellClassLevel(character_class=character_class, spell_id=spell_id, level=rnd.randint(0, 9))
+            for spell_id in spell_ids
+            for character_class in rnd.sample(classes, min(len(classes), rnd.randint(1, 4)))
+        ], batch_size=500)
+        descriptor_through = Spell.descriptors.through
+        descriptor_through.objects.bulk_create([
+            descriptor_through(spell_id=spell_id, spelldescriptor_id=rnd.choice(descriptors).id)
+            for spell_id in spell_ids if rnd.random() < 0.4
+        ], batch_size=500)
+
+        categories = self.named(FeatCategory, 12, 'Bench Category %d')
+        feats = []
+        for i in xrange(volumes['feat']):
+            feats.append(Feat(
+                rulebook_id=rnd.choice(rulebook_ids), name='Bench Feat %d' % i, slug='%sfeat-%d' % (SLUG_PREFIX, i),
+                description=self.text(10, 60), benefit=self.text(20, 150),
+                special=self.text(10, 40) if rnd.random() < 0.3 else '',
+                normal=self.text(10, 30) if rnd.random() < 0.2 else ''))
+        feat_ids = self.bulk(Feat, feats, 'description', 'benefit', 'special', 'normal')
+
+        category_through = Feat.feat_categories.through
+        category_through.objects.bulk_create([
+            category_through(feat_id=feat_id, featcategory_id=rnd.choice(categories).id)
+            for feat_id in feat_ids
+        ], batch_size=500)
+        # prerequisites point only to older feats, so there are no cycles
+        FeatRequiresFeat.objects.bulk_create([
+            FeatRequiresFeat(source_feat_id=feat_id, required_feat_id=required_id)
+            for position, feat_id in enumerate(feat_ids[1:], 1)
+            for required_id in rnd.sample(feat_ids[:position], min(position, rnd.choice((0, 0, 1, 1, 2, 3))))
+        ], batch_size=500)
+
+        monster_types = self.named(MonsterType, 15, 'Bench Type %d')
+        monsters = []
+        for i in xrange(volumes['monster']):
+            monsters.append(Monster(
+                rulebook_id=rnd.choice(rulebook_ids), name='Bench Monster %d' % i,
+                slug='%smonster-%d' % (SLUG_PREFIX, i),
+                type=rnd.choice(monster_types), hit_dice='%dd8+%d' % (rnd.randint(1, 20), rnd.randint(0, 40)),
+                initiative=rnd.randint(-2, 10), armor_class='%d' % rnd.randint(10, 40), base_attack=rnd.randint(0, 20),
+                grapple=rnd.randint(0, 30), attack='Claw +5 melee (1d6)', full_attack='2 claws +5 melee (1d6)',
+                space=5, reach=5, fort_save=rnd.randint(0, 20), reflex_save=rnd.randint(0, 20),
+                will_save=rnd.randint(0, 20), str=rnd.randint(3, 30), dex=rnd.randint(3, 30), con=rnd.randint(3, 30),
+                int=rnd.randint(1, 25), wis=rnd.randint(1, 25), cha=rnd.randint(1, 25),
+                challenge_rating=rnd.randint(1, 20), description=self.text(40, 300), combat=self.text(20, 200)))
+        self.bulk(Monster, monsters, 'description', 'combat')
+
+        slots = self.named(ItemSlot, 10, 'Bench Slot %d')
+        properties = self.named(ItemProperty, 10, 'Bench Property %d')
+        items = []
+        for i in xrange(volumes['item']):
+            items.append(Item(
+                rulebook_id=rnd.choice(rulebook_ids), name='Bench Item %d' % i, slug='%sitem-%d' % (SLUG_PREFIX, i),
+                type=rnd.choice(Item.ITEM_TYPE)[0], price_gp=rnd.randint(1, 100000),
+                body_slot=rnd.choice(slots) if rnd.random() < 0.6 else None,
+                property=rnd.choice(properties) if rnd.random() < 0.3 else None,
+                caster_level=rnd.randint(1, 20), description=self.text(20, 200)))
+        self.bulk(Item, items, 'description')
+
+        for name in sorted(volumes):
+            self.stdout.write('%s: %d\n' % (name, volumes[name]))
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from dnd.models import ClassSpellListEntry, DomainSpellListEntry, SpellClassLevel, SpellDomainLevel
+
+
+class Command(BaseCommand):
+    help = ('Rebuilds the denormalized class and domain spell lists from spell levels, '
+            'needed after changes bypassing save() (bulk_create, raw SQL).')
+
+    @transaction.commit_on_success
+    def handle(self, *args, **options):
+        for entry_model, source_model, list_field in (
+                (ClassSpellListEntry, SpellClassLevel, 'character_class'),
+                (DomainSpellListEntry, SpellDomainLevel, 'domain')):
+            entry_model.objects.all().delete()
+            entry_model.objects.bulk_create([
+                entry_model(source_id=pk, list_slug=slug, level=level, spell_id=spell_id)
+                for pk, slug, level, spell_id in source_model.objects.values_list(
+                    'pk', '%s__slug' % list_field, 'level', 'spell')
+            ], batch_size=500)
+            self.stdout.write('%s: %d entries\n' % (
+                entry_model._meta.object_name, entry_model.objects.count()))
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+from optparse import make_option
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import get_model
+
+from dnd.models import TextIndexToken
+from dnd.text_index import INDEXED_FIELDS, update_text_index
+
+
+class Command(BaseCommand):
+    args = '[model ...]'
+    help = 'Rebuilds the full text index of given models (all indexed models by default).'
+    option_list = BaseCommand.option_list + (
+        make_option('--clear', action='store_true', dest='clear', default=False,
+            help='Remove existing tokens first instead of updating them.'),
+    )
+
+    def handle(self, *args, **options):
+        model_names = args or sorted(INDEXED_FIELDS.keys())
+        for model_name in model_names:
+            if model_name not in INDEXED_FIELDS:
+                raise CommandError('Model "%s" is not indexed, choose from: %s' % (
+                    model_name, ', '.join(sorted(INDEXED_FIELDS.keys()))))
+
+        for model_name in model_names:
+            model = get_model('dnd', model_name)
+            with transaction.commit_on_success():
+                if options['clear']:
+                    TextIndexToken.objects.filter(model=model_name).delete()
+                count = 0
+                for instance in model.objects.only('id', *INDEXED_FIELDS[model_name]).iterator():
+                    update_text_index(instance)
+                    count += 1
+            self.stdout.write('%s: %d objects indexed\n' % (model_name, count))
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import multiprocessing
+from optparse import make_option
+from django.core.cache import cache
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import get_app, get_models
+
+from dnd.models import HtmlCacheHash, RenderedTextile
+from dnd.utilities import RENDERER_VERSION, html_cache_fields, remove_special_chars, render_textile, textile_hash
+from dnd.versions import bump_version, model_tag, object_tag
+
+# SQLite allows at most 999 parameters in one statement
+MAX_UPDATE_PARAMS = 999
+
+
+def source_hash(sources):
+    text = u'\0'.join(source or u'' for source in sources)
+    return hashlib.md5(('%d\0' % RENDERER_VERSION) + text.encode('utf-8')).hexdigest()
+
+
+def render_rows(rows):
+    """
+    Worker: [(pk, [source, ...]), ...] -> [(pk, [cleaned source, ...], [html, ...]), ...]
+    """
+    result = []
+    for pk, sources in rows:
+        rendered = [render_textile(source or u'') for source in sources]
+        result.append((pk, [source for source, html in rendered], [html for source, html in rendered]))
+    return result
+
+
+def update_rows(model, fields, rows):
+    """
+    Writes sources and their html of many rows by as few UPDATE statements
+    as the parameter limit allows.
+    """
+    # each row takes its pk and value for every column, plus its pk in WHERE
+    batch_size = max(1, MAX_UPDATE_PARAMS // (4 * len(fields) + 1))
+    for start in xrange(0, len(rows), batch_size):
+        _update_batch(model, fields, rows[start:start + batch_size])
+
+
+def _update_batch(model, fields, rows):
+    qn = connection.ops.quote_name
+    columns = []
+    params = []
+    for position, field_name in enumerate(fields):
+        for column, values in ((model._meta.get_field(field_name).column, 1),
+                               (model._meta.get_field('%s_html' % field_name).column, 2)):
+            cases = []
+            for row in rows:
+                cases.append('WHEN %s THEN %s')
+                params.extend((row[0], row[values][position]))
+            columns.append('%s = CASE %s %s END' % (qn(column), qn(model._meta.pk.column), ' '.join(cases)))
+
+    sql = 'UPDATE %s SET %s WHERE %s IN (%s)' % (
+        qn(model._meta.db_table), ', '.join(columns), qn(model._meta.pk.column), ', '.join(['%s'] * len(rows)))
+    params.extend(row[0] for row in rows)
+    connection.cursor().execute(sql, params)
+
+
+class Command(BaseCommand):
+    args = '[model ...]'
+    help = ('Renders textile sources of all models (or given ones) into their *_html fields in parallel. '
+            'Rows whose sources did not change since the last run are skipped. Cached pages are invalidated '
+            'through data versions, which requires the cache shared with the web processes (CACHES setting). '
+            'Run for all models, it also deletes rendered texts no longer used (see RenderedTextile).')
+    option_list = BaseCommand.option_list + (
+        make_option('--processes', type='int', dest='processes', default=multiprocessing.cpu_count(),
+            help='Number of rendering processes.'),
+        make_option('--chunk-size', type='int', dest='chunk_size', default=200,
+            help='Rows read, rendered and written at once.'),
+        make_option('--force', action='store_true', dest='force', default=False,
+            help='Render all rows, also the unchanged ones.'),
+    )
+
+    def handle(self, *args, **options):
+        models = dict((model._meta.object_name.lower(), model) for model in get_models(get_app('dnd'))
+                      if html_cache_fields(model))
+        for name in args:
+            if name not in models:
+                raise CommandError('Model "%s" has no textile fields, choose from: %s' % (
+                    name, ', '.join(sorted(models))))
+
+        if isinstance(cache, (LocMemCache, DummyCache)):
+            self.stderr.write('Warning: the cache is not shared with web processes, their cached pages will '
+                              'keep the old HTML.\n')
+
+        # forked workers must not share the database connection
+        connection.close()
+        processes = max(1, options['processes'])
+        pool = multiprocessing.Pool(processes)
+        try:
+            for name in (args or sorted(models)):
+                rendered, skipped = self.render_model(
+                    models[name], pool, processes, max(1, options['chunk_size']), options['force'])
+                self.stdout.write('%s: %d rendered, %d unchanged\n' % (name, rendered, skipped))
+        finally:
+            pool.terminate()
+
+        # other texts are still referenced by models which were not rendered now
+        if not args:
+            self.stdout.write('%d unused rendered texts deleted\n' % self.prune(models.values()))
+
+    def chunks(self, model, fields, chunk_size, force):
+        """
+        Yields lists of changed rows, reads the table ordered by pk.
+        """
+        tag = model_tag(model)
+        last_pk = 0
+        while True:
+            rows = list(model.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', *fields)[:chunk_size])
+            if not rows:
+                return
+            last_pk = rows[-1][0]
+
+            hashes = {}
+            if not force:
+                hashes = dict(HtmlCacheHash.objects.filter(
+                    model=tag, object_id__in=[row[0] for row in rows]).values_list('object_id', 'hash'))
+            yield [(row[0], list(row[1:])) for row in rows if hashes.get(row[0]) != source_hash(row[1:])], len(rows)
+
+    def render_model(self, model, pool, processes, chunk_size, force):
+        tag = model_tag(model)
+        fields = html_cache_fields(model)
+        rendered = skipped = 0
+
+        pending = []
+        for rows, count in self.chunks(model, fields, chunk_size, force):
+            skipped += count - len(rows)
+            if rows:
+                pending.append(pool.apply_async(render_rows, (rows,)))
+            # keep the workers busy while results of earlier chunks are written
+            while pending and (len(pending) > processes or pending[0].ready()):
+                rendered += self.write(model, tag, fields, pending.pop(0).get())
+        while pending:
+            rendered += self.write(model, tag, fields, pending.pop(0).get())
+
+        if rendered:
+            # updates bypass save(), so tell caches built from this model
+            bump_version(tag)
+        return rendered, skipped
+
+    @transaction.commit_on_success
+    def write(self, model, tag, fields, rows):
+        update_rows(model, fields, rows)
+        HtmlCacheHash.objects.filter(model=tag, object_id__in=[row[0] for row in rows]).delete()
+        HtmlCacheHash.objects.bulk_create([
+            HtmlCacheHash(model=tag, object_id=row[0], hash=source_hash(row[1])) for row in rows
+        ])
+        # detail pages depend on versions of the objects shown
+        bump_version(*[object_tag(model, row[0]) for row in rows])
+        return len(rows)
+
+    def prune(self, models):
+        """
+        Deletes HTML of texts no current textile source has (texts of edited
+        or deleted rows), the RenderedTextile table would grow forever
+        otherwise. A text saved meanwhile may be deleted too, it is just
+        rendered again next time.
+        """
+        used = set()
+        for model in models:
+            for sources in model.objects.values_list(*html_cache_fields(model)).iterator():
+                used.update(textile_hash(remove_special_chars(source or u'', strict=True)) for source in sources)
+
+        unused = [pk for pk, key in RenderedTextile.objects.values_list('pk', 'hash').iterator() if key not in used]
+        for start in xrange(0, len(unused), MAX_UPDATE_PARAMS):
+            RenderedTextile.objects.filter(pk__in=unused[start:start + MAX_UPDATE_PARAMS]).delete()
+        return len(unused)
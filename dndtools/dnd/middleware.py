@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+import logging
+import re
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('dnd.sql_profiling')
+
+_string_re = re.compile(r"'(?:[^']|'')*'")
+_number_re = re.compile(r'\b\d+(?:\.\d+)?\b')
+_in_list_re = re.compile(r'IN \((?:\?, )*\?\)')
+_whitespace_re = re.compile(r'\s+')
+
+
+def query_shape(sql):
+    """
+    SQL with literal values replaced, so queries differing only in
+    parameters (typically one per row of a listing) have the same shape.
+    """
+    sql = _string_re.sub('?', sql)
+    sql = _number_re.sub('?', sql)
+    sql = _in_list_re.sub('IN (...)', sql)
+    return _whitespace_re.sub(' ', sql).strip()
+
+
+class SqlProfilingMiddleware(object):
+    """
+    Records queries of every request, also with DEBUG = False, and reports
+    their count, total time and query shapes repeated at least
+    SQL_PROFILING_REPEAT_THRESHOLD times, which are most likely N+1 problems
+    (a missing select_related or prefetch_related).
+
+    The summary goes to the X-SQL-Profile response header and to the
+    'dnd.sql_profiling' logger, as a warning when a repeated shape was found.
+    Opt-in, add it to MIDDLEWARE_CLASSES to enable it.
+    """
+
+    def __init__(self):
+        self.repeat_threshold = getattr(settings, 'SQL_PROFILING_REPEAT_THRESHOLD', 10)
+        self.header = getattr(settings, 'SQL_PROFILING_HEADER', 'X-SQL-Profile')
+
+    def process_request(self, request):
+        request._sql_profiling = {}
+        for connection in connections.all():
+            request._sql_profiling[connection.alias] = (connection.use_debug_cursor, len(connection.queries))
+            connection.use_debug_cursor = True
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        resolver_match = getattr(request, 'resolver_match', None)
+        if resolver_match is not None and resolver_match.url_name:
+            request._sql_profiling_view = resolver_match.url_name
+        else:
+            request._sql_profiling_view = '%s.%s' % (view_func.__module__, view_func.__name__)
+
+    def process_response(self, request, response):
+        if not hasattr(request, '_sql_profiling'):
+            return response
+
+        queries = []
+        for connection in connections.all():
+            if connection.alias not in request._sql_profiling:
+                continue
+            use_debug_cursor, start = request._sql_profiling[connection.alias]
+            connection.use_debug_cursor = use_debug_cursor
+            queries.extend(connection.queries[start:])
+        del request._sql_profiling
+
+        total_time = sum(float(query['time']) for query in queries)
+        shapes = {}
+        for query in queries:
+            shape = query_shape(query['sql'])
+            shapes[shape] = shapes.get(shape, 0) + 1
+        repeated = sorted(
+            ((count, shape) for shape, count in shapes.items() if count >= self.repeat_threshold),
+            reverse=True)
+
+        view = getattr(request, '_sql_profiling_view', request.path)
+        response[self.header] = 'view=%s; queries=%d; time=%.1fms; repeated=%s' % (
+            view, len(queries), total_time * 1000, ','.join(str(count) for count, shape in repeated) or 0)
+
+        message = '%s %s (%s): %d queries in %.1f ms' % (
+            request.method, request.path, view, len(queries), total_time * 1000)
+        if repeated:
+            logger.warning('%s, possible N+1:\n%s', message, '\n'.join(
+                '  %dx %s' % (count, shape[:500]) for count, shape in repeated))
+        else:
+            logger.info(message)
+
+        return response
@@ -0,0 +1,638 @@
+# -*- coding: utf-8 -*-
+from south.utils import datetime_utils as datetime
+from south.db import db
+from south.v2 import SchemaMigration
+from django.db import models
+
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+        # Adding model 'DomainSpellListEntry'
+        db.create_table(u'dnd_domainspelllistentry', (
+            (u'id', self.gf('django.db.models.fields.AutoField')(primary_key=True)),
+            ('list_slug', self.gf('django.db.models.fields.SlugField')(max_length=64, db_index=False)),
+            ('level', self.gf('django.db.models.fields.PositiveSmallIntegerField')()),
+            ('source', self.gf('django.db.models.fields.related.OneToOneField')(to=orm['dnd.SpellDomainLevel'], unique=True)),
+            ('spell', self.gf('django.db.models.fields.related.ForeignKey')(related_name='domain_spell_list_entries', to=orm['dnd.Spell'])),
+        ))
+        db.send_create_signal(u'dnd', ['DomainSpellListEntry'])
+
+        # Adding unique constraint on 'DomainSpellListEntry', fields ['list_slug', 'level', 'spell']
+        db.create_unique(u'dnd_domainspelllistentry', ['list_slug', 'level', 'spell_id'])
+
+        # Adding model 'ClassSpellListEntry'
+        db.create_table(u'dnd_classspelllistentry', (
+            (u'id', self.gf('django.db.models.fields.AutoField')(primary_key=True)),
+            ('list_slug', self.gf('django.db.models.fields.SlugField')(max_length=64, db_index=False)),
+            ('level', self.gf('django.db.models.fields.PositiveSmallIntegerField')()),
+            ('source', self.gf('django.db.models.fields.related.OneToOneField')(to=orm['dnd.SpellClassLevel'], unique=True)),
+            ('spell', self.gf('django.db.models.fields.related.ForeignKey')(related_name='class_spell_list_entries', to=orm['dnd.Spell'])),
+        ))
+        db.send_create_signal(u'dnd', ['ClassSpellListEntry'])
+
+        # Adding unique constraint on 'ClassSpellListEntry', fields ['list_slug', 'level', 'spell']
+        db.create_unique(u'dnd_classspelllistentry', ['list_slug', 'level', 'spell_id'])
+
+
+    def backwards(self, orm):
+        # Removing unique constraint on 'ClassSpellListEntry', fields ['list_slug', 'level', 'spell']
+        db.delete_unique(u'dnd_classspelllistentry', ['list_slug', 'level', 'spell_id'])
+
+        # Removing unique constraint on 'DomainSpellListEntry', fields ['list_slug', 'level', 'spell']
+        db.delete_unique(u'dnd_domainspelllistentry', ['list_slug', 'level', 'spell_id'])
+
+        # Deleting model 'DomainSpellListEntry'
+        db.delete_table(u'dnd_domainspelllistentry')
+
+        # Deleting model 'ClassSpellListEntry'
+        db.delete_table(u'dnd_classspelllistentry')
+
+
+    models = {
+        u'auth.group': {
+            'Meta': {'object_name': 'Group'},
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '80'}),
+            'permissions': ('django.db.models.fields.related.ManyToManyField', [], {'to': u"orm['auth.Permission']", 'symmetrical': 'False', 'blank': 'True'})
+        },
+        u'auth.permission': {
+            'Meta': {'ordering': "(u'content_type__app_label', u'content_type__model', u'codename')", 'unique_together': "((u'content_type', u'codename'),)", 'object_name': 'Permission'},
+            'codename': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            'content_type': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['contenttypes.ContentType']"}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '50'})
+        },
+        u'auth.user': {
+            'Meta': {'object_name': 'User'},
+            'date_joined': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now'}),
+            'email': ('django.db.models.fields.EmailField', [], {'max_length': '75', 'blank': 'True'}),
+            'first_name': ('django.db.models.fields.CharField', [], {'max_length': '30', 'blank': 'True'}),
+            'groups': ('django.db.models.fields.related.ManyToManyField', [], {'to': u"orm['auth.Group']", 'symmetrical': 'False', 'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'is_active': ('django.db.models.fields.BooleanField', [], {'default': 'True'}),
+            'is_staff': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'is_superuser': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'last_login': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now'}),
+            'last_name': ('django.db.models.fields.CharField', [], {'max_length': '30', 'blank': 'True'}),
+            'password': ('django.db.models.fields.CharField', [], {'max_length': '128'}),
+            'user_permissions': ('django.db.models.fields.related.ManyToManyField', [], {'to': u"orm['auth.Permission']", 'symmetrical': 'False', 'blank': 'True'}),
+            'username': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '30'})
+        },
+        u'contenttypes.contenttype': {
+            'Meta': {'ordering': "('name',)", 'unique_together': "(('app_label', 'model'),)", 'object_name': 'ContentType', 'db_table': "'django_content_type'"},
+            'app_label': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'model': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '100'})
+        },
+        u'dnd.characterclass': {
+            'Meta': {'ordering': "['name']", 'object_name': 'CharacterClass'},
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '64', 'db_index': 'True'}),
+            'prestige': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'short_description': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'short_description_html': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'slug': ('django.db.models.fields.SlugField', [], {'unique': 'True', 'max_length': '64'})
+        },
+        u'dnd.characterclassvariant': {
+            'Meta': {'ordering': "['character_class__name']", 'unique_together': "(('character_class', 'rulebook'),)", 'object_name': 'CharacterClassVariant'},
+            'advancement': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'advancement_html': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'alignment': ('django.db.models.fields.CharField', [], {'max_length': '256', 'blank': 'True'}),
+            'character_class': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.CharacterClass']"}),
+            'class_features': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'class_features_html': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'class_skills': ('django.db.models.fields.related.ManyToManyField', [], {'to': u"orm['dnd.Skill']", 'symmetrical': 'False', 'blank': 'True'}),
+            'hit_die': ('django.db.models.fields.PositiveSmallIntegerField', [], {'null': 'True', 'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'page': ('django.db.models.fields.PositiveSmallIntegerField', [], {'null': 'True', 'blank': 'True'}),
+            'required_bab': ('django.db.models.fields.PositiveSmallIntegerField', [], {'null': 'True', 'blank': 'True'}),
+            'requirements': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'requirements_html': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'rulebook': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.Rulebook']"}),
+            'skill_points': ('django.db.models.fields.PositiveSmallIntegerField', [], {'null': 'True', 'blank': 'True'}),
+            'starting_gold': ('django.db.models.fields.CharField', [], {'max_length': '32', 'blank': 'True'})
+        },
+        u'dnd.characterclassvariantrequiresfeat': {
+            'Meta': {'object_name': 'CharacterClassVariantRequiresFeat'},
+            'character_class_variant': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'required_feats'", 'to': u"orm['dnd.CharacterClassVariant']"}),
+            'extra': ('django.db.models.fields.CharField', [], {'max_length': '32', 'blank': 'True'}),
+            'feat': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.Feat']"}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'remove_comma': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'text_after': ('django.db.models.fields.CharField', [], {'max_length': '64', 'blank': 'True'}),
+            'text_before': ('django.db.models.fields.CharField', [], {'max_length': '64', 'blank': 'True'})
+        },
+        u'dnd.characterclassvariantrequiresrace': {
+            'Meta': {'object_name': 'CharacterClassVariantRequiresRace'},
+            'character_class_variant': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'required_races'", 'to': u"orm['dnd.CharacterClassVariant']"}),
+            'extra': ('django.db.models.fields.CharField', [], {'max_length': '32', 'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'race': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.Race']"}),
+            'remove_comma': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'text_after': ('django.db.models.fields.CharField', [], {'max_length': '64', 'blank': 'True'}),
+            'text_before': ('django.db.models.fields.CharField', [], {'max_length': '64', 'blank': 'True'})
+        },
+        u'dnd.characterclassvariantrequiresskill': {
+            'Meta': {'object_name': 'CharacterClassVariantRequiresSkill'},
+            'character_class_variant': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'required_skills'", 'to': u"orm['dnd.CharacterClassVariant']"}),
+            'extra': ('django.db.models.fields.CharField', [], {'max_length': '32', 'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'ranks': ('django.db.models.fields.PositiveSmallIntegerField', [], {}),
+            'remove_comma': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'skill': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.Skill']"}),
+            'text_after': ('django.db.models.fields.CharField', [], {'max_length': '64', 'blank': 'True'}),
+            'text_before': ('django.db.models.fields.CharField', [], {'max_length': '64', 'blank': 'True'})
+        },
+        u'dnd.classspelllistentry': {
+            'Meta': {'unique_together': "(('list_slug', 'level', 'spell'),)", 'object_name': 'ClassSpellListEntry'},
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'level': ('django.db.models.fields.PositiveSmallIntegerField', [], {}),
+            'list_slug': ('django.db.models.fields.SlugField', [], {'max_length': '64', 'db_index': 'False'}),
+            'source': ('django.db.models.fields.related.OneToOneField', [], {'to': u"orm['dnd.SpellClassLevel']", 'unique': 'True'}),
+            'spell': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'class_spell_list_entries'", 'to': u"orm['dnd.Spell']"})
+        },
+        u'dnd.deity': {
+            'Meta': {'ordering': "['name']", 'object_name': 'Deity'},
+            'alignment': ('django.db.models.fields.CharField', [], {'max_length': '2', 'blank': 'True'}),
+            'description': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'description_html': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'favored_weapon': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.Item']", 'null': 'True', 'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '64'}),
+            'slug': ('django.db.models.fields.SlugField', [], {'unique': 'True', 'max_length': '64'})
+        },
+        u'dnd.dndedition': {
+            'Meta': {'ordering': "['name']", 'object_name': 'DndEdition'},
+            'core': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '32', 'db_index': 'True'}),
+            'slug': ('django.db.models.fields.SlugField', [], {'unique': 'True', 'max_length': '32'}),
+            'system': ('django.db.models.fields.CharField', [], {'max_length': '16'})
+        },
+        u'dnd.domain': {
+            'Meta': {'ordering': "['name']", 'object_name': 'Domain'},
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '64'}),
+            'slug': ('django.db.models.fields.SlugField', [], {'unique': 'True', 'max_length': '64'})
+        },
+        u'dnd.domainspelllistentry': {
+            'Meta': {'unique_together': "(('list_slug', 'level', 'spell'),)", 'object_name': 'DomainSpellListEntry'},
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'level': ('django.db.models.fields.PositiveSmallIntegerField', [], {}),
+            'list_slug': ('django.db.models.fields.SlugField', [], {'max_length': '64', 'db_index': 'False'}),
+            'source': ('django.db.models.fields.related.OneToOneField', [], {'to': u"orm['dnd.SpellDomainLevel']", 'unique': 'True'}),
+            'spell': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'domain_spell_list_entries'", 'to': u"orm['dnd.Spell']"})
+        },
+        u'dnd.domainvariant': {
+            'Meta': {'object_name': 'DomainVariant'},
+            'deities': ('django.db.models.fields.related.ManyToManyField', [], {'symmetrical': 'False', 'related_name': "'primary_domains'", 'blank': 'True', 'to': u"orm['dnd.Deity']"}),
+            'deities_text': ('django.db.models.fields.CharField', [], {'max_length': '128', 'blank': 'True'}),
+            'domain': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.Domain']"}),
+            'granted_power': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'granted_power_html': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'granted_power_type': ('django.db.models.fields.CharField', [], {'max_length': '8', 'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'other_deities': ('django.db.models.fields.related.ManyToManyField', [], {'symmetrical': 'False', 'related_name': "'other_domains'", 'blank': 'True', 'to': u"orm['dnd.Deity']"}),
+            'page': ('django.db.models.fields.PositiveSmallIntegerField', [], {'null': 'True', 'blank': 'True'}),
+            'requirement': ('django.db.models.fields.CharField', [], {'max_length': '64', 'blank': 'True'}),
+            'rulebook': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.Rulebook']"})
+        },
+        u'dnd.feat': {
+            'Meta': {'ordering': "['name']", 'object_name': 'Feat'},
+            'benefit': ('django.db.models.fields.TextField', [], {}),
+            'benefit_html': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'description': ('django.db.models.fields.TextField', [], {}),
+            'description_html': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'feat_categories': ('django.db.models.fields.related.ManyToManyField', [], {'to': u"orm['dnd.FeatCategory']", 'symmetrical': 'False'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '64', 'db_index': 'True'}),
+            'normal': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'normal_html': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'page': ('django.db.models.fields.PositiveSmallIntegerField', [], {'null': 'True', 'blank': 'True'}),
+            'rulebook': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.Rulebook']"}),
+            'slug': ('django.db.models.fields.SlugField', [], {'max_length': '64'}),
+            'special': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'special_feat_prerequisites': ('django.db.models.fields.related.ManyToManyField', [], {'to': u"orm['dnd.SpecialFeatPrerequisite']", 'through': u"orm['dnd.FeatSpecialFeatPrerequisite']", 'symmetrical': 'False'}),
+            'special_html': ('django.db.models.fields.TextField', [], {'blank': 'True'})
+        },
+        u'dnd.featcategory': {
+            'Meta': {'ordering': "['name']", 'object_name': 'FeatCategory'},
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '32'}),
+            'slug': ('django.db.models.fields.SlugField', [], {'unique': 'True', 'max_length': '32'})
+        },
+        u'dnd.featrequiresfeat': {
+            'Meta': {'object_name': 'FeatRequiresFeat'},
+            'additional_text': ('django.db.models.fields.CharField', [], {'max_length': '64', 'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'required_feat': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'required_by_feats'", 'to': u"orm['dnd.Feat']"}),
+            'source_feat': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'required_feats'", 'to': u"orm['dnd.Feat']"})
+        },
+        u'dnd.featrequiresskill': {
+            'Meta': {'object_name': 'FeatRequiresSkill'},
+            'extra': ('django.db.models.fields.CharField', [], {'max_length': '32', 'blank': 'True'}),
+            'feat': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'required_skills'", 'to': u"orm['dnd.Feat']"}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'min_rank': ('django.db.models.fields.PositiveSmallIntegerField', [], {}),
+            'skill': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.Skill']"})
+        },
+        u'dnd.featspecialfeatprerequisite': {
+            'Meta': {'object_name': 'FeatSpecialFeatPrerequisite'},
+            'feat': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.Feat']"}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'special_feat_prerequisite': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.SpecialFeatPrerequisite']"}),
+            'value_1': ('django.db.models.fields.CharField', [], {'max_length': '256', 'blank': 'True'}),
+            'value_2': ('django.db.models.fields.CharField', [], {'max_length': '256', 'blank': 'True'})
+        },
+        u'dnd.htmlcachehash': {
+            'Meta': {'unique_together': "(('model', 'object_id'),)", 'object_name': 'HtmlCacheHash'},
+            'hash': ('django.db.models.fields.CharField', [], {'max_length': '32'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'model': ('django.db.models.fields.CharField', [], {'max_length': '32'}),
+            'object_id': ('django.db.models.fields.PositiveIntegerField', [], {})
+        },
+        u'dnd.item': {
+            'Meta': {'ordering': "['name']", 'object_name': 'Item'},
+            'activation': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.ItemActivationType']", 'null': 'True', 'blank': 'True'}),
+            'aura': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.ItemAuraType']", 'null': 'True', 'blank': 'True'}),
+            'aura_dc': ('django.db.models.fields.CharField', [], {'max_length': '16', 'blank': 'True'}),
+            'aura_schools': ('django.db.models.fields.related.ManyToManyField', [], {'to': u"orm['dnd.SpellSchool']", 'symmetrical': 'False', 'blank': 'True'}),
+            'body_slot': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.ItemSlot']", 'null': 'True', 'blank': 'True'}),
+            'caster_level': ('django.db.models.fields.PositiveSmallIntegerField', [], {'null': 'True', 'blank': 'True'}),
+            'cost_to_create': ('django.db.models.fields.CharField', [], {'max_length': '128', 'blank': 'True'}),
+            'description': ('django.db.models.fields.TextField', [], {}),
+            'description_html': ('django.db.models.fields.TextField', [], {}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'item_level': ('django.db.models.fields.PositiveSmallIntegerField', [], {'null': 'True', 'blank': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '64', 'db_index': 'True'}),
+            'page': ('django.db.models.fields.PositiveSmallIntegerField', [], {'null': 'True', 'blank': 'True'}),
+            'price_bonus': ('django.db.models.fields.PositiveSmallIntegerField', [], {'null': 'True', 'blank': 'True'}),
+            'price_gp': ('django.db.models.fields.PositiveIntegerField', [], {'null': 'True', 'blank': 'True'}),
+            'property': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.ItemProperty']", 'null': 'True', 'blank': 'True'}),
+            'required_extra': ('django.db.models.fields.CharField', [], {'max_length': '64', 'blank': 'True'}),
+            'required_feats': ('django.db.models.fields.related.ManyToManyField', [], {'to': u"orm['dnd.Feat']", 'symmetrical': 'False', 'blank': 'True'}),
+            'required_spells': ('django.db.models.fields.related.ManyToManyField', [], {'to': u"orm['dnd.Spell']", 'symmetrical': 'False', 'blank': 'True'}),
+            'rulebook': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.Rulebook']"}),
+            'slug': ('django.db.models.fields.SlugField', [], {'unique': 'True', 'max_length': '64'}),
+            'synergy_prerequisite': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.Item']", 'null': 'True', 'blank': 'True'}),
+            'type': ('django.db.models.fields.CharField', [], {'max_length': '3'}),
+            'visual_description': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'weight': ('django.db.models.fields.FloatField', [], {'null': 'True', 'blank': 'True'})
+        },
+        u'dnd.itemactivationtype': {
+            'Meta': {'ordering': "['name']", 'object_name': 'ItemActivationType'},
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '64', 'db_index': 'True'}),
+            'slug': ('django.db.models.fields.SlugField', [], {'unique': 'True', 'max_length': '64'})
+        },
+        u'dnd.itemauratype': {
+            'Meta': {'ordering': "['name']", 'object_name': 'ItemAuraType'},
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '64', 'db_index': 'True'}),
+            'slug': ('django.db.models.fields.SlugField', [], {'unique': 'True', 'max_length': '64'})
+        },
+        u'dnd.itemproperty': {
+            'Meta': {'ordering': "['name']", 'object_name': 'ItemProperty'},
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '64', 'db_index': 'True'}),
+            'slug': ('django.db.models.fields.SlugField', [], {'unique': 'True', 'max_length': '64'})
+        },
+        u'dnd.itemslot': {
+            'Meta': {'ordering': "['name']", 'object_name': 'ItemSlot'},
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '64', 'db_index': 'True'}),
+            'slug': ('django.db.models.fields.SlugField', [], {'unique': 'True', 'max_length': '64'})
+        },
+        u'dnd.language': {
+            'Meta': {'ordering': "['name']", 'object_name': 'Language'},
+            'description': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'description_html': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '64'}),
+            'slug': ('django.db.models.fields.SlugField', [], {'unique': 'True', 'max_length': '32'})
+        },
+        u'dnd.monster': {
+            'Meta': {'ordering': "['name']", 'unique_together': "(('name', 'rulebook'),)", 'object_name': 'Monster'},
+            'advancement': ('django.db.models.fields.CharField', [], {'max_length': '64', 'blank': 'True'}),
+            'alignment': ('django.db.models.fields.CharField', [], {'max_length': '64', 'blank': 'True'}),
+            'armor_class': ('django.db.models.fields.CharField', [], {'max_length': '128'}),
+            'attack': ('django.db.models.fields.CharField', [], {'max_length': '128'}),
+            'base_attack': ('django.db.models.fields.SmallIntegerField', [], {}),
+            'cha': ('django.db.models.fields.SmallIntegerField', [], {}),
+            'challenge_rating': ('django.db.models.fields.PositiveSmallIntegerField', [], {}),
+            'combat': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'combat_html': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'con': ('django.db.models.fields.SmallIntegerField', [], {'null': 'True', 'blank': 'True'}),
+            'description': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'description_html': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'dex': ('django.db.models.fields.SmallIntegerField', [], {}),
+            'environment': ('django.db.models.fields.CharField', [], {'max_length': '128', 'blank': 'True'}),
+            'flat_footed_armor_class': ('django.db.models.fields.SmallIntegerField', [], {'null': 'True', 'blank': 'True'}),
+            'fort_save': ('django.db.models.fields.SmallIntegerField', [], {}),
+            'fort_save_extra': ('django.db.models.fields.CharField', [], {'max_length': '32', 'blank': 'True'}),
+            'full_attack': ('django.db.models.fields.CharField', [], {'max_length': '128'}),
+            'grapple': ('django.db.models.fields.SmallIntegerField', [], {}),
+            'hit_dice': ('django.db.models.fields.CharField', [], {'max_length': '32'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'initiative': ('django.db.models.fields.SmallIntegerField', [], {}),
+            'int': ('django.db.models.fields.SmallIntegerField', [], {}),
+            'level_adjustment': ('django.db.models.fields.SmallIntegerField', [], {'null': 'True', 'blank': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '32', 'db_index': 'True'}),
+            'organization': ('django.db.models.fields.CharField', [], {'max_length': '128', 'blank': 'True'}),
+            'page': ('django.db.models.fields.PositiveSmallIntegerField', [], {'null': 'True', 'blank': 'True'}),
+            'reach': ('django.db.models.fields.PositiveSmallIntegerField', [], {}),
+            'reflex_save': ('django.db.models.fields.SmallIntegerField', [], {}),
+            'reflex_save_extra': ('django.db.models.fields.CharField', [], {'max_length': '32', 'blank': 'True'}),
+            'rulebook': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.Rulebook']"}),
+            'size': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.RaceSize']", 'null': 'True'}),
+            'slug': ('django.db.models.fields.SlugField', [], {'max_length': '32'}),
+            'space': ('django.db.models.fields.PositiveSmallIntegerField', [], {}),
+            'special_attacks': ('django.db.models.fields.CharField', [], {'max_length': '256', 'blank': 'True'}),
+            'special_qualities': ('django.db.models.fields.CharField', [], {'max_length': '512', 'blank': 'True'}),
+            'str': ('django.db.models.fields.SmallIntegerField', [], {}),
+            'subtypes': ('django.db.models.fields.related.ManyToManyField', [], {'to': u"orm['dnd.MonsterSubtype']", 'symmetrical': 'False', 'blank': 'True'}),
+            'touch_armor_class': ('django.db.models.fields.SmallIntegerField', [], {'null': 'True', 'blank': 'True'}),
+            'treasure': ('django.db.models.fields.CharField', [], {'max_length': '128', 'blank': 'True'}),
+            'type': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.MonsterType']"}),
+            'will_save': ('django.db.models.fields.SmallIntegerField', [], {}),
+            'will_save_extra': ('django.db.models.fields.CharField', [], {'max_length': '32', 'blank': 'True'}),
+            'wis': ('django.db.models.fields.SmallIntegerField', [], {})
+        },
+        u'dnd.monsterhasfeat': {
+            'Meta': {'object_name': 'MonsterHasFeat'},
+            'extra': ('django.db.models.fields.CharField', [], {'max_length': '32', 'blank': 'True'}),
+            'feat': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.Feat']"}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'monster': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'feats'", 'to': u"orm['dnd.Monster']"})
+        },
+        u'dnd.monsterhasskill': {
+            'Meta': {'object_name': 'MonsterHasSkill'},
+            'extra': ('django.db.models.fields.CharField', [], {'max_length': '32', 'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'monster': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'skills'", 'to': u"orm['dnd.Monster']"}),
+            'ranks': ('django.db.models.fields.PositiveSmallIntegerField', [], {}),
+            'skill': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.Skill']"})
+        },
+        u'dnd.monsterspeed': {
+            'Meta': {'object_name': 'MonsterSpeed'},
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'race': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.Monster']"}),
+            'speed': ('django.db.models.fields.PositiveSmallIntegerField', [], {}),
+            'type': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'+'", 'to': u"orm['dnd.RaceSpeedType']"})
+        },
+        u'dnd.monstersubtype': {
+            'Meta': {'ordering': "['name']", 'object_name': 'MonsterSubtype'},
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '32', 'db_index': 'True'}),
+            'slug': ('django.db.models.fields.SlugField', [], {'unique': 'True', 'max_length': '32'})
+        },
+        u'dnd.monstertype': {
+            'Meta': {'ordering': "['name']", 'object_name': 'MonsterType'},
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '32', 'db_index': 'True'}),
+            'slug': ('django.db.models.fields.SlugField', [], {'unique': 'True', 'max_length': '32'})
+        },
+        u'dnd.newsentry': {
+            'Meta': {'ordering': "['-published']", 'object_name': 'NewsEntry'},
+            'body': ('django.db.models.fields.TextField', [], {}),
+            'body_html': ('django.db.models.fields.TextField', [], {}),
+            'enabled': ('django.db.models.fields.BooleanField', [], {'default': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'published': ('django.db.models.fields.DateField', [], {}),
+            'title': ('django.db.models.fields.CharField', [], {'max_length': '64'})
+        },
+        u'dnd.race': {
+            'Meta': {'ordering': "['name']", 'unique_together': "(('name', 'rulebook'),)", 'object_name': 'Race'},
+            'automatic_languages': ('django.db.models.fields.related.ManyToManyField', [], {'symmetrical': 'False', 'related_name': "'races_with_automatic'", 'blank': 'True', 'to': u"orm['dnd.Language']"}),
+            'bonus_languages': ('django.db.models.fields.related.ManyToManyField', [], {'symmetrical': 'False', 'related_name': "'races_with_bonus'", 'blank': 'True', 'to': u"orm['dnd.Language']"}),
+            'cha': ('django.db.models.fields.SmallIntegerField', [], {'default': '0'}),
+            'combat': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'combat_html': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'con': ('django.db.models.fields.SmallIntegerField', [], {'default': '0', 'null': 'True', 'blank': 'True'}),
+            'description': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'description_html': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'dex': ('django.db.models.fields.SmallIntegerField', [], {'default': '0'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'image': ('django.db.models.fields.files.ImageField', [], {'max_length': '100', 'null': 'True', 'blank': 'True'}),
+            'int': ('django.db.models.fields.SmallIntegerField', [], {'default': '0'}),
+            'level_adjustment': ('django.db.models.fields.SmallIntegerField', [], {'default': '0'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '32', 'db_index': 'True'}),
+            'natural_armor': ('django.db.models.fields.SmallIntegerField', [], {'null': 'True', 'blank': 'True'}),
+            'page': ('django.db.models.fields.PositiveSmallIntegerField', [], {'null': 'True', 'blank': 'True'}),
+            'race_type': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.RaceType']", 'null': 'True', 'blank': 'True'}),
+            'racial_hit_dice_count': ('django.db.models.fields.PositiveSmallIntegerField', [], {'null': 'True', 'blank': 'True'}),
+            'racial_traits': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'racial_traits_html': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'reach': ('django.db.models.fields.PositiveSmallIntegerField', [], {}),
+            'rulebook': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.Rulebook']"}),
+            'size': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.RaceSize']"}),
+            'slug': ('django.db.models.fields.SlugField', [], {'max_length': '32'}),
+            'space': ('django.db.models.fields.PositiveSmallIntegerField', [], {}),
+            'str': ('django.db.models.fields.SmallIntegerField', [], {'default': '0'}),
+            'wis': ('django.db.models.fields.SmallIntegerField', [], {'default': '0'})
+        },
+        u'dnd.racefavoredcharacterclass': {
+            'Meta': {'object_name': 'RaceFavoredCharacterClass'},
+            'character_class': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.CharacterClass']"}),
+            'extra': ('django.db.models.fields.CharField', [], {'max_length': '32', 'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'race': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'favored_classes'", 'to': u"orm['dnd.Race']"})
+        },
+        u'dnd.racesize': {
+            'Meta': {'ordering': "['order']", 'object_name': 'RaceSize'},
+            'description': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '32', 'db_index': 'True'}),
+            'order': ('django.db.models.fields.PositiveSmallIntegerField', [], {})
+        },
+        u'dnd.racespeed': {
+            'Meta': {'object_name': 'RaceSpeed'},
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'race': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.Race']"}),
+            'speed': ('django.db.models.fields.PositiveSmallIntegerField', [], {}),
+            'type': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'+'", 'to': u"orm['dnd.RaceSpeedType']"})
+        },
+        u'dnd.racespeedtype': {
+            'Meta': {'ordering': "['name', 'extra']", 'object_name': 'RaceSpeedType'},
+            'extra': ('django.db.models.fields.CharField', [], {'max_length': '32', 'null': 'True', 'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '32', 'db_index': 'True'})
+        },
+        u'dnd.racetype': {
+            'Meta': {'ordering': "['name']", 'object_name': 'RaceType'},
+            'base_attack_type': ('django.db.models.fields.CharField', [], {'max_length': '3'}),
+            'base_fort_save_type': ('django.db.models.fields.CharField', [], {'max_length': '4'}),
+            'base_reflex_save_type': ('django.db.models.fields.CharField', [], {'max_length': '4'}),
+            'base_will_save_type': ('django.db.models.fields.CharField', [], {'max_length': '4'}),
+            'hit_die_size': ('django.db.models.fields.PositiveSmallIntegerField', [], {}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '32', 'db_index': 'True'}),
+            'slug': ('django.db.models.fields.SlugField', [], {'unique': 'True', 'max_length': '32'})
+        },
+        u'dnd.renderedtextile': {
+            'Meta': {'object_name': 'RenderedTextile'},
+            'hash': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '32'}),
+            'html': ('django.db.models.fields.TextField', [], {}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'})
+        },
+        u'dnd.rule': {
+            'Meta': {'object_name': 'Rule'},
+            'body': ('django.db.models.fields.TextField', [], {}),
+            'body_html': ('django.db.models.fields.TextField', [], {}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '64', 'db_index': 'True'}),
+            'page_from': ('django.db.models.fields.PositiveSmallIntegerField', [], {'null': 'True', 'blank': 'True'}),
+            'page_to': ('django.db.models.fields.PositiveSmallIntegerField', [], {'null': 'True', 'blank': 'True'}),
+            'rulebook': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.Rulebook']"}),
+            'slug': ('django.db.models.fields.SlugField', [], {'unique': 'True', 'max_length': '64'})
+        },
+        u'dnd.rulebook': {
+            'Meta': {'ordering': "['name']", 'object_name': 'Rulebook'},
+            'abbr': ('django.db.models.fields.CharField', [], {'max_length': '7'}),
+            'description': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'dnd_edition': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.DndEdition']"}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'image': ('django.db.models.fields.files.ImageField', [], {'max_length': '100', 'null': 'True', 'blank': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '128', 'db_index': 'True'}),
+            'official_url': ('django.db.models.fields.URLField', [], {'max_length': '255', 'blank': 'True'}),
+            'published': ('django.db.models.fields.DateField', [], {'null': 'True', 'blank': 'True'}),
+            'slug': ('django.db.models.fields.SlugField', [], {'unique': 'True', 'max_length': '128'}),
+            'year': ('django.db.models.fields.CharField', [], {'max_length': '4', 'null': 'True', 'blank': 'True'})
+        },
+        u'dnd.skill': {
+            'Meta': {'ordering': "['name']", 'object_name': 'Skill'},
+            'armor_check_penalty': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'base_skill': ('django.db.models.fields.CharField', [], {'max_length': '4'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '64'}),
+            'required_by_feats': ('django.db.models.fields.related.ManyToManyField', [], {'to': u"orm['dnd.Feat']", 'through': u"orm['dnd.FeatRequiresSkill']", 'symmetrical': 'False'}),
+            'slug': ('django.db.models.fields.SlugField', [], {'unique': 'True', 'max_length': '64'}),
+            'trained_only': ('django.db.models.fields.BooleanField', [], {'default': 'False'})
+        },
+        u'dnd.skillvariant': {
+            'Meta': {'unique_together': "(('skill', 'rulebook'),)", 'object_name': 'SkillVariant'},
+            'action': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'action_html': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'check': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'check_html': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'description': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'description_html': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'page': ('django.db.models.fields.PositiveSmallIntegerField', [], {'null': 'True', 'blank': 'True'}),
+            'restriction': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'restriction_html': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'rulebook': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.Rulebook']"}),
+            'skill': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.Skill']"}),
+            'special': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'special_html': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'synergy': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'synergy_html': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'try_again': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'try_again_html': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'untrained': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'untrained_html': ('django.db.models.fields.TextField', [], {'blank': 'True'})
+        },
+        u'dnd.specialfeatprerequisite': {
+            'Meta': {'ordering': "['name']", 'object_name': 'SpecialFeatPrerequisite'},
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '64'}),
+            'print_format': ('django.db.models.fields.CharField', [], {'max_length': '64'})
+        },
+        u'dnd.spell': {
+            'Meta': {'ordering': "['name']", 'unique_together': "(('name', 'rulebook'),)", 'object_name': 'Spell'},
+            'added': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'}),
+            'arcane_focus_component': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'area': ('django.db.models.fields.CharField', [], {'max_length': '256', 'null': 'True', 'blank': 'True'}),
+            'casting_time': ('django.db.models.fields.CharField', [], {'max_length': '256', 'null': 'True', 'blank': 'True'}),
+            'class_levels': ('django.db.models.fields.related.ManyToManyField', [], {'to': u"orm['dnd.CharacterClass']", 'through': u"orm['dnd.SpellClassLevel']", 'symmetrical': 'False'}),
+            'corrupt_component': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'corrupt_level': ('django.db.models.fields.PositiveSmallIntegerField', [], {'null': 'True', 'blank': 'True'}),
+            'description': ('django.db.models.fields.TextField', [], {}),
+            'description_html': ('django.db.models.fields.TextField', [], {'blank': 'True'}),
+            'descriptors': ('django.db.models.fields.related.ManyToManyField', [], {'to': u"orm['dnd.SpellDescriptor']", 'symmetrical': 'False', 'blank': 'True'}),
+            'divine_focus_component': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'domain_levels': ('django.db.models.fields.related.ManyToManyField', [], {'to': u"orm['dnd.Domain']", 'through': u"orm['dnd.SpellDomainLevel']", 'symmetrical': 'False'}),
+            'duration': ('django.db.models.fields.CharField', [], {'max_length': '256', 'null': 'True', 'blank': 'True'}),
+            'effect': ('django.db.models.fields.CharField', [], {'max_length': '256', 'null': 'True', 'blank': 'True'}),
+            'extra_components': ('django.db.models.fields.CharField', [], {'max_length': '256', 'null': 'True', 'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'material_component': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'meta_breath_component': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '64', 'db_index': 'True'}),
+            'page': ('django.db.models.fields.PositiveSmallIntegerField', [], {'null': 'True', 'blank': 'True'}),
+            'range': ('django.db.models.fields.CharField', [], {'max_length': '256', 'null': 'True', 'blank': 'True'}),
+            'rulebook': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.Rulebook']"}),
+            'saving_throw': ('django.db.models.fields.CharField', [], {'max_length': '128', 'null': 'True', 'blank': 'True'}),
+            'school': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.SpellSchool']"}),
+            'slug': ('django.db.models.fields.SlugField', [], {'max_length': '64'}),
+            'somatic_component': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'spell_resistance': ('django.db.models.fields.CharField', [], {'max_length': '64', 'null': 'True', 'blank': 'True'}),
+            'sub_school': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.SpellSubSchool']", 'null': 'True', 'blank': 'True'}),
+            'target': ('django.db.models.fields.CharField', [], {'max_length': '256', 'null': 'True', 'blank': 'True'}),
+            'true_name_component': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'verbal_component': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'verified': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'verified_author': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['auth.User']", 'null': 'True', 'blank': 'True'}),
+            'verified_time': ('django.db.models.fields.DateTimeField', [], {'null': 'True', 'blank': 'True'}),
+            'xp_component': ('django.db.models.fields.BooleanField', [], {'default': 'False'})
+        },
+        u'dnd.spellclasslevel': {
+            'Meta': {'ordering': "['spell', 'level']", 'unique_together': "(('character_class', 'spell'),)", 'object_name': 'SpellClassLevel'},
+            'character_class': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.CharacterClass']"}),
+            'extra': ('django.db.models.fields.CharField', [], {'max_length': '32', 'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'level': ('django.db.models.fields.PositiveSmallIntegerField', [], {}),
+            'spell': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.Spell']"})
+        },
+        u'dnd.spelldescriptor': {
+            'Meta': {'ordering': "['name']", 'object_name': 'SpellDescriptor'},
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '64', 'db_index': 'True'}),
+            'slug': ('django.db.models.fields.SlugField', [], {'unique': 'True', 'max_length': '64'})
+        },
+        u'dnd.spelldomainlevel': {
+            'Meta': {'ordering': "['spell', 'level']", 'unique_together': "(('domain', 'spell'),)", 'object_name': 'SpellDomainLevel'},
+            'domain': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.Domain']"}),
+            'extra': ('django.db.models.fields.CharField', [], {'max_length': '32', 'blank': 'True'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'level': ('django.db.models.fields.PositiveSmallIntegerField', [], {}),
+            'spell': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.Spell']"})
+        },
+        u'dnd.spellschool': {
+            'Meta': {'ordering': "['name']", 'object_name': 'SpellSchool'},
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '32'}),
+            'slug': ('django.db.models.fields.SlugField', [], {'unique': 'True', 'max_length': '32'})
+        },
+        u'dnd.spellsubschool': {
+            'Meta': {'ordering': "['name']", 'object_name': 'SpellSubSchool'},
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '32'}),
+            'slug': ('django.db.models.fields.SlugField', [], {'unique': 'True', 'max_length': '32'})
+        },
+        u'dnd.staticpage': {
+            'Meta': {'object_name': 'StaticPage'},
+            'body': ('django.db.models.fields.TextField', [], {}),
+            'body_html': ('django.db.models.fields.TextField', [], {}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '32'})
+        },
+        u'dnd.textfeatprerequisite': {
+            'Meta': {'ordering': "['text']", 'object_name': 'TextFeatPrerequisite'},
+            'feat': ('django.db.models.fields.related.ForeignKey', [], {'to': u"orm['dnd.Feat']"}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'text': ('django.db.models.fields.CharField', [], {'max_length': '256'})
+        },
+        u'dnd.textindextoken': {
+            'Meta': {'unique_together': "(('model', 'field', 'token', 'object_id'),)", 'object_name': 'TextIndexToken'},
+            'field': ('django.db.models.fields.CharField', [], {'max_length': '32'}),
+            u'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'model': ('django.db.models.fields.CharField', [], {'max_length': '32'}),
+            'object_id': ('django.db.models.fields.PositiveIntegerField', [], {'db_index': 'True'}),
+            'token': ('django.db.models.fields.CharField', [], {'max_length': '32'})
+        }
+    }
+
+    complete_apps = ['dnd']
\ No newline at end of file
@@ -116,8 +116,8 @@ def character_class_spells_mobile(request, character_class_slug, level):
                                         slug=character_class_slug)
 
     spell_list = Spell.objects.filter(
-        spellclasslevel__character_class=character_class.id,
-        spellclasslevel__level=level).select_related(
+        class_spell_list_entries__list_slug=character_class.slug,
+        class_spell_list_entries__level=level).select_related(
         'rulebook',
         'rulebook__dnd_edition',
         'school')
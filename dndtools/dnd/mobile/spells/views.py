@@ -285,8 +285,9 @@ def spell_domain_detail_mobile(request, spell_domain_slug, rulebook_slug=None, r
     else:
         display_3e_warning = False
 
-    spell_list = spell_domain.spell_set.select_related(
-        'rulebook', 'rulebook__dnd_edition', 'school').all()
+    spell_list = Spell.objects.filter(
+        domain_spell_list_entries__list_slug=spell_domain.slug).select_related(
+        'rulebook', 'rulebook__dnd_edition', 'school')
 
     paginator = DndMobilePaginator(spell_list, request)
 
@@ -4,9 +4,13 @@ from PIL import Image
 from django.contrib.auth.models import User
 from django.db import models
 
+from dnd.permalinks import permalink
+from dnd.text_index import update_text_index, delete_text_index
 from dnd.utilities import update_html_cache_attributes
+from dnd.versions import bump_version, model_tag, object_tag, instance_tags
 from django.dispatch import receiver
 from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save, post_delete, m2m_changed
 
 @receiver(connection_created)
 def connection_conf(sender, **kwargs):
@@ -34,7 +38,7 @@ class DndEdition(models.Model):
     def __unicode__(self):
         return self.name
 
-    @models.permalink
+    @permalink
     def get_absolute_url(self):
         return (
             'edition_detail', (),
@@ -44,7 +48,7 @@ class DndEdition(models.Model):
             }
         )
 
-    @models.permalink
+    @permalink
     def get_absolute_url_mobile(self):
         return (
             'edition_detail_mobile', (),
@@ -100,7 +104,7 @@ class Rulebook(models.Model):
     def __unicode__(self):
         return self.name
 
-    @models.permalink
+    @permalink
     def get_absolute_url(self):
         return (
             'rulebook_detail', (),
@@ -112,7 +116,7 @@ class Rulebook(models.Model):
             }
         )
 
-    @models.permalink
+    @permalink
     def get_absolute_url_mobile(self):
         return (
             'rulebook_detail_mobile', (),
@@ -155,7 +159,7 @@ class CharacterClass(models.Model):
     def __unicode__(self):
         return self.name
 
-    @models.permalink
+    @permalink
     def get_absolute_url(self):
         return (
             'character_class_detail', (),
@@ -164,7 +168,7 @@ class CharacterClass(models.Model):
             }
         )
 
-    @models.permalink
+    @permalink
     def get_absolute_url_mobile(self):
         return (
             'character_class_detail_mobile', (),
@@ -251,7 +255,7 @@ class CharacterClassVariant(models.Model):
     def __unicode__(self):
         return "%s variant (%s)" % (self.character_class.name, self.rulebook.name)
 
-    @models.permalink
+    @permalink
     def get_absolute_url(self):
         return (
             'character_class_variant_detail', (),
@@ -262,7 +266,7 @@ class CharacterClassVariant(models.Model):
             }
         )
 
-    @models.permalink
+    @permalink
     def get_absolute_url_mobile(self):
         return (
             'character_class_variant_detail_mobile', (),
@@ -404,7 +408,7 @@ class Deity(models.Model):
         update_html_cache_attributes(self, 'description')
         super(Deity, self).save(*args, **kwargs)
 
-    @models.permalink
+    @permalink
     def get_absolute_url(self):
         return (
             'deity_detail', (),
@@ -413,7 +417,7 @@ class Deity(models.Model):
             }
         )
 
-    @models.permalink
+    @permalink
     def get_absolute_url_mobile(self):
         return (
             'deity_detail_mobile', (),
@@ -439,7 +443,7 @@ class Domain(models.Model):
     def __unicode__(self):
         return self.name
 
-    @models.permalink
+    @permalink
     def get_absolute_url(self):
         return (
             'spell_domain_detail', (),
@@ -448,7 +452,7 @@ class Domain(models.Model):
             }
         )
 
-    @models.permalink
+    @permalink
     def get_absolute_url_mobile(self):
         return (
             'spell_domain_detail_mobile', (),
@@ -513,7 +517,7 @@ class DomainVariant(models.Model):
         update_html_cache_attributes(self, 'granted_power')
         super(DomainVariant, self).save(*args, **kwargs)
 
-    @models.permalink
+    @permalink
     def get_absolute_url(self):
         return (
             'spell_variant_domain_detail', (),
@@ -524,7 +528,7 @@ class DomainVariant(models.Model):
             }
         )
 
-    @models.permalink
+    @permalink
     def get_absolute_url_mobile(self):
         return (
             'spell_variant_domain_detail_mobile', (),
@@ -553,7 +557,7 @@ class SpellDescriptor(models.Model):
     def __unicode__(self):
         return self.name
 
-    @models.permalink
+    @permalink
     def get_absolute_url(self):
         return (
             'spell_descriptor_detail', (),
@@ -562,7 +566,7 @@ class SpellDescriptor(models.Model):
             }
         )
 
-    @models.permalink
+    @permalink
     def get_absolute_url_mobile(self):
         return (
             'spell_descriptor_detail_mobile', (),
@@ -588,7 +592,7 @@ class SpellSchool(models.Model):
     def __unicode__(self):
         return self.name
 
-    @models.permalink
+    @permalink
     def get_absolute_url(self):
         return (
             'spell_school_detail', (),
@@ -597,7 +601,7 @@ class SpellSchool(models.Model):
             }
         )
 
-    @models.permalink
+    @permalink
     def get_absolute_url_mobile(self):
         return (
             'spell_school_detail_mobile', (),
@@ -623,7 +627,7 @@ class SpellSubSchool(models.Model):
     def __unicode__(self):
         return self.name
 
-    @models.permalink
+    @permalink
     def get_absolute_url(self):
         return (
             'spell_sub_school_detail', (),
@@ -632,7 +636,7 @@ class SpellSubSchool(models.Model):
             }
         )
 
-    @models.permalink
+    @permalink
     def get_absolute_url_mobile(self):
         return (
             'spell_sub_school_detail_mobile', (),
@@ -776,11 +780,12 @@ class Spell(models.Model):
     def save(self, *args, **kwargs):
         update_html_cache_attributes(self, 'description')
         super(Spell, self).save(*args, **kwargs)
+        update_text_index(self)
 
     def __unicode__(self):
         return self.name
 
-    @models.permalink
+    @permalink
     def get_absolute_url(self):
         return (
             'spell_detail', (),
@@ -792,7 +797,7 @@ class Spell(models.Model):
             }
         )
 
-    @models.permalink
+    @permalink
     def get_absolute_url_mobile(self):
         return (
             'spell_detail_mobile', (),
@@ -858,7 +863,7 @@ class FeatCategory(models.Model):
     def __unicode__(self):
         return self.name
 
-    @models.permalink
+    @permalink
     def get_absolute_url(self):
         return (
             'feat_category_detail', (),
@@ -867,7 +872,7 @@ class FeatCategory(models.Model):
             }
         )
 
-    @models.permalink
+    @permalink
     def get_absolute_url_mobile(self):
         return (
             'feat_category_detail_mobile', (),
@@ -905,7 +910,7 @@ class Skill(models.Model):
     def __unicode__(self):
         return self.name
 
-    @models.permalink
+    @permalink
     def get_absolute_url(self):
         return (
             'skill_detail', (),
@@ -914,7 +919,7 @@ class Skill(models.Model):
             }
         )
 
-    @models.permalink
+    @permalink
     def get_absolute_url_mobile(self):
         return (
             'skill_detail_mobile', (),
@@ -1019,7 +1024,7 @@ class SkillVariant(models.Model):
     def __unicode__(self):
         return "%s variant (%s)" % (self.skill.name, self.rulebook.name)
 
-    @models.permalink
+    @permalink
     def get_absolute_url(self):
         return (
             'skill_variant_detail', (),
@@ -1030,7 +1035,7 @@ class SkillVariant(models.Model):
             }
         )
 
-    @models.permalink
+    @permalink
     def get_absolute_url_mobile(self):
         return (
             'skill_variant_detail_mobile', (),
@@ -1123,11 +1128,12 @@ class Feat(models.Model):
     def save(self, *args, **kwargs):
         update_html_cache_attributes(self, 'description', 'benefit', 'special', 'normal')
         super(Feat, self).save(*args, **kwargs)
+        update_text_index(self)
 
     def __unicode__(self):
         return self.name
 
-    @models.permalink
+    @permalink
     def get_absolute_url(self):
         return (
             'feat_detail', (),
@@ -1139,7 +1145,7 @@ class Feat(models.Model):
             }
         )
 
-    @models.permalink
+    @permalink
     def get_absolute_url_mobile(self):
         return (
             'feat_detail_mobile', (),
@@ -1256,7 +1262,7 @@ class Language(models.Model):
     def __unicode__(self):
         return self.name
 
-    @models.permalink
+    @permalink
     def get_absolute_url(self):
         return (
             'language_detail', (),
@@ -1265,7 +1271,7 @@ class Language(models.Model):
             }
         )
 
-    @models.permalink
+    @permalink
     def get_absolute_url_mobile(self):
         return (
             'language_detail_mobile', (),
@@ -1345,7 +1351,7 @@ class MonsterType(models.Model):
     def __unicode__(self):
         return self.name
 
-    @models.permalink
+    @permalink
     def get_absolute_url(self):
         return (
             'monster_type_detail', (),
@@ -1354,7 +1360,7 @@ class MonsterType(models.Model):
             }
         )
 
-    @models.permalink
+    @permalink
     def get_absolute_url_mobile(self):
         return (
             'monster_type_detail_mobile', (),
@@ -1380,7 +1386,7 @@ class MonsterSubtype(models.Model):
     def __unicode__(self):
         return self.name
 
-    @models.permalink
+    @permalink
     def get_absolute_url(self):
         return (
             'monster_subtype_detail', (),
@@ -1389,7 +1395,7 @@ class MonsterSubtype(models.Model):
             }
         )
 
-    @models.permalink
+    @permalink
     def get_absolute_url_mobile(self):
         return (
             'monster_subtype_detail_mobile', (),
@@ -1570,6 +1576,7 @@ class Monster(models.Model):
     def save(self, *args, **kwargs):
         update_html_cache_attributes(self, 'description', 'combat')
         super(Monster, self).save(*args, **kwargs)
+        update_text_index(self)
 
     class Meta:
         unique_together = (("name", "rulebook",))
@@ -1578,7 +1585,7 @@ class Monster(models.Model):
     def __unicode__(self):
         return self.name
 
-    @models.permalink
+    @permalink
     def get_absolute_url(self):
         return (
             'monster_detail', (),
@@ -1590,7 +1597,7 @@ class Monster(models.Model):
             }
         )
 
-    @models.permalink
+    @permalink
     def get_absolute_url_mobile(self):
         return (
             'monster_detail_mobile', (),
@@ -1709,7 +1716,7 @@ class RaceType(models.Model):
     def __unicode__(self):
         return self.name
 
-    @models.permalink
+    @permalink
     def get_absolute_url(self):
         return (
             'race_type_detail', (),
@@ -1718,7 +1725,7 @@ class RaceType(models.Model):
             }
         )
 
-    @models.permalink
+    @permalink
     def get_absolute_url_mobile(self):
         return (
             'race_type_detail_mobile', (),
@@ -1864,6 +1871,7 @@ class Race(models.Model):
     def save(self, *args, **kwargs):
         update_html_cache_attributes(self, 'description', 'combat', 'racial_traits')
         super(Race, self).save(*args, **kwargs)
+        update_text_index(self)
 
         # resize
         if self.image:
@@ -1880,7 +1888,7 @@ class Race(models.Model):
     def __unicode__(self):
         return self.name
 
-    @models.permalink
+    @permalink
     def get_absolute_url(self):
         return (
             'race_detail', (),
@@ -1892,7 +1900,7 @@ class Race(models.Model):
             }
         )
 
-    @models.permalink
+    @permalink
     def get_absolute_url_mobile(self):
         return (
             'race_detail_mobile', (),
@@ -2173,8 +2181,9 @@ class Item(models.Model):
         # TODO remove params based on "only for"
         update_html_cache_attributes(self, 'description')
         super(Item, self).save(*args, **kwargs)
+        update_text_index(self)
 
-    @models.permalink
+    @permalink
     def get_absolute_url(self):
         return (
             'item_detail', (),
@@ -2186,7 +2195,7 @@ class Item(models.Model):
             }
         )
 
-    @models.permalink
+    @permalink
     def get_absolute_url_mobile(self):
         return (
             'item_detail_mobile', (),
@@ -2299,7 +2308,7 @@ class Rule(models.Model):
         update_html_cache_attributes(self, 'body')
         super(Rule, self).save(*args, **kwargs)
 
-    @models.permalink
+    @permalink
     def get_absolute_url(self):
         return (
             'rule_detail', (),
@@ -2311,7 +2320,7 @@ class Rule(models.Model):
             }
         )
 
-    @models.permalink
+    @permalink
     def get_absolute_url_mobile(self):
         return (
             'rule_detail_mobile', (),
@@ -2322,3 +2331,178 @@ class Rule(models.Model):
                 'rulebook_id': self.rulebook.id,
             }
         )
+
+
+class TextIndexToken(models.Model):
+    """
+    Inverted index of words in long text fields, see dnd.text_index.
+    """
+    model = models.CharField(
+        max_length=32,
+    )
+    field = models.CharField(
+        max_length=32,
+    )
+    token = models.CharField(
+        max_length=32,
+    )
+    object_id = models.PositiveIntegerField(
+        db_index=True,
+    )
+
+    class Meta:
+        unique_together = (("model", "field", "token", "object_id",),)
+
+    def __unicode__(self):
+        return "%s.%s: %s (%d)" % (self.model, self.field, self.token, self.object_id)
+
+
+
+class HtmlCacheHash(models.Model):
+    """
+    Hash of textile sources (and renderer version) the *_html fields of an
+    object were last rendered from by the render_html_cache command.
+    """
+    model = models.CharField(
+        max_length=32,
+    )
+    object_id = models.PositiveIntegerField()
+    hash = models.CharField(
+        max_length=32,
+    )
+
+    class Meta:
+        unique_together = (("model", "object_id",),)
+
+    def __unicode__(self):
+        return "%s %d: %s" % (self.model, self.object_id, self.hash)
+
+
+
+class RenderedTextile(models.Model):
+    """
+    HTML of a textile text, keyed by hash of the text and renderer version,
+    see dnd.utilities.render_textile_cached.
+    """
+    hash = models.CharField(
+        max_length=32,
+        unique=True,
+    )
+    html = models.TextField()
+
+    def __unicode__(self):
+        return self.hash
+
+
+class SpellListEntry(models.Model):
+    """
+    Denormalized spell list of a class or domain, one row per spell and
+    level. Kept in sync with its source (SpellClassLevel or SpellDomainLevel)
+    by signals, the unique index (list_slug, level, spell) answers "spells of
+    this list and level" by one range scan without joins.
+    """
+    list_slug = models.SlugField(
+        max_length=64,
+        db_index=False,
+    )
+    level = models.PositiveSmallIntegerField()
+
+    class Meta:
+        abstract = True
+        unique_together = (("list_slug", "level", "spell",),)
+
+    def __unicode__(self):
+        return "%s %d: %s" % (self.list_slug, self.level, self.spell_id)
+
+
+class ClassSpellListEntry(SpellListEntry):
+    source = models.OneToOneField(
+        SpellClassLevel,
+    )
+    spell = models.ForeignKey(
+        Spell,
+        related_name='class_spell_list_entries',
+    )
+
+
+class DomainSpellListEntry(SpellListEntry):
+    source = models.OneToOneField(
+        SpellDomainLevel,
+    )
+    spell = models.ForeignKey(
+        Spell,
+        related_name='domain_spell_list_entries',
+    )
+
+
+def sync_spell_list_entry(entry_model, source, list_slug):
+    entry_model.objects.filter(source=source).delete()
+    entry_model.objects.create(source=source, list_slug=list_slug, level=source.level, spell_id=source.spell_id)
+
+
+@receiver(post_delete, sender=Spell)
+@receiver(post_delete, sender=Feat)
+@receiver(post_delete, sender=Monster)
+@receiver(post_delete, sender=Item)
+@receiver(post_delete, sender=Race)
+def remove_from_text_index(sender, instance, **kwargs):
+    delete_text_index(instance)
+
+
+@receiver(post_save, sender=SpellClassLevel)
+def update_class_spell_list(sender, instance, **kwargs):
+    sync_spell_list_entry(ClassSpellListEntry, instance, instance.character_class.slug)
+
+
+@receiver(post_save, sender=SpellDomainLevel)
+def update_domain_spell_list(sender, instance, **kwargs):
+    sync_spell_list_entry(DomainSpellListEntry, instance, instance.domain.slug)
+
+
+@receiver(post_save, sender=CharacterClass)
+def update_class_spell_list_slug(sender, instance, **kwargs):
+    ClassSpellListEntry.objects.filter(source__character_class=instance).exclude(
+        list_slug=instance.slug).update(list_slug=instance.slug)
+
+
+@receiver(post_save, sender=Domain)
+def update_domain_spell_list_slug(sender, instance, **kwargs):
+    DomainSpellListEntry.objects.filter(source__domain=instance).exclude(
+        list_slug=instance.slug).update(list_slug=instance.slug)
+
+
+# caches, indexes and copies derived from other models, which are versioned themselves
+UNVERSIONED_MODELS = (TextIndexToken, HtmlCacheHash, RenderedTextile, ClassSpellListEntry, DomainSpellListEntry, )
+
+
+def bump_model_version(sender, instance, **kwargs):
+    bump_version(model_tag(sender), *instance_tags(instance, related=True))
+
+
+def bump_m2m_version(sender, instance, action, model, pk_set, **kwargs):
+    if action.startswith('post_'):
+        tags = [model_tag(sender), model_tag(instance.__class__), model_tag(model)]
+        tags.extend(instance_tags(instance))
+        tags.extend(object_tag(model, pk) for pk in pk_set or ())
+        bump_version(*tags)
+
+
+def versioned_models():
+    return [
+        value for value in globals().values()
+        if isinstance(value, type) and issubclass(value, models.Model) and value.__module__ == __name__
+        and not value._meta.abstract and value not in UNVERSIONED_MODELS
+    ]
+
+
+def connect_version_receivers():
+    # receivers are connected per model, a delete listener for any sender
+    # would turn off fast deletes of all models (the unversioned ones included)
+    for model in versioned_models():
+        post_save.connect(bump_model_version, sender=model)
+        post_delete.connect(bump_model_version, sender=model)
+        for field in model._meta.local_many_to_many:
+            m2m_changed.connect(bump_m2m_version, sender=field.rel.through)
+
+
+connect_version_receivers()
@@ -2,19 +2,22 @@
 from django.shortcuts import get_object_or_404, render_to_response
 from django.template.context import RequestContext
 from dnd.menu import menu_item, submenu_item, MenuItem
+from dnd.page_cache import anonymous_page_cache, conditional_list_page
 from dnd.dnd_paginator import DndPaginator
 from dnd.filters import MonsterFilter
 from dnd.models import Rulebook, Monster
 from dnd.views import is_3e_edition, permanent_redirect_view, permanent_redirect_object
 
 
+@conditional_list_page(Monster)
 @menu_item(MenuItem.BESTIARY)
 @submenu_item(MenuItem.Bestiary.MONSTERS)
 def monster_index(request):
     f = MonsterFilter(request.GET, queryset=Monster.objects.select_related(
-        'rulebook', 'rulebook__dnd_edition', 'school').distinct())
+        'rulebook', 'rulebook__dnd_edition', 'school'))
+    f.show_facet_counts()
 
-    paginator = DndPaginator(f.qs, request)
+    paginator = DndPaginator(f.qs, request, keyset=True, approximate_count=True)
 
     form_submitted = 1 if '_filter' in request.GET else 0
 
@@ -28,6 +31,7 @@ def monster_index(request):
                               }, context_instance=RequestContext(request), )
 
 
+@conditional_list_page(Rulebook)
 @menu_item(MenuItem.BESTIARY)
 @submenu_item(MenuItem.Bestiary.MONSTERS)
 def monster_list_by_rulebook(request):
@@ -43,6 +47,7 @@ def monster_list_by_rulebook(request):
                               }, context_instance=RequestContext(request), )
 
 
+@conditional_list_page(Monster)
 @menu_item(MenuItem.BESTIARY)
 @submenu_item(MenuItem.Bestiary.MONSTERS)
 def monsters_in_rulebook(request, rulebook_slug, rulebook_id):
@@ -56,7 +61,7 @@ def monsters_in_rulebook(request, rulebook_slug, rulebook_id):
     monster_list = rulebook.monster_set.select_related(
         'rulebook', 'rulebook__dnd_edition', 'school').all()
 
-    paginator = DndPaginator(monster_list, request)
+    paginator = DndPaginator(monster_list, request, keyset=True)
 
     return render_to_response('dnd/monsters/monsters_in_rulebook.html',
                               {
@@ -68,6 +73,7 @@ def monsters_in_rulebook(request, rulebook_slug, rulebook_id):
                               }, context_instance=RequestContext(request), )
 
 
+@anonymous_page_cache
 @menu_item(MenuItem.BESTIARY)
 @submenu_item(MenuItem.Bestiary.MONSTERS)
 def monster_detail(request, rulebook_slug, rulebook_id, monster_slug, monster_id):
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+Whole page cache and conditional GET of catalogue pages.
+
+While a page is rendered, every model instance loaded from the database is
+recorded (post_init signal). The page entry remembers versions of those
+objects (see dnd.versions) and stays valid as long as none of them changed.
+Saving or deleting an object also bumps objects it points to and its slug,
+so pages listing it (a class page with its variants, a spell page with
+spells of the same name) are refreshed too. List pages depend on whole
+models instead, a new object can appear on any of them.
+
+A valid entry answers If-None-Match / If-Modified-Since with 304 without
+running the view, detail pages of anonymous users are served from it whole.
+"""
+import hashlib
+import threading
+import time
+from functools import wraps
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_init
+from django.dispatch import receiver
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from dnd.versions import get_versions, instance_tags, model_tag, models_tags
+
+PAGE_CACHE_TIMEOUT = getattr(settings, 'PAGE_CACHE_TIMEOUT', 24 * 60 * 60)
+# cookies changing the look of the page
+PAGE_CACHE_COOKIES = ('disable_social', 'top_news', 'force_desktop', )
+# every page shows the unread news counter
+PAGE_CACHE_BASE_TAGS = ('dnd.newsentry', )
+# recorded by pages which must not be stored (see skip_page_cache)
+UNCACHEABLE_TAG = 'dnd:uncacheable'
+
+_recording = threading.local()
+
+
+@receiver(post_init)
+def record_loaded_instance(sender, instance, **kwargs):
+    tags = getattr(_recording, 'tags', None)
+    if tags is not None and instance.pk is not None and instance._meta.app_label == 'dnd':
+        if _recording.whole_models:
+            tags.add(model_tag(sender))
+        else:
+            tags.update(instance_tags(instance))
+
+
+def record_tags(tags):
+    """
+    Adds dependencies not visible as loaded objects (e.g. data kept in the
+    cache) to the page being recorded.
+    """
+    recorded = getattr(_recording, 'tags', None)
+    if recorded is not None:
+        recorded.update(tags)
+
+
+def skip_page_cache():
+    """
+    Keeps the page being recorded out of the cache, e.g. when it shows data
+    known to be outdated already.
+    """
+    record_tags([UNCACHEABLE_TAG])
+
+
+def record_dependencies(whole_models, func, *args, **kwargs):
+    """
+    Calls func and returns its result together with tags of all objects
+    (or their models) loaded meanwhile.
+    """
+    previous = getattr(_recording, 'tags', None), getattr(_recording, 'whole_models', False)
+    _recording.tags, _recording.whole_models = set(PAGE_CACHE_BASE_TAGS), whole_models
+    try:
+        result = func(*args, **kwargs)
+        tags = _recording.tags
+    finally:
+        _recording.tags, _recording.whole_models = previous
+    if previous[0] is not None:
+        previous[0].update(tags)
+    return result, tags
+
+
+def page_cache_key(request):
+    # pages of logged in users show their name and admin links
+    parts = [request.get_full_path(), unicode(request.user.pk or '')]
+    parts.extend(request.COOKIES.get(name, '') for name in PAGE_CACHE_COOKIES)
+    # lists paginated by DndPaginator (also those on detail pages) show as
+    # many items as the visitor chose
+    parts.append(unicode(request.session.get('page_size', '')))
+    return 'dnd:page:%s' % hashlib.md5(u'|'.join(parts).encode('utf-8')).hexdigest()
+
+
+def get_page_entry(key):
+    """
+    Returns cached entry of the page if none of its dependencies changed.
+    """
+    entry = cache.get(key)
+    if entry is None or get_versions(entry['versions'].keys()) != entry['versions']:
+        return None
+    return entry
+
+
+def page_etag(key, entry):
+    # variants of the same URL (page size, cookies, user) have the same
+    # versions, yet must not validate each other
+    return hashlib.md5(repr((key, sorted(entry['versions'].items())))).hexdigest()
+
+
+def is_not_modified(request, key, entry):
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        etags = parse_etags(if_none_match)
+        return '*' in etags or page_etag(key, entry) in etags
+    if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+    return if_modified_since is not None and entry['modified'] <= if_modified_since
+
+
+def set_validators(response, key, entry):
+    response['ETag'] = quote_etag(page_etag(key, entry))
+    response['Last-Modified'] = http_date(entry['modified'])
+    return response
+
+
+def _page_view(view, whole_models, static_tags, store_content):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return view(request, *args, **kwargs)
+        anonymous = not request.user.is_authenticated()
+        # taken before the view, which can change the page size in session
+        key = page_cache_key(request)
+
+        entry = get_page_entry(key)
+        if entry is not None:
+            if is_not_modified(request, key, entry):
+                return set_validators(HttpResponseNotModified(), key, entry)
+            if 'content' in entry:
+                response = HttpResponse(entry['content'], content_type=entry['content_type'])
+                response['X-Page-Cache'] = 'hit'
+                return set_validators(response, key, entry)
+
+        response, tags = record_dependencies(whole_models, view, request, *args, **kwargs)
+        if (response.status_code != 200 or response.cookies or getattr(response, 'streaming', False)
+                or UNCACHEABLE_TAG in tags):
+            return response
+
+        tags.update(static_tags)
+        entry = {
+            'versions': get_versions(tags),
+            'modified': int(time.time()),
+        }
+        if store_content and anonymous:
+            entry['content'] = response.content
+            entry['content_type'] = response['Content-Type']
+            response['X-Page-Cache'] = 'miss'
+        cache.set(key, entry, PAGE_CACHE_TIMEOUT)
+        return set_validators(response, key, entry)
+
+    return wrapper
+
+
+def anonymous_page_cache(view):
+    """
+    Caches successful responses of the detail view for anonymous users until
+    any object shown on the page changes. Answers conditional GETs of all
+    users.
+    """
+    return _page_view(view, False, (), True)
+
+
+def conditional_list_page(*models):
+    """
+    Decorator of list views, answers conditional GETs until the models (and
+    models of all objects shown on the page) change.
+    """
+
+    def decorator(view):
+        return _page_view(view, True, models_tags(*models), False)
+
+    return decorator
@@ -3,6 +3,7 @@ from django.shortcuts import get_object_or_404, render_to_response
 from django.template.context import RequestContext
 from dnd.menu import MenuItem
 from dnd.menu import menu_item, submenu_item
+from dnd.page_cache import anonymous_page_cache, conditional_list_page
 from dnd.dnd_paginator import DndPaginator
 from dnd.filters import (   RaceFilter, RaceTypeFilter )
 
@@ -10,13 +11,14 @@ from dnd.models import (Rulebook, Race, RaceType )
 from dnd.views import is_3e_edition, permanent_redirect_view
 
 
+@conditional_list_page(Race)
 @menu_item(MenuItem.BESTIARY)
 @submenu_item(MenuItem.Bestiary.RACES)
 def race_index(request):
     f = RaceFilter(request.GET, queryset=Race.objects.select_related(
         'rulebook', 'rulebook__dnd_edition', 'school').distinct())
 
-    paginator = DndPaginator(f.qs, request)
+    paginator = DndPaginator(f.qs, request, keyset=True, approximate_count=True)
 
     form_submitted = 1 if '_filter' in request.GET else 0
 
@@ -30,6 +32,7 @@ def race_index(request):
                               }, context_instance=RequestContext(request), )
 
 
+@conditional_list_page(Rulebook)
 @menu_item(MenuItem.BESTIARY)
 @submenu_item(MenuItem.Bestiary.RACES)
 def race_list_by_rulebook(request):
@@ -45,6 +48,7 @@ def race_list_by_rulebook(request):
                               }, context_instance=RequestContext(request), )
 
 
+@conditional_list_page(Race)
 @menu_item(MenuItem.BESTIARY)
 @submenu_item(MenuItem.Bestiary.RACES)
 def races_in_rulebook(request, rulebook_slug, rulebook_id):
@@ -58,7 +62,7 @@ def races_in_rulebook(request, rulebook_slug, rulebook_id):
     race_list = rulebook.race_set.select_related(
         'rulebook', 'rulebook__dnd_edition', 'school').all()
 
-    paginator = DndPaginator(race_list, request)
+    paginator = DndPaginator(race_list, request, keyset=True)
 
     return render_to_response('dnd/races/races_in_rulebook.html',
                               {
@@ -70,6 +74,7 @@ def races_in_rulebook(request, rulebook_slug, rulebook_id):
                               }, context_instance=RequestContext(request), )
 
 
+@anonymous_page_cache
 @menu_item(MenuItem.BESTIARY)
 @submenu_item(MenuItem.Bestiary.RACES)
 def race_detail(request, rulebook_slug, rulebook_id, race_slug, race_id):
@@ -111,6 +116,7 @@ def race_detail(request, rulebook_slug, rulebook_id, race_slug, race_id):
                               }, context_instance=RequestContext(request), )
 
 
+@conditional_list_page(RaceType)
 @menu_item(MenuItem.BESTIARY)
 @submenu_item(MenuItem.Bestiary.RACE_TYPES)
 def race_type_index(request):
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+Fast rendering of rows of the big catalogue tables.
+
+The functions produce exactly what the row templates (dnd/spells/
+spell_table_row.html, dnd/feats/feat_table_row.html and dnd/monsters/
+monster_table_row.html) rendered in a for loop would, without resolving
+every variable through the template engine. Repeated fragments (yes/no
+icons, links of rulebooks and editions) are built once per call. Keep them
+in sync with the row templates, dnd.tests and manage.py check_row_renderers
+compare both.
+"""
+from django.template.defaultfilters import truncatewords
+from django.utils.encoding import force_text
+from django.utils.formats import localize
+from django.utils.safestring import SafeData, EscapeData, mark_safe
+from django.utils.timezone import template_localtime
+from django.utils.html import escape
+
+from dnd.templatetags.custom_filters import _boolean_as_img
+
+_boolean_imgs = {}
+
+
+def render_value(value, context):
+    """
+    Same as {{ value }} in the template.
+    """
+    value = template_localtime(value, use_tz=context.use_tz)
+    value = localize(value, use_l10n=context.use_l10n)
+    value = force_text(value)
+    if (context.autoescape and not isinstance(value, SafeData)) or isinstance(value, EscapeData):
+        return escape(value)
+    return value
+
+
+def boolean_img(value):
+    """
+    Same as {{ value|boolean_as_img }}, remembered per value.
+    """
+    try:
+        return _boolean_imgs[value]
+    except KeyError:
+        img = _boolean_imgs[value] = _boolean_as_img(value)
+        return img
+    except TypeError:
+        return _boolean_as_img(value)
+
+
+def link(obj, context, memo):
+    """
+    Same as <a href="{{ obj.get_absolute_url }}">{{ obj.name }}</a>,
+    remembered per object.
+    """
+    key = (obj.__class__, obj.pk)
+    html = memo.get(key)
+    if html is None:
+        html = memo[key] = u'<a href="%s">%s</a>' % (
+            render_value(obj.get_absolute_url(), context), render_value(obj.name, context))
+    return html
+
+
+def spell_rows(spells, context):
+    is_admin = context.get('is_admin')
+    memo = {}
+    parts = []
+    for spell in spells:
+        parts.append(u'\n<tr>\n    ')
+        if is_admin:
+            parts.append(u'\n        <td ')
+            if spell.verified:
+                parts.append(u'title="%s by %s"' % (
+                    render_value(spell.verified_time, context), render_value(spell.verified_author, context)))
+            parts.append(u'>%s</td>\n    ' % boolean_img(spell.verified))
+        parts.append(u'\n    <td>%s</td>\n    <td>%s</td>\n    <td>%s</td>\n    <td>%s</td>\n    <td>%s</td>\n</tr>\n' % (
+            u'<a href="%s">%s</a>' % (
+                render_value(spell.get_absolute_url(), context), render_value(spell.name, context)),
+            link(spell.school, context, memo),
+            u'&nbsp;'.join([
+                boolean_img(spell.verbal_component), boolean_img(spell.somatic_component),
+                boolean_img(spell.material_component), boolean_img(spell.arcane_focus_component),
+                boolean_img(spell.divine_focus_component), boolean_img(spell.xp_component)]),
+            link(spell.rulebook, context, memo),
+            link(spell.rulebook.dnd_edition, context, memo),
+        ))
+    return mark_safe(u''.join(parts))
+
+
+def feat_rows(feats, context):
+    memo = {}
+    parts = []
+    for feat in feats:
+        parts.append(
+            u'\n    <tr>\n        <td><a href="%s">%s</a></td>\n        <td title="%s">%s</td>\n'
+            u'        <td>%s</td>\n    </tr>\n' % (
+                render_value(feat.get_absolute_url(), context), render_value(feat.name, context),
+                render_value(feat.description, context),
+                render_value(truncatewords(feat.description, 10), context),
+                link(feat.rulebook, context, memo),
+            ))
+    return mark_safe(u''.join(parts))
+
+
+def monster_rows(monsters, context):
+    memo = {}
+    parts = []
+    for monster in monsters:
+        parts.append(
+            u'\n        <tr>\n            <td><a href="%s">%s</a></td>\n            <td>%s</td>\n'
+            u'            <td>%s</td>\n        </tr>\n    ' % (
+                render_value(monster.get_absolute_url(), context), render_value(monster.name, context),
+                link(monster.rulebook, context, memo),
+                link(monster.rulebook.dnd_edition, context, memo),
+            ))
+    return mark_safe(u''.join(parts))
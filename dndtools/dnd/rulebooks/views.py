@@ -4,11 +4,13 @@ from django.shortcuts import get_object_or_404, render_to_response
 from django.template.context import RequestContext
 from dnd.filters import RulebookFilter
 from dnd.menu import menu_item, submenu_item, MenuItem
+from dnd.page_cache import conditional_list_page
 from dnd.dnd_paginator import DndPaginator
 from dnd.models import Rulebook, DndEdition
 from dnd.views import is_3e_edition, permanent_redirect_object
 
 
+@conditional_list_page(Rulebook)
 @menu_item(MenuItem.RULEBOOKS)
 @submenu_item(MenuItem.Rulebooks.RULEBOOKS)
 def rulebook_list(request):
@@ -28,6 +30,7 @@ def rulebook_list(request):
                                   'form_submitted': form_submitted,
                               }, context_instance=RequestContext(request), )
 
+@conditional_list_page(DndEdition)
 @menu_item(MenuItem.RULEBOOKS)
 @submenu_item(MenuItem.Rulebooks.EDITIONS)
 def edition_list(request):
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+Prefix index of names and slugs for autocomplete.
+
+Each model has its own index kept in memory of the process, built on first
+use and rebuilt after the model changes (see dnd.versions). Keys are kept in
+sorted arrays and searched by bisection; for a static key set this is what a
+prefix trie gives, at a fraction of the memory Python dictionaries per node
+would take.
+"""
+import threading
+from array import array
+from bisect import bisect_left
+
+from dnd.models import Spell, Feat, Monster, Item, Race, CharacterClass, Skill, Deity, Language, Rule
+from dnd.versions import model_tag, get_versions
+
+AUTOCOMPLETE_MODELS = (Spell, Feat, Monster, Item, Race, CharacterClass, Skill, Deity, Language, Rule, )
+
+# how many keys are examined at most in one model, bounds the cost of very short prefixes
+MAX_SCAN = 500
+
+
+def normalize(text):
+    return u' '.join(text.lower().split())
+
+
+class PrefixIndex(object):
+    """
+    Names and slugs of one model. Prefixes of the whole name or slug are
+    preferred over prefixes of any later word of the name ("fire" finds
+    "Fireball" before "Delayed Blast Fireball").
+    """
+
+    def __init__(self, model, version):
+        self.model = model
+        self.version = version
+
+        self.ids = array('I')
+        self.names = []
+        self.slugs = []
+        starts, words = [], []
+        for pk, name, slug in model._default_manager.values_list('pk', 'name', 'slug').iterator():
+            entry = len(self.ids)
+            self.ids.append(pk)
+            self.names.append(name)
+            self.slugs.append(slug)
+
+            key = normalize(name)
+            starts.append((key, entry))
+            if slug and slug != key:
+                starts.append((slug.lower(), entry))
+            position = key.find(u' ')
+            while position != -1:
+                words.append((key[position + 1:], entry))
+                position = key.find(u' ', position + 1)
+
+        self.start_keys, self.start_entries = self._pack(starts)
+        self.word_keys, self.word_entries = self._pack(words)
+
+    @staticmethod
+    def _pack(pairs):
+        pairs.sort()
+        return [key for key, entry in pairs], array('I', [entry for key, entry in pairs])
+
+    @staticmethod
+    def _scan(keys, entries, prefix):
+        start = bisect_left(keys, prefix)
+        for i in xrange(start, min(start + MAX_SCAN, len(keys))):
+            if not keys[i].startswith(prefix):
+                break
+            yield entries[i]
+
+    def lookup(self, prefix, limit):
+        """
+        Returns list of (id, name, slug) of at most limit entries.
+        """
+        prefix = normalize(prefix)
+        found = []
+        seen = set()
+        for keys, entries in ((self.start_keys, self.start_entries), (self.word_keys, self.word_entries)):
+            for entry in self._scan(keys, entries, prefix):
+                if entry not in seen:
+                    seen.add(entry)
+                    found.append((self.ids[entry], self.names[entry], self.slugs[entry]))
+                    if len(found) >= limit:
+                        return found
+        return found
+
+
+_indexes = {}
+_lock = threading.Lock()
+
+
+def get_indexes(models):
+    """
+    Current prefix indexes of given models, in the same order.
+    """
+    versions = get_versions([model_tag(model) for model in models])
+    result = []
+    for model in models:
+        tag = model_tag(model)
+        index = _indexes.get(tag)
+        if index is None or index.version != versions[tag]:
+            with _lock:
+                index = _indexes.get(tag)
+                if index is None or index.version != versions[tag]:
+                    index = _indexes[tag] = PrefixIndex(model, versions[tag])
+        result.append(index)
+    return result
+
+
+def autocomplete(prefix, models=AUTOCOMPLETE_MODELS, limit=10):
+    """
+    Returns list of (model, id, name, slug), at most limit of them per model.
+    """
+    if not prefix.strip():
+        return []
+    result = []
+    for index in get_indexes(models):
+        for pk, name, slug in index.lookup(prefix, limit):
+            result.append((index.model, pk, name, slug))
+    return result
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+One in-memory BM25 index over every model with a detail page.
+
+The index is built lazily in each process from names and raw text fields.
+When version of any indexed model changes (see dnd.versions), it is rebuilt
+in a background thread and searches are answered by the previous index
+meanwhile, so no request waits for a rebuild (except the very first one).
+Searching is then a few dictionary lookups, no database query is needed to
+rank the results.
+"""
+import math
+import threading
+from array import array
+from bisect import bisect_left
+
+from django.db import connection
+from django.db.models import TextField, get_app, get_models
+from dnd.text_index import words
+from dnd.versions import models_tags, versions_key
+
+# usual BM25 parameters
+K1 = 1.2
+B = 0.75
+# a word in the name counts as this many words in the text
+NAME_WEIGHT = 3
+# the last (possibly unfinished) word expands to at most this many tokens
+MAX_PREFIX_EXPANSION = 100
+
+
+# models with get_absolute_url, but without a detail page to link to
+NO_DETAIL_PAGE = ('monstertype', 'monstersubtype', )
+
+
+def searchable_models():
+    return [
+        model for model in get_models(get_app('dnd'))
+        if hasattr(model, 'get_absolute_url') and 'name' in model._meta.get_all_field_names()
+        and model._meta.object_name.lower() not in NO_DETAIL_PAGE
+    ]
+
+
+def _text_fields(model):
+    return [field.name for field in model._meta.fields
+            if isinstance(field, TextField) and not field.name.endswith('_html')]
+
+
+class SearchIndex(object):
+    def __init__(self, models, version):
+        self.models = models
+        self.version = version
+
+        # documents are numbered, these arrays are indexed by the number
+        self.doc_models = array('B')
+        self.doc_ids = array('I')
+        self.doc_lengths = array('I')
+        self.doc_names = []
+
+        frequencies = {}
+        for model_index, model in enumerate(models):
+            text_fields = _text_fields(model)
+            for row in model._default_manager.values_list('pk', 'name', *text_fields).iterator():
+                doc = len(self.doc_ids)
+                doc_words = words(row[1]) * NAME_WEIGHT
+                for text in row[2:]:
+                    doc_words.extend(words(text))
+
+                self.doc_models.append(model_index)
+                self.doc_ids.append(row[0])
+                self.doc_lengths.append(len(doc_words))
+                self.doc_names.append(row[1])
+
+                counts = {}
+                for word in doc_words:
+                    counts[word] = counts.get(word, 0) + 1
+                for word, count in counts.iteritems():
+                    frequencies.setdefault(word, []).append((doc, count))
+
+        # token -> (documents, term frequencies), both in order of documents
+        self.postings = {}
+        for word, pairs in frequencies.iteritems():
+            self.postings[word] = (array('I', [pair[0] for pair in pairs]),
+                                   array('I', [pair[1] for pair in pairs]))
+        self.tokens = sorted(self.postings)
+
+        self.doc_count = len(self.doc_ids)
+        self.average_length = float(sum(self.doc_lengths)) / self.doc_count if self.doc_count else 1.0
+
+    def _expand(self, token, prefix):
+        if not prefix:
+            return [token] if token in self.postings else []
+        start = bisect_left(self.tokens, token)
+        expanded = []
+        for candidate in self.tokens[start:start + MAX_PREFIX_EXPANSION]:
+            if not candidate.startswith(token):
+                break
+            expanded.append(candidate)
+        return expanded
+
+    def _term_scores(self, tokens):
+        """
+        Document -> BM25 score of one query term. Term which expanded to more
+        tokens scores by the best of them.
+        """
+        scores = {}
+        for token in tokens:
+            docs, tfs = self.postings[token]
+            idf = math.log(1.0 + (self.doc_count - len(docs) + 0.5) / (len(docs) + 0.5))
+            for doc, tf in zip(docs, tfs):
+                norm = K1 * (1.0 - B + B * self.doc_lengths[doc] / self.average_length)
+                score = idf * tf * (K1 + 1.0) / (tf + norm)
+                if score > scores.get(doc, 0.0):
+                    scores[doc] = score
+        return scores
+
+    def search(self, query, limit_per_model=10):
+        """
+        Documents containing all words of the query, the last one may be
+        unfinished. Returns list of (model, [(id, name, score), ...]), groups
+        ordered by their best score.
+        """
+        query_words = []
+        for word in words(query):
+            if word not in query_words:
+                query_words.append(word)
+        if not query_words:
+            return []
+
+        totals = None
+        # rarest terms first, so the candidate set shrinks fast
+        terms = [self._expand(word, i == len(query_words) - 1) for i, word in enumerate(query_words)]
+        terms.sort(key=lambda tokens: sum(len(self.postings[token][0]) for token in tokens))
+        for tokens in terms:
+            if not tokens:
+                return []
+            scores = self._term_scores(tokens)
+            if totals is None:
+                totals = scores
+            else:
+                totals = dict((doc, total + scores[doc]) for doc, total in totals.iteritems() if doc in scores)
+            if not totals:
+                return []
+
+        grouped = {}
+        for doc, score in totals.iteritems():
+            grouped.setdefault(self.doc_models[doc], []).append((score, doc))
+
+        result = []
+        for model_index, scored in grouped.iteritems():
+            scored.sort(key=lambda item: (-item[0], self.doc_names[item[1]]))
+            result.append((self.models[model_index], [
+                (self.doc_ids[doc], self.doc_names[doc], score) for score, doc in scored[:limit_per_model]
+            ]))
+        result.sort(key=lambda group: -group[1][0][2])
+        return result
+
+
+_index = None
+# version of the index being built in background
+_building = None
+_lock = threading.Lock()
+
+
+def _build_in_background(models, version):
+    global _index, _building
+
+    try:
+        index = SearchIndex(models, version)
+        with _lock:
+            _index = index
+    finally:
+        _building = None
+        # the thread has its own connection
+        connection.close()
+
+
+def get_index():
+    """
+    Current index. If indexed data changed since the last build, the
+    previous index is returned and a new one is built in background.
+    """
+    global _index, _building
+
+    models = searchable_models()
+    version = versions_key(models_tags(*models))
+    index = _index
+    if index is None:
+        with _lock:
+            if _index is None:
+                _index = SearchIndex(models, version)
+            return _index
+
+    if index.version != version and _building is None:
+        with _lock:
+            if _building is None and _index.version != version:
+                _building = version
+                thread = threading.Thread(target=_build_in_background, args=(models, version))
+                thread.daemon = True
+                thread.start()
+    return index
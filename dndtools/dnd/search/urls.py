@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+
+from django.conf.urls import patterns, url
+
+
+urlpatterns = patterns(
+    'dnd.search.views',
+
+    # search results
+    url(
+        r'^$',
+        'search',
+        name='search',
+    ),
+
+    # search results > json
+    url(
+        r'^json/$',
+        'search_json',
+        name='search_json',
+    ),
+
+    # autocomplete > json
+    url(
+        r'^autocomplete/$',
+        'autocomplete_json',
+        name='autocomplete_json',
+    ),
+
+)
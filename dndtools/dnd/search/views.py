@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+import json
+from django.http import HttpResponse
+from django.shortcuts import render_to_response
+from django.template import RequestContext
+from django.utils.text import capfirst
+from dnd.search.autocomplete import AUTOCOMPLETE_MODELS, autocomplete
+from dnd.search.index import get_index
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+# relations read by get_absolute_url of searchable models
+URL_RELATIONS = ('rulebook', 'dnd_edition', )
+
+
+def _limit(request):
+    try:
+        return max(1, min(MAX_LIMIT, int(request.GET.get('limit', DEFAULT_LIMIT))))
+    except ValueError:
+        return DEFAULT_LIMIT
+
+
+def search_groups(query, limit=DEFAULT_LIMIT):
+    """
+    Ranked results grouped by type, one query per type is needed for urls.
+    """
+    groups = []
+    for model, hits in get_index().search(query, limit):
+        field_names = model._meta.get_all_field_names()
+        relations = [name for name in URL_RELATIONS if name in field_names]
+        qs = model._default_manager.select_related(*relations) if relations else model._default_manager.all()
+        objects = qs.in_bulk([pk for pk, name, score in hits])
+        groups.append({
+            'type': model._meta.object_name.lower(),
+            'label': capfirst(unicode(model._meta.verbose_name_plural)),
+            'results': [
+                {
+                    'name': name,
+                    'url': objects[pk].get_absolute_url(),
+                    'score': round(score, 3),
+                }
+                # object could be deleted in the meantime
+                for pk, name, score in hits if pk in objects
+            ],
+        })
+    return groups
+
+
+def search(request):
+    query = request.GET.get('q', '').strip()
+    groups = search_groups(query, _limit(request)) if query else []
+
+    return render_to_response('dnd/search/search.html',
+                              {
+                                  'request': request,
+                                  'query': query,
+                                  'groups': groups,
+                              }, context_instance=RequestContext(request), )
+
+
+def search_json(request):
+    query = request.GET.get('q', '').strip()
+    groups = search_groups(query, _limit(request)) if query else []
+
+    return HttpResponse(json.dumps({'query': query, 'groups': groups}),
+                        content_type='application/json')
+
+
+def autocomplete_json(request):
+    """
+    Names starting with q (or with a word starting with q). Models can be
+    restricted by one or more type parameters, e.g. ?q=fire&type=spell.
+    """
+    query = request.GET.get('q', '')
+    types = request.GET.getlist('type')
+    models = [model for model in AUTOCOMPLETE_MODELS
+              if not types or model._meta.object_name.lower() in types]
+
+    results = [
+        {
+            'type': model._meta.object_name.lower(),
+            'id': pk,
+            'name': name,
+            'slug': slug,
+        }
+        for model, pk, name, slug in autocomplete(query, models, _limit(request))
+    ]
+
+    return HttpResponse(json.dumps({'query': query, 'results': results}),
+                        content_type='application/json')
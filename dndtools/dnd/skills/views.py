@@ -2,12 +2,14 @@
 from django.shortcuts import get_object_or_404, render_to_response
 from django.template.context import RequestContext
 from dnd.menu import MenuItem, menu_item, submenu_item
+from dnd.page_cache import anonymous_page_cache, conditional_list_page
 from dnd.views import permanent_redirect_object, permanent_redirect_view, is_3e_edition
 from dnd.dnd_paginator import DndPaginator
 from dnd.filters import SkillFilter
 
 from dnd.models import Rulebook, Skill, SkillVariant
 
+@conditional_list_page(Skill)
 @menu_item(MenuItem.CHARACTER_OPTIONS)
 @submenu_item(MenuItem.CharacterOptions.SKILLS)
 def skill_list(request):
@@ -27,6 +29,7 @@ def skill_list(request):
                               }, context_instance=RequestContext(request), )
 
 
+@anonymous_page_cache
 @menu_item(MenuItem.CHARACTER_OPTIONS)
 @submenu_item(MenuItem.CharacterOptions.SKILLS)
 def skill_detail(request, skill_slug, rulebook_slug=None,
@@ -101,6 +104,7 @@ def skill_detail(request, skill_slug, rulebook_slug=None,
                               }, context_instance=RequestContext(request), )
 
 
+@conditional_list_page(SkillVariant)
 @menu_item(MenuItem.CHARACTER_OPTIONS)
 @submenu_item(MenuItem.CharacterOptions.SKILLS)
 def skills_in_rulebook(request, rulebook_slug, rulebook_id):
@@ -5,24 +5,28 @@ from django.shortcuts import get_object_or_404, render_to_response
 from django.template.context import RequestContext
 from dnd.menu import MenuItem
 from dnd.menu import menu_item, submenu_item
+from dnd.page_cache import anonymous_page_cache, conditional_list_page
 from dnd.dnd_paginator import DndPaginator
 from dnd.filters import SpellFilter, SpellDomainFilter, SpellDescriptorFilter, SpellFilterAdmin
 from dnd.models import (Rulebook, SpellSchool, SpellDescriptor,
-                        SpellSubSchool, Spell, Domain, Rule, DomainVariant)
+                        SpellSubSchool, Spell, Domain, Rule, DomainVariant,
+                        SpellClassLevel, SpellDomainLevel)
 from dnd.views import is_3e_edition, permanent_redirect_view, permanent_redirect_object, is_admin
 
 
+@conditional_list_page(Spell, SpellClassLevel, SpellDomainLevel)
 @menu_item(MenuItem.MAGIC)
 @submenu_item(MenuItem.Magic.SPELLS)
 def spell_index(request):
     if is_admin(request):
         f = SpellFilterAdmin(request.GET, queryset=Spell.objects.select_related(
-            'rulebook', 'rulebook__dnd_edition', 'school', 'verified_author').distinct())
+            'rulebook', 'rulebook__dnd_edition', 'school', 'verified_author'))
     else:
         f = SpellFilter(request.GET, queryset=Spell.objects.select_related(
-            'rulebook', 'rulebook__dnd_edition', 'school').distinct())
+            'rulebook', 'rulebook__dnd_edition', 'school'))
+    f.show_facet_counts()
 
-    paginator = DndPaginator(f.qs, request)
+    paginator = DndPaginator(f.qs, request, keyset=True, approximate_count=True)
 
     form_submitted = 1 if '_filter' in request.GET else 0
 
@@ -36,6 +40,7 @@ def spell_index(request):
                               }, context_instance=RequestContext(request), )
 
 
+@conditional_list_page(SpellDescriptor)
 @menu_item(MenuItem.MAGIC)
 @submenu_item(MenuItem.Magic.DESCRIPTORS)
 def spell_descriptor_list(request):
@@ -56,6 +61,7 @@ def spell_descriptor_list(request):
                               }, context_instance=RequestContext(request), )
 
 
+@conditional_list_page(SpellSchool)
 @menu_item(MenuItem.MAGIC)
 @submenu_item(MenuItem.Magic.SCHOOLS)
 def spell_school_list(request):
@@ -68,6 +74,7 @@ def spell_school_list(request):
                                   'request': request, }, context_instance=RequestContext(request), )
 
 
+@conditional_list_page(Spell)
 @menu_item(MenuItem.MAGIC)
 @submenu_item(MenuItem.Magic.SPELLS)
 def spells_in_rulebook(request, rulebook_slug, rulebook_id):
@@ -81,7 +88,7 @@ def spells_in_rulebook(request, rulebook_slug, rulebook_id):
     spell_list = rulebook.spell_set.select_related(
         'rulebook', 'rulebook__dnd_edition', 'school').all()
 
-    paginator = DndPaginator(spell_list, request)
+    paginator = DndPaginator(spell_list, request, keyset=True)
 
     return render_to_response('dnd/spells/spells_in_rulebook.html',
                               {
@@ -93,6 +100,7 @@ def spells_in_rulebook(request, rulebook_slug, rulebook_id):
                               }, context_instance=RequestContext(request), )
 
 
+@anonymous_page_cache
 @menu_item(MenuItem.MAGIC)
 @submenu_item(MenuItem.Magic.SPELLS)
 def spell_detail(request, rulebook_slug, rulebook_id, spell_slug, spell_id):
@@ -153,6 +161,7 @@ def spell_verify(request, spell_id):
     return permanent_redirect_object(request, spell)
 
 
+@conditional_list_page(Spell)
 @menu_item(MenuItem.MAGIC)
 @submenu_item(MenuItem.Magic.DESCRIPTORS)
 def spell_descriptor_detail(request, spell_descriptor_slug):
@@ -162,7 +171,7 @@ def spell_descriptor_detail(request, spell_descriptor_slug):
     spell_list = spell_descriptor.spell_set.select_related(
         'rulebook', 'rulebook__dnd_edition', 'school').all()
 
-    paginator = DndPaginator(spell_list, request)
+    paginator = DndPaginator(spell_list, request, keyset=True)
 
     return render_to_response('dnd/spells/spell_descriptor_detail.html',
                               {
@@ -175,6 +184,7 @@ def spell_descriptor_detail(request, spell_descriptor_slug):
                               context_instance=RequestContext(request), )
 
 
+@conditional_list_page(Spell)
 @menu_item(MenuItem.MAGIC)
 @submenu_item(MenuItem.Magic.SCHOOLS)
 def spell_school_detail(request, spell_school_slug):
@@ -183,7 +193,7 @@ def spell_school_detail(request, spell_school_slug):
     spell_list = spell_school.spell_set.select_related(
         'rulebook', 'rulebook__dnd_edition', 'school').all()
 
-    paginator = DndPaginator(spell_list, request)
+    paginator = DndPaginator(spell_list, request, keyset=True)
 
     return render_to_response('dnd/spells/spell_school_detail.html',
                               {
@@ -196,6 +206,7 @@ def spell_school_detail(request, spell_school_slug):
                               context_instance=RequestContext(request), )
 
 
+@conditional_list_page(Spell)
 @menu_item(MenuItem.MAGIC)
 @submenu_item(MenuItem.Magic.SCHOOLS)
 def spell_sub_school_detail(request, spell_sub_school_slug):
@@ -205,7 +216,7 @@ def spell_sub_school_detail(request, spell_sub_school_slug):
     spell_list = spell_sub_school.spell_set.select_related(
         'rulebook', 'rulebook__dnd_edition', 'school').all()
 
-    paginator = DndPaginator(spell_list, request)
+    paginator = DndPaginator(spell_list, request, keyset=True)
 
     return render_to_response('dnd/spells/spell_sub_school_detail.html',
                               {
@@ -218,6 +229,7 @@ def spell_sub_school_detail(request, spell_sub_school_slug):
                               context_instance=RequestContext(request), )
 
 
+@conditional_list_page(Domain)
 @menu_item(MenuItem.MAGIC)
 @submenu_item(MenuItem.Magic.DOMAINS)
 def spell_domain_list(request):
@@ -237,6 +249,7 @@ def spell_domain_list(request):
                               }, context_instance=RequestContext(request), )
 
 
+@anonymous_page_cache
 @menu_item(MenuItem.MAGIC)
 @submenu_item(MenuItem.Magic.DOMAINS)
 def spell_domain_detail(request, spell_domain_slug, rulebook_slug=None, rulebook_id=None):
@@ -292,10 +305,11 @@ def spell_domain_detail(request, spell_domain_slug, rulebook_slug=None, rulebook
     else:
         display_3e_warning = False
 
-    spell_list = spell_domain.spell_set.select_related(
-        'rulebook', 'rulebook__dnd_edition', 'school').all()
+    spell_list = Spell.objects.filter(
+        domain_spell_list_entries__list_slug=spell_domain.slug).select_related(
+        'rulebook', 'rulebook__dnd_edition', 'school')
 
-    paginator = DndPaginator(spell_list, request)
+    paginator = DndPaginator(spell_list, request, keyset=True)
 
     return render_to_response('dnd/spells/spell_domain_detail.html',
                               {
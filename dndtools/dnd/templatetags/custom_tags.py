@@ -1,9 +1,10 @@
 # -*- coding: utf-8 -*-
-import os
 import urlparse
 from django import template
 from django.contrib.sites.models import Site
 from django.utils.safestring import mark_safe
+from dnd.assets import asset_version
+from dnd import row_renderers
 import dndproject.settings
 
 
@@ -42,37 +43,56 @@ def _absolute_url(url):
     return 'http://%s%s' % (domain, url)
 
 
-@register.simple_tag
-def static(filename, flags=''):
-    """
-        see http://insist.sk/blog/django/149.html
-    """
+def _asset_url(root, base_url, filename, flags):
     flags = set(f.strip() for f in flags.split(','))
-    url = urlparse.urljoin(dndproject.settings.STATIC_URL, filename)
+    url = urlparse.urljoin(base_url, filename)
     if 'absolute' in flags:
         url = _absolute_url(url)
     if (filename.endswith('.css') or filename.endswith('.js')) and 'no-timestamp' not in flags or \
        'timestamp' in flags:
-        fullname = os.path.join(dndproject.settings.STATICFILES_DIRS[0], filename)
-        if os.path.exists(fullname):
-            url += '?%d' % os.path.getmtime(fullname)
+        version = asset_version(root, filename)
+        if version:
+            url += '?' + version
     return url
 
 
+@register.simple_tag
+def static(filename, flags=''):
+    """
+        see http://insist.sk/blog/django/149.html
+    """
+    return _asset_url('static', dndproject.settings.STATIC_URL, filename, flags)
+
+
 @register.simple_tag
 def media(filename, flags=''):
     """
         see http://insist.sk/blog/django/149.html
     """
-    flags = set(f.strip() for f in flags.split(','))
-    url = urlparse.urljoin(dndproject.settings.MEDIA_URL, filename)
-    if 'absolute' in flags:
-        url = _absolute_url(url)
-    if (filename.endswith('.css') or filename.endswith('.js')) and 'no-timestamp' not in flags or \
-       'timestamp' in flags:
-        fullname = os.path.join(dndproject.settings.MEDIA_ROOT, filename)
-        if os.path.exists(fullname):
-            url += '?%d' % os.path.getmtime(fullname)
-    return url
+    return _asset_url('media', dndproject.settings.MEDIA_URL, filename, flags)
+
+
+@register.simple_tag(takes_context=True)
+def spell_rows(context, spell_list):
+    """
+        rows of dnd/spells/spell_table.html, see dnd.row_renderers
+    """
+    return row_renderers.spell_rows(spell_list, context)
+
+
+@register.simple_tag(takes_context=True)
+def feat_rows(context, feat_list):
+    """
+        rows of dnd/feats/feat_table.html, see dnd.row_renderers
+    """
+    return row_renderers.feat_rows(feat_list, context)
+
+
+@register.simple_tag(takes_context=True)
+def monster_rows(context, monster_list):
+    """
+        rows of dnd/monsters/monster_table.html, see dnd.row_renderers
+    """
+    return row_renderers.monster_rows(monster_list, context)
 
 register.tag('set', set_var)
\ No newline at end of file
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+from datetime import datetime
+
+from django.contrib.auth.models import User
+from django.template import Context, Template
+from django.http import QueryDict
+from django.test import TestCase
+from django.test.client import RequestFactory
+
+from dnd import row_renderers
+from dnd.dnd_paginator import DndPaginator
+from dnd.filters import FeatFilter
+from dnd.text_index import matching_ids
+from dnd.models import (DndEdition, Rulebook, SpellSchool, Spell, Feat, MonsterType, Monster, CharacterClass,
+                        SpellClassLevel, FeatCategory, Skill, FeatRequiresSkill, TextIndexToken)
+
+# names with characters the templates escape
+TRICKY_NAME = u'<b>Acid & "Fire"</b> \'Bolt\' ü'
+
+
+class RowRenderersTest(TestCase):
+    """
+    The fast row renderers have to give exactly what the row templates give.
+    """
+
+    def setUp(self):
+        edition = DndEdition.objects.create(name=TRICKY_NAME, system='DnD 3.5', slug='edition')
+        rulebook = Rulebook.objects.create(
+            dnd_edition=edition, name=u'Book <i>of</i> & "Tricks"', abbr='BoT', slug='book')
+        school = SpellSchool.objects.create(name=u'School & <Co>', slug='school')
+        author = User.objects.create(username=u'<author>&')
+
+        Spell.objects.create(
+            rulebook=rulebook, name=TRICKY_NAME, slug='tricky', school=school, verbal_component=True,
+            material_component=True, verified=True, verified_author=author,
+            verified_time=datetime(2013, 5, 6, 7, 8, 9), description=u'*Acid* <burns> & "melts"')
+        Spell.objects.create(
+            rulebook=rulebook, name=u'Plain Spell', slug='plain', school=school, somatic_component=True,
+            xp_component=True, description=u'Plain.')
+
+        Feat.objects.create(
+            rulebook=rulebook, name=TRICKY_NAME, slug='tricky',
+            description=u'A "description" with <tags> & more than ten words, so that it is truncated.',
+            benefit=u'Benefit.')
+        Feat.objects.create(rulebook=rulebook, name=u'Plain Feat', slug='plain', description=u'', benefit=u'')
+
+        monster_type = MonsterType.objects.create(name=u'Type', slug='type')
+        for name, slug in ((TRICKY_NAME, 'tricky'), (u'Plain Monster', 'plain')):
+            Monster.objects.create(
+                rulebook=rulebook, name=name, slug=slug, type=monster_type, hit_dice='1d8', initiative=0,
+                armor_class='10', base_attack=0, grapple=0, attack='-', full_attack='-', space=5, reach=5,
+                fort_save=0, reflex_save=0, will_save=0, str=10, dex=10, con=10, int=10, wis=10, cha=10,
+                challenge_rating=1, description=u'', combat=u'')
+
+    def assertRendersLikeTemplate(self, renderer, row_template, list_name, row_name, objects):
+        template = Template('{%% for %s in %s %%}{%% include "%s" %%}{%% endfor %%}' % (
+            row_name, list_name, row_template))
+        for is_admin in (False, True):
+            expected = template.render(Context({list_name: objects, 'is_admin': is_admin}))
+            rendered = renderer(objects, Context({list_name: objects, 'is_admin': is_admin}))
+            self.assertEqual(rendered, expected)
+
+    def test_spell_rows(self):
+        spells = list(Spell.objects.select_related(
+            'rulebook', 'rulebook__dnd_edition', 'school', 'verified_author').order_by('pk'))
+        self.assertRendersLikeTemplate(
+            row_renderers.spell_rows, 'dnd/spells/spell_table_row.html', 'spell_list', 'spell', spells)
+
+    def test_feat_rows(self):
+        feats = list(Feat.objects.select_related('rulebook', 'rulebook__dnd_edition').order_by('pk'))
+        self.assertRendersLikeTemplate(
+            row_renderers.feat_rows, 'dnd/feats/feat_table_row.html', 'feat_list', 'feat', feats)
+
+    def test_monster_rows(self):
+        monsters = list(Monster.objects.select_related('rulebook', 'rulebook__dnd_edition').order_by('pk'))
+        self.assertRendersLikeTemplate(
+            row_renderers.monster_rows, 'dnd/monsters/monster_table_row.html', 'monster_list', 'monster',
+            monsters)
+
+    def test_escaping(self):
+        spells = list(Spell.objects.select_related(
+            'rulebook', 'rulebook__dnd_edition', 'school', 'verified_author').order_by('pk'))
+        rendered = row_renderers.spell_rows(spells, Context({'is_admin': True}))
+        self.assertIn(u'&lt;b&gt;Acid &amp; &quot;Fire&quot;&lt;/b&gt; &#39;Bolt&#39; ü', rendered)
+        self.assertNotIn(u'<b>', rendered)
+
+
+class SpellListCountTest(TestCase):
+    """
+    Counts of spell lists (read from the denormalized ClassSpellListEntry)
+    have to change with the spell levels they are filled from.
+    """
+
+    def setUp(self):
+        edition = DndEdition.objects.create(name=u'Edition', system='DnD 3.5', slug='edition')
+        self.rulebook = Rulebook.objects.create(dnd_edition=edition, name=u'Book', abbr='B', slug='book')
+        self.school = SpellSchool.objects.create(name=u'School', slug='school')
+        self.character_class = CharacterClass.objects.create(name=u'Wizard', slug='wizard')
+        # spells are created first, their own changes would bump the spell tag
+        self.spells = [
+            Spell.objects.create(rulebook=self.rulebook, name=slug, slug=slug, school=self.school)
+            for slug in ('first', 'second')
+        ]
+        self.add_to_list(self.spells[0])
+
+    def add_to_list(self, spell):
+        SpellClassLevel.objects.create(character_class=self.character_class, spell=spell, level=1)
+
+    def count(self):
+        request = RequestFactory().get('/classes/wizard/spells-level-1/', {'page': 1})
+        request.session = {}
+        spell_list = Spell.objects.filter(
+            class_spell_list_entries__list_slug=self.character_class.slug, class_spell_list_entries__level=1)
+        return DndPaginator(spell_list, request, keyset=True).count()
+
+    def test_count_changes_with_spell_levels(self):
+        self.assertEqual(self.count(), 1)
+        self.add_to_list(self.spells[1])
+        self.assertEqual(self.count(), 2)
+
+
+class FacetCountsTest(TestCase):
+    """
+    Facet counts have to change with the results, also when a model the
+    bitmap index does not cover changes them.
+    """
+
+    def setUp(self):
+        edition = DndEdition.objects.create(name=u'Edition', system='DnD 3.5', slug='edition')
+        rulebook = Rulebook.objects.create(dnd_edition=edition, name=u'Book', abbr='B', slug='book')
+        self.category = FeatCategory.objects.create(name=u'General', slug='general')
+        self.skill = Skill.objects.create(name=u'Tumble', base_skill='Dex', slug='tumble')
+        self.feats = []
+        for slug in ('first', 'second'):
+            feat = Feat.objects.create(rulebook=rulebook, name=slug, slug=slug, description=u'', benefit=u'')
+            feat.feat_categories.add(self.category)
+            self.feats.append(feat)
+        FeatRequiresSkill.objects.create(feat=self.feats[0], skill=self.skill, min_rank=5)
+
+    def category_count(self):
+        f = FeatFilter(QueryDict('prerequisite=tumble'), queryset=Feat.objects.all())
+        return f.facet_counts()['feat_categories__slug'].get(self.category.slug)
+
+    def test_counts_change_with_result_models(self):
+        self.assertEqual(self.category_count(), 1)
+        FeatRequiresSkill.objects.create(feat=self.feats[1], skill=self.skill, min_rank=5)
+        self.assertEqual(self.category_count(), 2)
+
+
+class TextIndexTest(TestCase):
+    """
+    Tokens differing only by accents or case are one token, MySQL
+    collations would not let them in the unique index twice.
+    """
+
+    def setUp(self):
+        edition = DndEdition.objects.create(name=u'Edition', system='DnD 3.5', slug='edition')
+        rulebook = Rulebook.objects.create(dnd_edition=edition, name=u'Book', abbr='B', slug='book')
+        school = SpellSchool.objects.create(name=u'School', slug='school')
+        self.spell = Spell.objects.create(
+            rulebook=rulebook, name=u'Spell', slug='spell', school=school,
+            description=u'A naïve RÔLE, a naive role and a fireball.')
+
+    def test_accents_and_case_are_folded(self):
+        tokens = TextIndexToken.objects.filter(model='spell', object_id=self.spell.pk).values_list('token', flat=True)
+        self.assertEqual(sorted(tokens), [u'a', u'and', u'fireball', u'naive', u'role'])
+        for text in (u'naive', u'Naïve', u'rôle', u'ROLE fire'):
+            self.assertEqual(matching_ids(Spell, 'description', text), set([self.spell.pk]))
+
+    def test_words_match_by_prefix_only(self):
+        self.assertEqual(matching_ids(Spell, 'description', u'ball'), set())
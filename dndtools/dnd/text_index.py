@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+Token level inverted index over long textile fields.
+
+Every indexed field of every object is split into lowercase word tokens
+without accents, which are stored in TextIndexToken. Searching for a word
+is then an index range scan over (model, field, token) instead of LIKE
+'%word%' over the whole table. Tokens are matched as word prefixes: "fire"
+finds "fireball", but unlike the substring search it replaced not
+"wildfire".
+
+Accents are removed as case-insensitive collations of MySQL compare
+"naïve" and "naive" as equal, two such tokens of one text would break the
+unique index. The token column is binary on MySQL (migration 0007), so
+no other collation rules make stored tokens equal.
+"""
+import re
+import unicodedata
+
+# model name -> indexed (raw, not *_html) fields
+INDEXED_FIELDS = {
+    'spell': ('description', ),
+    'feat': ('description', 'benefit', 'special', 'normal', ),
+    'monster': ('description', 'combat', ),
+    'item': ('description', ),
+    'race': ('description', 'combat', 'racial_traits', ),
+}
+
+MAX_TOKEN_LENGTH = 32
+
+_token_re = re.compile(r'\w+', re.UNICODE)
+
+
+def fold(text):
+    """
+    Text without accents (combining marks of its compatibility
+    decomposition), "Naïve rôle" gives "Naive role".
+    """
+    return u''.join(char for char in unicodedata.normalize('NFKD', unicode(text))
+                    if not unicodedata.combining(char))
+
+
+def words(text):
+    """
+    Lowercase word tokens of text without accents in order, repeated ones
+    included.
+    """
+    if not text:
+        return []
+    return [token[:MAX_TOKEN_LENGTH] for token in _token_re.findall(fold(text).lower())]
+
+
+def tokenize(text):
+    return set(words(text))
+
+
+def _model_name(model):
+    # deferred (.only()) instances are of a generated subclass
+    return model._meta.concrete_model._meta.object_name.lower()
+
+
+def update_text_index(instance, *field_names):
+    """
+    Synchronizes tokens of given fields of a saved instance. Only the
+    difference against stored tokens is written.
+    """
+    from dnd.models import TextIndexToken
+
+    model_name = _model_name(instance)
+    if not field_names:
+        field_names = INDEXED_FIELDS[model_name]
+
+    wanted = set()
+    for field_name in field_names:
+        for token in tokenize(getattr(instance, field_name)):
+            wanted.add((field_name, token))
+
+    stored = TextIndexToken.objects.filter(
+        model=model_name, object_id=instance.pk, field__in=field_names)
+    existing = dict(((field, token), pk) for pk, field, token in stored.values_list('pk', 'field', 'token'))
+
+    obsolete = [pk for key, pk in existing.items() if key not in wanted]
+    if obsolete:
+        TextIndexToken.objects.filter(pk__in=obsolete).delete()
+
+    TextIndexToken.objects.bulk_create([
+        TextIndexToken(model=model_name, field=field_name, token=token, object_id=instance.pk)
+        for field_name, token in wanted if (field_name, token) not in existing
+    ])
+
+
+def delete_text_index(instance):
+    from dnd.models import TextIndexToken
+
+    TextIndexToken.objects.filter(model=_model_name(instance), object_id=instance.pk).delete()
+
+
+def matching_ids(model, field_name, text):
+    """
+    Ids of objects whose field contains all words of text (as word prefixes).
+    Cost grows with the number of matching tokens, not with size of the table.
+    """
+    from dnd.models import TextIndexToken
+
+    result = None
+    # longest tokens first, they tend to be the most selective
+    for token in sorted(tokenize(text), key=len, reverse=True):
+        ids = set(TextIndexToken.objects.filter(
+            model=_model_name(model), field=field_name, token__startswith=token,
+        ).values_list('object_id', flat=True))
+        result = ids if result is None else result & ids
+        if not result:
+            break
+
+    return result or set()
@@ -55,6 +55,15 @@ urlpatterns = patterns(
     # deities
     (r'^deities/', include('dnd.deities.urls')),
 
+    # search
+    (r'^search/', include('dnd.search.urls')),
+
+    # export
+    (r'^export/', include('dnd.export.urls')),
+
+    # api
+    (r'^api/', include('dnd.api.urls')),
+
     # OTHERS
 
     (r'^robots\.txt$', TemplateView.as_view(template_name='robots.txt', content_type='text/plain')),
@@ -1,19 +1,40 @@
 # -*- coding: utf-8 -*-
+import hashlib
 import re
+import threading
+from collections import OrderedDict
+from django.conf import settings
+from django.db import IntegrityError, transaction
 from django.utils.html import escape
 import textile
 
+# regular expressions are compiled once, rendering runs for every saved text field
+_loose_ligature_res = (
+    (re.compile(r'fl +(?=[A-z])'), 'fl'),
+    (re.compile(r'fj +(?=[A-z])'), 'fj'),
+    (re.compile(r'fi +(?=[A-z])'), 'fi'),
+)
+_special_char_res = (
+    (re.compile(u'ﬁ *'), 'fi'),
+    (re.compile(u'ﬂ *'), 'fl'),
+    (re.compile(u'’'), "'"),
+    (re.compile(u'[–—]'), "--"),
+    (re.compile(u'[“”]'), '"'),
+)
+_internal_link_re = re.compile(r"&quot;((?:[-\w ():/]|&#39;)+)&quot;:/?(?![-a-z0-9/]+://)([-a-z0-9/]+)")
+_external_link_re = re.compile(
+    r'&quot;((?:[-\w ():/]|&#39;)+)&quot;:(https?://(?:(?:[-A-z0-9]+)\.)+(?:[-A-z0-9]+)+/(?:[-A-z0-9/?&=%.;]+))')
+_bare_link_re = re.compile(r'&quot;&quot;:(https?://(?:(?:[-A-z0-9]+)\.)+(?:[-A-z0-9]+)+/(?:[-A-z0-9/?&=%.;]+))')
+_hr_re = re.compile(u'-{5,}')
+_errata_re = re.compile(r'\[errata\](.*?)\[new\](.*?)\[/errata\]')
+
 
 def remove_special_chars(s, strict=False):
     if not strict:
-        s = re.sub(r'fl +(?=[A-z])', 'fl', s)
-        s = re.sub(r'fj +(?=[A-z])', 'fj', s)
-        s = re.sub(r'fi +(?=[A-z])', 'fi', s)
-    s = re.sub(u'ﬁ *', 'fi', s)
-    s = re.sub(u'ﬂ *', 'fl', s)
-    s = re.sub(u'’', "'", s)
-    s = re.sub(u'[–—]', "--", s)
-    s = re.sub(u'[“”]', '"', s)
+        for regex, replacement in _loose_ligature_res:
+            s = regex.sub(replacement, s)
+    for regex, replacement in _special_char_res:
+        s = regex.sub(replacement, s)
     return s
 
 
@@ -30,12 +51,9 @@ def create_links(s):
 
     wont create link that has anything other than A-z0-9, "(", ")", ":" or space in their name.
     """
-    s = re.sub(r"&quot;((?:[-\w ():/]|&#39;)+)&quot;:/?(?![-a-z0-9/]+://)([-a-z0-9/]+)", r'<a href="/\2">\1</a>', s)
-    s = re.sub(
-        r'&quot;((?:[-\w ():/]|&#39;)+)&quot;:(https?://(?:(?:[-A-z0-9]+)\.)+(?:[-A-z0-9]+)+/(?:[-A-z0-9/?&=%.;]+))',
-        r'<a href="\2">\1</a>', s)
-    s = re.sub(r'&quot;&quot;:(https?://(?:(?:[-A-z0-9]+)\.)+(?:[-A-z0-9]+)+/(?:[-A-z0-9/?&=%.;]+))',
-               r'<a href="\1">\1</a>', s)
+    s = _internal_link_re.sub(r'<a href="/\2">\1</a>', s)
+    s = _external_link_re.sub(r'<a href="\2">\1</a>', s)
+    s = _bare_link_re.sub(r'<a href="\1">\1</a>', s)
 
     return s
 
@@ -44,29 +62,122 @@ def create_hr(s):
     """
     Replaces ----- (five or more dashes) into <hr/>
     """
-    return re.sub(u'-{5,}', '<hr/>', s)
+    return _hr_re.sub('<hr/>', s)
 
 
-def update_html_cache_attributes(object, *args):
-    for attr_name in args:
-        value = getattr(object, attr_name)
+# bump when the rendering below changes, render_html_cache then renders everything again
+RENDERER_VERSION = 1
+
+
+def html_cache_fields(model):
+    """
+    Names of textile source fields of the model, i.e. those with a *_html twin.
+    """
+    names = set(field.name for field in model._meta.fields)
+    return [field.name for field in model._meta.fields if '%s_html' % field.name in names]
+
+
+def render_textile(value):
+    """
+    Returns the cleaned source and its HTML.
+    """
+    # remove ligatures and other bad characters
+    value = remove_special_chars(value, strict=True)
+    source = value
+
+    # apply textile
+    value = escape(value)
+    value = create_hr(value)
+    value = create_links(value)
+
+    value = textile.textile(value)
+    value = _errata_re.sub(r'<span class="errata-old">\1</span><span class="errata-new">\2</span>', value)
+
+    return source, value
+
+
+class LRUCache(object):
+    """
+    Dictionary-like cache keeping at most max_size recently used entries.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                return default
+            # move to the most recently used end
+            self._data[key] = value
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
 
-        # remove ligatures and other bad characters
-        value = remove_special_chars(value, strict=True)
-        # set it back to the object
-        setattr(object, attr_name, value)
 
-        # apply textile
-        value = escape(value)
-        value = create_hr(value)
-        value = create_links(value)
+_rendered = LRUCache(getattr(settings, 'TEXTILE_CACHE_SIZE', 1000))
 
-        value = textile.textile(value)
-        value = re.sub(r'\[errata\](.*?)\[new\](.*?)\[/errata\]',
-                       r'<span class="errata-old">\1</span><span class="errata-new">\2</span>', value)
 
+def textile_hash(source):
+    return hashlib.md5(('%d\0' % RENDERER_VERSION) + source.encode('utf-8')).hexdigest()
+
+
+def render_textile_cached(values):
+    """
+    Like render_textile for a list of values, but HTML of texts rendered
+    before (by this renderer version) comes from the process memory or from
+    the RenderedTextile table. Unchanged texts are thus never rendered again.
+    """
+    from dnd.models import RenderedTextile
+
+    sources = [remove_special_chars(value, strict=True) for value in values]
+    keys = [textile_hash(source) for source in sources]
+    html = dict((key, _rendered.get(key)) for key in keys)
+
+    missing = [key for key in keys if html[key] is None]
+    if missing:
+        for key, stored in RenderedTextile.objects.filter(hash__in=missing).values_list('hash', 'html'):
+            html[key] = stored
+            _rendered.set(key, stored)
+
+        new = []
+        for source, key in zip(sources, keys):
+            if html[key] is None:
+                html[key] = render_textile(source)[1]
+                _rendered.set(key, html[key])
+                new.append(RenderedTextile(hash=key, html=html[key]))
+        if new:
+            # another process could have stored the same text meanwhile
+            sid = transaction.savepoint()
+            try:
+                RenderedTextile.objects.bulk_create(new)
+                transaction.savepoint_commit(sid)
+            except IntegrityError:
+                transaction.savepoint_rollback(sid)
+
+    return [(source, html[key]) for source, key in zip(sources, keys)]
+
+
+def update_html_cache_attributes(object, *args):
+    rendered = render_textile_cached([getattr(object, attr_name) for attr_name in args])
+    for attr_name, (source, html) in zip(args, rendered):
+        # set cleaned source back to the object
+        setattr(object, attr_name, source)
         # set it to '_html'
-        setattr(object, '%s_html' % attr_name, value)
+        setattr(object, '%s_html' % attr_name, html)
 
 
 def int_with_commas(x):
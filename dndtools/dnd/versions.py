@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Data version counters kept in the cache.
+
+Every cached piece of derived data (counts, choices, indexes ...) remembers
+versions of the tags it was built from. Saving or deleting a model bumps its
+tag, so the derived data is rebuilt next time it is needed. Tags are plain
+strings, model tags look like "dnd.spell", tags of single objects like
+"dnd.spell:12" and tags of slugs like "dnd.spell:slug=fireball".
+
+The cache has to be shared by all processes (see CACHES in settings), a
+version bumped by an admin save in one web process or by a management
+command has to be seen by the others.
+"""
+import time
+from django.core.cache import cache
+from django.db.models import get_models
+
+VERSION_KEY = 'dnd:version:%s'
+# memcached does not accept longer relative timeouts
+VERSION_TIMEOUT = 60 * 60 * 24 * 30
+
+_table_models = {}
+
+
+def model_tag(model):
+    # deferred (.only()) instances are of a generated subclass
+    opts = model._meta.concrete_model._meta
+    return '%s.%s' % (opts.app_label, opts.object_name.lower())
+
+
+def object_tag(model, pk):
+    return '%s:%s' % (model_tag(model), pk)
+
+
+def slug_tag(model, slug):
+    return '%s:slug=%s' % (model_tag(model), slug)
+
+
+def instance_tags(instance, related=False):
+    """
+    Tags of the object and its slug. With related=True also tags of objects
+    it points to by foreign keys, as pages of those objects list it.
+    """
+    tags = [object_tag(instance.__class__, instance.pk)]
+    slug = getattr(instance, 'slug', None)
+    if slug:
+        tags.append(slug_tag(instance.__class__, slug))
+    if related:
+        for field in instance._meta.fields:
+            if field.rel is not None and field.rel.to is not None:
+                value = getattr(instance, field.attname)
+                if value is not None:
+                    tags.append(object_tag(field.rel.to, value))
+    return tags
+
+
+def _initial_version():
+    # time based, so a counter lost from the cache never repeats an old value
+    return int(time.time() * 1000)
+
+
+def get_versions(tags):
+    """
+    Returns dictionary tag -> current version.
+    """
+    keys = dict((VERSION_KEY % tag, tag) for tag in tags)
+    found = cache.get_many(keys.keys())
+
+    result = {}
+    for key, tag in keys.items():
+        if key in found:
+            result[tag] = found[key]
+        else:
+            version = _initial_version()
+            if not cache.add(key, version, VERSION_TIMEOUT):
+                version = cache.get(key, version)
+            result[tag] = version
+    return result
+
+
+def get_version(tag):
+    return get_versions([tag])[tag]
+
+
+def bump_version(*tags):
+    for tag in tags:
+        key = VERSION_KEY % tag
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _initial_version(), VERSION_TIMEOUT)
+
+
+# denormalized tables are not versioned (see dnd.models.UNVERSIONED_MODELS),
+# the tables they are filled from are
+SOURCE_TAGS = {
+    'dnd.classspelllistentry': ('dnd.spellclasslevel', 'dnd.characterclass', ),
+    'dnd.domainspelllistentry': ('dnd.spelldomainlevel', 'dnd.domain', ),
+}
+
+
+def source_tags(tag):
+    """
+    Tags whose versions change with data of the tag.
+    """
+    return SOURCE_TAGS.get(tag, (tag, ))
+
+
+def models_tags(*models):
+    return [model_tag(model) for model in models]
+
+
+def queryset_tags(qs):
+    """
+    Tags of all models whose tables take part in the query (filters included).
+    """
+    if not _table_models:
+        for model in get_models(include_auto_created=True):
+            _table_models[model._meta.db_table] = model
+
+    tags = set(source_tags(model_tag(qs.model)))
+    for table in qs.query.tables:
+        if table in _table_models:
+            tags.update(source_tags(model_tag(_table_models[table])))
+    return sorted(tags)
+
+
+def versions_key(tags):
+    """
+    Short string describing versions of given tags, handy as a part of cache key.
+    """
+    versions = get_versions(tags)
+    return '.'.join('%d' % versions[tag] for tag in sorted(tags))
@@ -13,6 +13,7 @@ USE_L10N = False
 ADMIN_MEDIA_PREFIX = '/media/'
 
 MIDDLEWARE_CLASSES = (
+    #'dnd.middleware.SqlProfilingMiddleware',
     'dnd.mobile.middleware.MobileMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -71,10 +72,24 @@ DATABASES = {
     }
 }
 
+# data versions (dnd.versions) and everything cached under them have to be
+# shared by all web processes and management commands, a per-process cache
+# would not see changes made elsewhere. Memcached also increments versions
+# atomically and reads many of them at once.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+        'LOCATION': '127.0.0.1:11211',
+        'TIMEOUT': 24 * 60 * 60,
+    }
+}
+
 SECRET_KEY = '_ex=pd@$*e9a8*g(3n=6zv-)igez_%s2_=1wu0$#(cop5fh##c'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 STATIC_DIR = os.path.join(BASE_DIR, 'static')
 STATICFILES_DIRS = (STATIC_DIR, )
+# content hashes of static files, written by manage.py build_asset_manifest
+ASSET_MANIFEST = os.path.join(BASE_DIR, 'asset-manifest.json')
 SITE_ID = 1
 
 if not DEBUG: